@@ -0,0 +1,283 @@
+"""
+无界面的批量处理入口：在命令行中并行地分析一个目录（或 glob 模式）下的所有日志
+
+数据分析管道原本只能通过 Streamlit 页面（单个日志或单个压缩包）或 run_demo 运行；
+而每晚的全机群分析需要在没有浏览器的环境下（例如由 cron 定时）运行。
+
+该脚本收集输入的目录（递归）、glob 模式或文件中的所有日志 (.xlsx/.csv/.parquet/.jsonl)，
+以多进程并行的方式逐个日志地执行数据分析管道，并将翻译后的 “基于日志的参数统计表” 写出为 xlsx、csv 或 Parquet 文件；
+无法处理的日志不会中断整个任务，而是被逐个记录到错误报告 (csv) 中：
+
+    python app/batch_runner.py data/external/donglee_IOT_log_250507 --pattern A --workers 8 --output output/fleet.xlsx
+    python app/batch_runner.py "data/external/**/*.xlsx" --pattern single_file_multiple_periods --output output/periods.parquet
+
+存在无法处理的日志时，以非零状态码 (1) 退出；没有找到任何日志时，状态码为 2。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import pandas as pd
+import multiprocessing
+import traceback
+import argparse
+import tempfile
+import glob
+import time
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app.my_backend_agent import DataAnalyserBackendAgent
+from utils.log_cache import get_default_log_cache
+from utils.log_reader import read_device_log
+from utils.zip_ingestion import is_log_member
+
+
+# The calculation patterns of the usage periods: the options (A/B/C) of the “多设备处理” page, and their full names
+# 使用时长的计算模式：“多设备处理” 页面中的选项 (A/B/C) 及其全称
+PATTERN_OPTIONS = {
+    'A': 'multiple_files_single_period',
+    'B': 'multiple_files_latest_period',
+    'C': 'multiple_files_max_period',
+}
+PATTERNS = list(PATTERN_OPTIONS.values()) + ['single_file_multiple_periods']
+
+OUTPUT_FORMATS = ('.xlsx', '.csv', '.parquet')
+
+# The column added in front of the statistics table, telling which log each row comes from
+# 统计表最前面新增的一列，表示每一行来自哪一个日志
+FILE_COLUMN = '日志文件'
+
+ERROR_COLUMNS = ['file', 'error_type', 'error']
+
+EXIT_OK = 0
+EXIT_FAILED_LOGS = 1
+EXIT_NO_LOGS = 2
+
+
+def resolve_pattern(pattern):
+    """'A'/'B'/'C' (大小写均可) 或计算模式的全称 -> 计算模式的全称"""
+    if pattern.upper() in PATTERN_OPTIONS:
+        return PATTERN_OPTIONS[pattern.upper()]
+
+    if pattern in PATTERNS:
+        return pattern
+
+    raise ValueError(f"未知的计算模式 '{pattern}'；可选：A/B/C 或 {', '.join(PATTERNS)}")
+
+
+def collect_log_files(inputs):
+    """
+    收集输入中的所有日志文件：目录将被递归地遍历，glob 模式（如 'data/**/*.xlsx'）将被展开；
+    与压缩包中一样，隐藏文件、macOS 的资源文件与 Excel 的锁文件将被忽略。
+
+    Args:
+        inputs (list): 目录、glob 模式或文件的路径
+
+    Returns:
+        list: 去重并排序后的日志文件路径
+    """
+    log_files = set()
+
+    for path in inputs:
+        paths = glob.glob(path, recursive=True) if glob.escape(path) != path else [path]
+
+        for matched_path in paths:
+            if os.path.isdir(matched_path):
+                for dir_path, _, file_names in os.walk(matched_path):
+                    for file_name in file_names:
+                        log_files.add(os.path.join(dir_path, file_name))
+
+            elif os.path.isfile(matched_path):
+                log_files.add(matched_path)
+
+    return sorted(
+        log_file for log_file in log_files
+        if is_log_member(os.path.normpath(log_file).replace(os.sep, '/'))
+    )
+
+
+def _analyse_a_log_file(log_file, pattern_choice, use_cache=True):
+    """
+    子进程的任务：读取一个日志，构建其索引表并执行数据分析管道；任何错误都被捕获并随结果一并返回，而不会中断整个批处理。
+
+    Returns:
+        tuple: (翻译前的统计结果或 None, 该日志的记录数, 错误的类型或 None, 错误信息或 None)
+    """
+    try:
+        with open(log_file, 'rb') as uploaded_file:
+            if use_cache:
+                df_log = get_default_log_cache().read_device_log(uploaded_file)
+            else:
+                df_log = read_device_log(uploaded_file)
+
+            DataAnalyserBackendAgent.check_id_existence(df_log, uploaded_file)
+
+        dfda_log = DataAnalyserBackendAgent.index_a_dfda_log(df_log, format_checked=True)
+        dfda_log = DataAnalyserBackendAgent.define_uptime_and_downtime(dfda_log, df_log, pattern=pattern_choice)
+
+        # One row per device in the multi-file patterns, one row per usage period in 'single_file_multiple_periods'
+        # 多文件的计算模式下每台设备一行，'single_file_multiple_periods' 模式下每个使用周期一行
+        dfda_log_updated = DataAnalyserBackendAgent.conduct_the_multi_period_pipeline(dfda_log, df_log)
+
+        return dfda_log_updated, len(df_log), None, None
+
+    except Exception as error:
+        return None, 0, type(error).__name__, str(error) or traceback.format_exc(limit=1)
+
+
+def run_batch(log_files, pattern_choice, max_workers=None, use_cache=True, log=None):
+    """
+    并行地分析所有日志（max_workers 为 1 时在当前进程中依次执行）。
+
+    Args:
+        log_files (list): 日志文件的路径（见 collect_log_files）
+        pattern_choice: 使用时长的计算模式的全称（见 resolve_pattern）
+        max_workers: 子进程的个数；默认为 CPU 核数
+        use_cache: 是否经由列式缓存 (LogCache) 读取日志；每晚重复分析未变化的日志时可跳过解析
+        log: (可选) 接受进度信息的函数，例如 print
+
+    Returns:
+        tuple: (翻译后的统计表，按日志文件的顺序排列，最前一列为日志文件; 错误报告)
+    """
+    max_workers = max_workers or os.cpu_count()
+    results = [None] * len(log_files)
+    started_at = time.monotonic()
+
+    def report(num_done, i):
+        if log is not None:
+            dfda_log_updated, num_rows, error_type, _ = results[i]
+            status = f"失败 ({error_type})" if error_type else f"{num_rows} 条记录"
+            log(f"[{num_done}/{len(log_files)}] {log_files[i]}：{status}（已用时 {time.monotonic() - started_at:.1f} 秒）")
+
+    if max_workers == 1:
+        for i, log_file in enumerate(log_files):
+            results[i] = _analyse_a_log_file(log_file, pattern_choice, use_cache)
+            report(i + 1, i)
+    else:
+        # Spawn (rather than fork) the workers, as the pages do (see analyse_logs_in_parallel)
+        # 与页面一致，以 spawn（而非 fork）的方式启动子进程
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = {
+                executor.submit(_analyse_a_log_file, log_file, pattern_choice, use_cache): i
+                for i, log_file in enumerate(log_files)
+            }
+
+            for num_done, future in enumerate(as_completed(futures), start=1):
+                i = futures[future]
+
+                # A worker that dies (rather than raises) fails only its own log
+                # 子进程意外退出（而不是抛出异常）时，只有其对应的日志被记为失败
+                try:
+                    results[i] = future.result()
+                except Exception as error:
+                    results[i] = (None, 0, type(error).__name__, str(error))
+
+                report(num_done, i)
+
+    dfda_logs_updated = []
+    errors = []
+
+    for log_file, (dfda_log_updated, _, error_type, error) in zip(log_files, results):
+        if error_type is None:
+            dfda_log_updated.insert(0, FILE_COLUMN, log_file)
+            dfda_logs_updated.append(dfda_log_updated)
+        else:
+            errors.append({'file': log_file, 'error_type': error_type, 'error': error})
+
+    df_errors = pd.DataFrame(errors, columns=ERROR_COLUMNS)
+
+    if not dfda_logs_updated:
+        return None, df_errors
+
+    dfda_log_translated = DataAnalyserBackendAgent.translate_and_mildly_modify_your_df(
+        pd.concat(dfda_logs_updated, ignore_index=True)
+    )
+
+    return dfda_log_translated, df_errors
+
+
+def write_table(df, path):
+    """
+    按扩展名 (.xlsx/.csv/.parquet) 写出表格；先写入同目录下的临时文件再重命名，以免下游读到写了一半的文件。
+    csv 以 utf-8-sig 编码写出，以便 Excel 正确地显示中文。
+    """
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix not in OUTPUT_FORMATS:
+        raise ValueError(f"不支持的输出格式 '{suffix}'；可选：{', '.join(OUTPUT_FORMATS)}")
+
+    output_dir = os.path.dirname(os.path.abspath(path))
+    os.makedirs(output_dir, exist_ok=True)
+
+    file_descriptor, temp_path = tempfile.mkstemp(suffix=suffix, dir=output_dir)
+    os.close(file_descriptor)
+
+    try:
+        if suffix == '.xlsx':
+            df.to_excel(temp_path, index=False)
+        elif suffix == '.csv':
+            df.to_csv(temp_path, index=False, encoding='utf-8-sig')
+        else:
+            df.to_parquet(temp_path, index=False)
+
+        os.replace(temp_path, path)
+
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="并行地分析目录（或 glob 模式）下的所有智能控制器日志，并写出参数统计表")
+    parser.add_argument('inputs', nargs='+', help="日志所在的目录（递归）、glob 模式或日志文件")
+    parser.add_argument('--pattern', default='A', help="使用时长的计算模式：A/B/C 或 " + '/'.join(PATTERNS))
+    parser.add_argument('--workers', type=int, default=None, help="子进程的个数；默认为 CPU 核数，为 1 时不启动子进程")
+    parser.add_argument('--output', required=True, help="统计表的输出路径 (.xlsx/.csv/.parquet)")
+    parser.add_argument('--errors', help="错误报告 (csv) 的输出路径；默认为输出路径加上 '_errors.csv' 后缀")
+    parser.add_argument('--no-cache', action='store_true', help="不经由列式缓存读取日志")
+    args = parser.parse_args(argv)
+
+    try:
+        pattern_choice = resolve_pattern(args.pattern)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if os.path.splitext(args.output)[1].lower() not in OUTPUT_FORMATS:
+        parser.error(f"不支持的输出格式 '{args.output}'；可选：{', '.join(OUTPUT_FORMATS)}")
+
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers 须为正整数")
+
+    log = lambda message: print(message, file=sys.stderr)
+
+    log_files = collect_log_files(args.inputs)
+    if not log_files:
+        log(f"没有找到任何日志 (.xlsx/.csv/.parquet/.jsonl)：{' '.join(args.inputs)}")
+        return EXIT_NO_LOGS
+
+    log(f"共 {len(log_files)} 个日志，计算模式：{pattern_choice}")
+
+    dfda_log_translated, df_errors = run_batch(
+        log_files, pattern_choice, max_workers=args.workers, use_cache=not args.no_cache, log=log
+    )
+
+    if dfda_log_translated is not None:
+        write_table(dfda_log_translated, args.output)
+        log(f"统计表（{len(dfda_log_translated)} 行）已写出：{args.output}")
+
+    # The error report is always written, so that a nightly job can tell "no errors" from "not run"
+    # 错误报告总是被写出（即使没有错误），以便区分 “没有错误” 与 “没有运行”
+    errors_path = args.errors or os.path.splitext(args.output)[0] + '_errors.csv'
+    write_table(df_errors, errors_path)
+    log(f"{len(df_errors)} 个日志处理失败，错误报告已写出：{errors_path}")
+
+    return EXIT_FAILED_LOGS if len(df_errors) else EXIT_OK
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,7 +12,7 @@ Class-DataAnalyser (类-数据分析) 的实现 (快照版: demo_data_analysis.p
 # Email: xuanzhichen.42@gmail.com
 # License: MIT
 
-# Latest Update: 2025/07/03
+# Latest Update: 2026/10/18
 
 
 import pandas as pd
@@ -324,10 +324,12 @@ class DataAnalyser():
 
         return self
     
-    # Latest update: 2025-06-26
+    # Latest update: 2026-10-18
     def get_signal_strength_frequency(self):
         # Instead of looping through rows, vectorized operations for signal statistics
-        signal_strength = self._df_device_log_standby['信号']
+        # The log stores the signal as float32; the statistics are computed in float64
+        # 日志中的信号以 float32 存储，统计量则以 float64 计算
+        signal_strength = self._df_device_log_standby['信号'].astype('float64')
         # signal_strength = self._df_device_log_standby['signal_strength']
 
         # Count strong signals (>= 21.5)
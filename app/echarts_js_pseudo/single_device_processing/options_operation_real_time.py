@@ -2,7 +2,8 @@ def get_options_operation_real_time(
     uploaded_file,
     x_axis_data: list,
     y_axis_data: list,
-    status_categories: list
+    status_categories: list,
+    n_rows: int = None
 ):
     """
     返回一个 ECharts 的 (JavaScript) 配置项，用于绘制 “单设备处理” 页面中，“操作类型（实时）” 的可视化与分析。
@@ -12,11 +13,19 @@ def get_options_operation_real_time(
         x_axis_data (list): 即日志本身的记录范围（未必连续），格式已简化，例如 ['25-01', '25-02', ..., '25-12']
         y_axis_data (list): 映射日志的每个时间戳 (x_axis_data) 所对应的操作类型（编码）
         status_categories (list): 对不同操作类型的编码，例如 [0, 1, 2, 3]
+        n_rows (int): (可选) 日志原本的记录数；若数据已被降采样，则在副标题中注明
     """
 
+    # The original number of log records, as the series may have been downsampled to fewer points
+    # 日志原本的记录数（序列可能已被降采样为更少的点）
+    subtext = '' if n_rows is None else f'共 {n_rows} 条日志记录'
+    if n_rows is not None and len(y_axis_data) < n_rows:
+        subtext += f'（已降采样为 {len(y_axis_data)} 个点）'
+
     options_operation_real_time = {
         'title': {
             'text': f'"{uploaded_file.name.rsplit(".", 1)[0]}" 操作类型的趋势变化（实时）',
+            'subtext': subtext,
             'left': 'center',
         },
         'tooltip': {    
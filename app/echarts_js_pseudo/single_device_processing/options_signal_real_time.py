@@ -1,7 +1,8 @@
 def get_options_signal_real_time(
     uploaded_file,
     signal_data: list,
-    x_axis_data_signal: list
+    x_axis_data_signal: list,
+    n_rows: int = None
 ):
     """
     返回一个 ECharts 的 (JavaScript) 配置项，用于绘制 “单设备处理” 页面中，“信号强度（实时）” 的可视化与分析。
@@ -9,11 +10,19 @@ def get_options_signal_real_time(
     Args:
         signal_data (list): 映射日志的每个时间戳 (x_axis_data_signal) 所对应的信号强度值
         x_axis_data_signal (list): 即日志本身的记录范围（未必连续），格式已简化，例如 ['25-01', '25-02', ..., '25-12']
+        n_rows (int): (可选) 日志原本的记录数；若数据已被降采样，则在副标题中注明
     """
 
+    # The original number of log records, as the series may have been downsampled to fewer points
+    # 日志原本的记录数（序列可能已被降采样为更少的点）
+    subtext = '' if n_rows is None else f'共 {n_rows} 条日志记录'
+    if n_rows is not None and len(signal_data) < n_rows:
+        subtext += f'（已降采样为 {len(signal_data)} 个点）'
+
     options_signal_real_time = {
         'title': {
             'text': f'"{uploaded_file.name.rsplit(".", 1)[0]}" 信号强度的趋势变化（实时）',
+            'subtext': subtext,
             'left': 'center'
         },
         'tooltip': {
@@ -14,21 +14,45 @@ Class-DataAnalyserBackendAgent (类-数据分析后端代理) 的实现
 
 # Latest update: 2025-07-17
 # 如果未来采用数据库直连的方式，索引表和日志文件的匹配问题将不复存在；因为 “查找日志文件” 的逻辑将由数据库的 select 语句实现
+
+# Latest update: 2026-10-18
+# 日志摄入日志仓库 (utils/log_store.py) 之后，索引表直接由仓库中的设备构建，每个使用周期的子日志则由一次范围查询得到（见 conduct_the_store_pipeline）
 """
 
 # Author: Xuanzhi Chen (陈炫志)
 # Email: xuanzhichen.42@gmail.com
 # License: MIT
 
-# Latest Update: 2025/07/07
+# Latest Update: 2026/10/18
 
 
 import pandas as pd
+import numpy as np
+import multiprocessing
+import tempfile
+import zipfile
+import io
+import os
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-from utils import DataAnalyser
+from utils import DataAnalyser, BatchDataAnalyser, StreamingDataAnalyser, LogStoreDataAnalyser
+from utils.batch_analyser import NS_PER_DAY, combine_device_logs
+from utils.log_cache import get_default_log_cache
+from utils.log_reader import DEFAULT_CHUNK_SIZE, iter_device_log_chunks
+from utils.streaming_analyser import aggregate_log_chunks
+from utils.incremental_state import update_device_state
+from utils.usage_periods import define_usage_periods
+from utils.zip_ingestion import open_log_member
+from utils.stage_timer import DISABLED_STAGE_TIMER, StageTimer
 from utils.build_your_df_features import index_a_dfda_log, translate_and_mildly_modify_your_df
 
 
+# Number of log records from which a batch of devices is analysed and their raw logs dropped (see analyse_logs_in_zip)
+# 累积的日志记录数达到该值时，完成这一批设备的统计并释放其原始日志
+DEFAULT_BATCH_ROWS = 500_000
+
+
 class DataAnalyserBackendAgent(DataAnalyser):
     """
     我的 Streamlit Web Application 后端代理
@@ -122,84 +146,354 @@ class DataAnalyserBackendAgent(DataAnalyser):
             'multiple_files_latest_period', 
             'multiple_files_max_period'
         """
-        # Convert '创建时间' to datetime and sort
-        df_log_sorted = df_log.copy()
-        df_log_sorted['创建时间'] = pd.to_datetime(df_log_sorted['创建时间'])
-        df_log_sorted = df_log_sorted.sort_values('创建时间', ascending=False)
-        
-        # Get unique dates from '创建时间' column
-        unique_dates = df_log_sorted['创建时间'].dt.date.unique()
-        unique_dates = sorted(unique_dates, reverse=True)
-        
-        # Find continuous periods
-        continuous_periods = []
-        current_period = [unique_dates[0]]
-        
-        for i in range(1, len(unique_dates)):
-            current_date = unique_dates[i]
-            previous_date = unique_dates[i-1]
-            
-            # Check if dates are consecutive (difference of 1 day)
-            if (previous_date - current_date).days == 1:
-                current_period.append(current_date)
-            else:
-                # End of current period, start new one
-                if len(current_period) > 0:
-                    continuous_periods.append(current_period)
-                current_period = [current_date]
-        
-        # Add the last period
-        if len(current_period) > 0:
-            continuous_periods.append(current_period)
-        
-        dfda_log_updated = dfda_log.copy()
-        
-        if pattern == 'single_file_multiple_periods':
-            # Create new rows in dfda_log for each continuous period
-            for i, period in enumerate(continuous_periods):
-                if i == 0:
-                    # Update the original row
-                    dfda_log_updated.loc[0, 'downtime'] = pd.to_datetime(period[0]).date()
-                    dfda_log_updated.loc[0, 'uptime'] = pd.to_datetime(period[-1]).date()
-                    
-                else:
-                    # Add new row for additional periods
-                    new_row = dfda_log_updated.iloc[0].copy()
-                    new_row['downtime'] = pd.to_datetime(period[0]).date()
-                    new_row['uptime'] = pd.to_datetime(period[-1]).date()
-                    dfda_log_updated = pd.concat(
-                        [dfda_log_updated, pd.DataFrame([new_row])], ignore_index=True
-                    )
-        
-        elif pattern == 'multiple_files_single_period':
-            latest_period = continuous_periods[0]
-            last_period = continuous_periods[-1]
-            dfda_log_updated.loc[0, 'downtime'] = pd.to_datetime(latest_period[0]).date()
-            dfda_log_updated.loc[0, 'uptime'] = pd.to_datetime(last_period[-1]).date()
-
-            dfda_log_updated.insert(6, '实际使用天数', 0)
-            dfda_log_updated.insert(7, '实际使用月数', 0)
-
-        elif pattern == 'multiple_files_latest_period':
-            latest_period = continuous_periods[0]
-            dfda_log_updated.loc[0, 'downtime'] = pd.to_datetime(latest_period[0]).date()
-            dfda_log_updated.loc[0, 'uptime'] = pd.to_datetime(latest_period[-1]).date()
-
-        elif pattern == 'multiple_files_max_period':
-            if len(continuous_periods) > 1:
-                max_period = max(continuous_periods, key=len)
-                dfda_log_updated.loc[0, 'downtime'] = pd.to_datetime(max_period[0]).date()
-                dfda_log_updated.loc[0, 'uptime'] = pd.to_datetime(max_period[-1]).date()
-            else:
-                dfda_log_updated.loc[0, 'downtime'] = pd.to_datetime(continuous_periods[0][0]).date()
-                dfda_log_updated.loc[0, 'uptime'] = pd.to_datetime(continuous_periods[0][-1]).date()
+        # Latest update: 2026-10-18
+        # 连续使用区间的识别由一次向量化的 diff/cumsum 完成，所有的行也在一次构造中得到（见 utils/usage_periods.py）
+        dfda_log_updated, _ = define_usage_periods(dfda_log, df_log['创建时间'], pattern=pattern)
 
         return dfda_log_updated
     
+    @staticmethod
+    def define_uptime_and_downtime_for_fleet(dfda_log, df_logs, pattern='multiple_files_single_period'):
+        """
+        一次性地为多台设备定义上线和下线时间：索引表的第 i 行对应 df_logs 中的第 i 份日志。
+
+        Returns:
+            tuple: (更新后的索引表, 其每一行所对应的设备键)；设备键可直接传给批量模式的数据分析管道
+        """
+        timestamps = np.concatenate([
+            pd.to_datetime(df_log['创建时间']).to_numpy(dtype='datetime64[ns]') for df_log in df_logs
+        ]) if df_logs else np.empty(0, dtype='datetime64[ns]')
+        device_keys = np.repeat(np.arange(len(df_logs)), [len(df_log) for df_log in df_logs])
+
+        return define_usage_periods(dfda_log, timestamps, device_keys, pattern=pattern)
+    
     @staticmethod
     def concat_dfda_log(dfda_log_whole, dfda_log_individual):
         return pd.concat([dfda_log_whole, dfda_log_individual], ignore_index=True)
+
+    # Latest update: 2026-10-18
+    @staticmethod
+    def conduct_the_batch_pipeline(dfda_log, df_logs, stage_timer=None):
+        """
+        以批量模式对所有设备日志执行数据分析管道：将日志合并为一张以设备为键的大表，一次性完成统计。
+
+        Args:
+            dfda_log: 由各设备的索引表按顺序拼接而成的索引表（每台设备一行）
+            df_logs: 与 dfda_log 的行一一对应的日志列表
+            stage_timer (StageTimer): (可选) 为合并日志及管道的各步骤计时
+        """
+        with (stage_timer or DISABLED_STAGE_TIMER).stage('combine_device_logs') as stage:
+            df_logs_combined = combine_device_logs(df_logs)
+            stage.rows = len(df_logs_combined)
+
+        batch_data_analyser = BatchDataAnalyser(dfda_log)
+        batch_data_analyser.analyse(df_logs_combined, window_len=2, stage_timer=stage_timer)
+
+        return batch_data_analyser._df_data_analysis
         
+    # Latest update: 2026-10-18
+    @staticmethod
+    def conduct_the_multi_period_pipeline(dfda_log, df_log, window_len=2, stage_timer=None):
+        """
+        以批量模式分析一份（单设备的）日志的所有使用周期：索引表的每一行为一个使用周期，
+        日志只被排序、划分一次，所有周期的统计量在一次分组的计算中得到，而不是对每个周期都重新执行一遍管道。
+
+        Args:
+            dfda_log: 单设备的索引表（例如 'single_file_multiple_periods' 模式下，每个连续使用区间一行）
+            df_log: 该设备的日志
+            stage_timer (StageTimer): (可选) 为合并日志及管道的各步骤计时
+        """
+        with (stage_timer or DISABLED_STAGE_TIMER).stage('combine_device_logs', rows=len(df_log)):
+            df_logs_combined = combine_device_logs([df_log])
+
+        # Every row (usage period) of the index table belongs to the same and only device (key 0)
+        # 索引表的每一行（使用周期）都属于同一台设备（设备键为 0）
+        batch_data_analyser = BatchDataAnalyser(dfda_log)
+        batch_data_analyser.analyse(
+            df_logs_combined,
+            device_keys=np.zeros(len(dfda_log), dtype=np.int64),
+            window_len=window_len,
+            stage_timer=stage_timer
+        )
+
+        return batch_data_analyser._df_data_analysis
+
+    @staticmethod
+    def conduct_the_streaming_pipeline(uploaded_file, pattern='single_file_multiple_periods', chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        以流式模式分析一个（单设备的）超长日志：日志被逐块读取并归约为可合并的部分聚合，
+        索引表与使用周期则由聚合的 “日期摘要” 构建；峰值内存只取决于分块的大小，而统计结果与内存模式相同。
+        """
+        aggregate = aggregate_log_chunks(iter_device_log_chunks(uploaded_file, chunk_size=chunk_size), window_len=2)
+
+        # The digest has one record per day, which is all that indexing and defining the usage periods need
+        # 日期摘要中每个日期一条记录，这已足以构建索引表并定义使用周期
+        df_digest = aggregate.digest_log()
+
+        dfda_log = DataAnalyserBackendAgent.index_a_dfda_log(df_digest)
+        dfda_log = DataAnalyserBackendAgent.define_uptime_and_downtime(dfda_log, df_digest, pattern=pattern)
+
+        streaming_analyser = StreamingDataAnalyser(dfda_log).analyse(aggregate)
+
+        return streaming_analyser._df_data_analysis
+
+    # Latest update: 2026-10-18
+    @staticmethod
+    def conduct_the_incremental_pipeline(uploaded_file, state_store, pattern='single_file_multiple_periods', chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        以增量模式分析一个（单设备的）日志：只聚合比该设备已保存状态更新的记录，并与已保存的状态合并；
+        统计表则由合并后的状态重新得出（成本只取决于新增的记录数与日期数，而与历史记录的长度无关）。
+
+        Args:
+            state_store (DeviceStateStore): 设备状态仓库（由调用者指定其目录，例如 DeviceStateStore(state_dir=...)）
+        """
+        _, aggregate, _ = update_device_state(
+            iter_device_log_chunks(uploaded_file, chunk_size=chunk_size), state_store, window_len=2
+        )
+
+        df_digest = aggregate.digest_log()
+
+        dfda_log = DataAnalyserBackendAgent.index_a_dfda_log(df_digest)
+        dfda_log = DataAnalyserBackendAgent.define_uptime_and_downtime(dfda_log, df_digest, pattern=pattern)
+
+        streaming_analyser = StreamingDataAnalyser(dfda_log).analyse(aggregate)
+
+        return streaming_analyser._df_data_analysis
+
+    # Latest update: 2026-10-18
+    @staticmethod
+    def conduct_the_store_pipeline(log_store, pattern='multiple_files_single_period', imeis=None, window_len=2):
+        """
+        对日志仓库中的设备执行数据分析管道：索引表由仓库中的设备构建（每台设备一行），使用周期由每台设备有记录的日期定义，
+        每个使用周期的子日志则由仓库中的一次范围查询得到，而不必载入任何日志文件。
+
+        Args:
+            log_store (LogStore): 日志仓库
+            pattern: 使用时长的计算模式，见 define_uptime_and_downtime
+            imeis: (可选) 只分析这些设备；默认分析仓库中的所有设备
+        """
+        df_devices = log_store.devices(imeis)
+        if df_devices.empty:
+            raise ValueError("日志仓库中没有任何（指定的）设备。")
+
+        # Index each device as if it were a log of its own, so that the table is the same as the one of the other pipelines
+        # 将每台设备视为一份单独的日志构建索引表，使其与其他管道的索引表相同
+        dfda_log = pd.concat(
+            [index_a_dfda_log(df_devices.iloc[[i]]) for i in range(len(df_devices))], ignore_index=True
+        )
+
+        # One timestamp per device and day is all that defining the usage periods needs
+        # 每台设备每个日期一个时间戳，这已足以定义使用周期
+        df_days = log_store.read_active_days(imeis)
+        dfda_log, _ = define_usage_periods(
+            dfda_log,
+            (df_days['day'].to_numpy() * NS_PER_DAY).view('datetime64[ns]'),
+            pd.Index(df_devices['imei']).get_indexer(df_days['imei']),
+            pattern=pattern
+        )
+
+        store_data_analyser = LogStoreDataAnalyser(dfda_log)
+
+        for index in range(len(dfda_log)):
+            store_data_analyser.identify_id_info(
+                log_store, use_index=True, index=index, device_name=None, imei=dfda_log.loc[index, 'imei']
+            )
+            store_data_analyser.get_usage_period()
+            store_data_analyser.get_sub_log_based_on_usage_period()
+            store_data_analyser.get_operation_status()
+            store_data_analyser.get_signal_strength_frequency()
+            store_data_analyser.get_signal_switch_frequency(window_len=window_len)
+
+        return store_data_analyser._df_data_analysis
+
     @staticmethod
     def translate_and_mildly_modify_your_df(df_data_analysis):
-        return translate_and_mildly_modify_your_df(df_data_analysis)
\ No newline at end of file
+        return translate_and_mildly_modify_your_df(df_data_analysis)
+
+    # Latest update: 2026-10-18
+    @staticmethod
+    def analyse_logs_in_zip(
+        zip_data, log_files, pattern_choice, use_parallel=False, parsed_log_store=None, progress_callback=None,
+        batch_rows=DEFAULT_BATCH_ROWS, stage_timer=None
+    ):
+        """
+        对压缩包中的所有日志执行数据分析管道，返回逐设备的统计结果；该方法不涉及任何页面元素，可在后台任务中执行。
+
+        日志被逐个读取（见 utils.zip_ingestion），并按行数预算分批执行批量模式的数据分析管道：
+        每当累积的日志记录数达到 batch_rows，就完成这一批设备的统计并释放其原始日志，因此峰值内存只取决于单个最大的日志（与预算），而不是整个压缩包。
+
+        Args:
+            zip_data (bytes): 压缩包的内容
+            log_files (list): 压缩包中需要处理的日志文件名（见 list_log_members）
+            pattern_choice: 使用时长的计算模式，见 define_uptime_and_downtime
+            use_parallel: 是否以多进程并行的方式处理（见 analyse_logs_in_parallel）
+            parsed_log_store (ParsedLogStore): (可选) 已解析日志仓库；同一个压缩包中的日志在切换计算模式时无须重新解析
+            progress_callback: (可选) 每处理完一个日志时被调用，参数为 (已完成的个数, 总个数, 已处理的记录数)
+            batch_rows: 每一批设备的日志记录数的预算
+            stage_timer (StageTimer): (可选) 逐设备地为读取日志、构建索引表计时，并逐批地为定义使用周期、数据分析管道计时
+        """
+        if use_parallel:
+            return DataAnalyserBackendAgent.analyse_logs_in_parallel(
+                zip_data, log_files, pattern_choice, progress_callback=progress_callback, stage_timer=stage_timer
+            )
+
+        stage = (stage_timer or DISABLED_STAGE_TIMER).stage
+
+        # Initialize an empty dataframe to store the index table of the devices (rows) of the current batch
+        # dfda: Device Log Data Analysis
+        dfda_log_batch = pd.DataFrame()
+
+        # Keep the parsed logs of the current batch (in the same order as the rows of the index table)
+        # 按索引表的行顺序保留当前这一批设备的已解析日志，供批量分析使用
+        df_logs = []
+        num_rows_batch = 0
+
+        dfda_logs_analysed = []
+        num_rows = 0
+
+        with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_ref:
+            for i, log_file in enumerate(log_files):
+
+                # Each log is parsed only once per uploaded zip package, even if the pattern is switched
+                # 同一个压缩包中的每个日志只被解析一次，即使之后切换了计算模式
+                with stage('read_device_log', device=log_file) as read_stage:
+                    if parsed_log_store is None:
+                        df_log = _read_a_log_in_zip(zip_ref, log_file)
+                    else:
+                        df_log = parsed_log_store.get_or_parse(log_file, lambda: _read_a_log_in_zip(zip_ref, log_file))
+                    read_stage.rows = len(df_log)
+
+                with stage('index_a_dfda_log', device=log_file, rows=len(df_log)):
+                    dfda_log_individual = DataAnalyserBackendAgent.index_a_dfda_log(df_log, format_checked=True)
+
+                # Merge the index tables of each device
+                dfda_log_batch = DataAnalyserBackendAgent.concat_dfda_log(dfda_log_batch, dfda_log_individual)
+
+                df_logs.append(df_log)
+                num_rows_batch += len(df_log)
+                num_rows += len(df_log)
+
+                # Analyse the batch and drop its raw logs as soon as the budget is reached
+                # 达到预算后，立即完成这一批设备的统计并释放其原始日志
+                if num_rows_batch >= batch_rows or i == len(log_files) - 1:
+                    dfda_logs_analysed.append(
+                        DataAnalyserBackendAgent._analyse_a_batch_of_devices(
+                            dfda_log_batch, df_logs, pattern_choice, stage_timer=stage_timer
+                        )
+                    )
+
+                    dfda_log_batch = pd.DataFrame()
+                    df_logs = []
+                    num_rows_batch = 0
+
+                if progress_callback is not None:
+                    progress_callback(i + 1, len(log_files), num_rows)
+
+        return pd.concat(dfda_logs_analysed, ignore_index=True)
+
+    # Latest update: 2026-10-18
+    @staticmethod
+    def _analyse_a_batch_of_devices(dfda_log, df_logs, pattern_choice, stage_timer=None):
+
+        # Define the usage periods of all devices in one vectorized pass (one row per device in every multi-file pattern)
+        # 所有设备的使用周期在一次向量化的计算中完成定义（多文件的各计算模式下，每台设备仍只占一行）
+        with (stage_timer or DISABLED_STAGE_TIMER).stage('define_uptime_and_downtime', rows=sum(len(df_log) for df_log in df_logs)):
+            dfda_log, _ = DataAnalyserBackendAgent.define_uptime_and_downtime_for_fleet(
+                dfda_log.reset_index(drop=True), df_logs, pattern=pattern_choice
+            )
+
+        # 索引表的每一行与 df_logs 中的日志按位置一一对应，因此不再需要逐设备地匹配 “标识列”；
+        # 所有设备的日志被合并为一张以设备为键的大表，并通过批量模式的数据分析管道一次性完成统计
+        return DataAnalyserBackendAgent.conduct_the_batch_pipeline(dfda_log, df_logs, stage_timer=stage_timer)
+
+    # Latest update: 2026-10-18
+    @staticmethod
+    def analyse_logs_in_parallel(zip_data, log_files, pattern_choice, max_workers=None, progress_callback=None, stage_timer=None):
+        """
+        以多进程并行的方式处理压缩包中的多个日志：每个子进程负责读取一个日志、构建其索引表并执行数据分析管道，
+        然后仅返回该设备的统计结果（即索引表中的一行）；主进程再按日志在压缩包中的顺序合并这些结果。
+
+        Args:
+            zip_data (bytes): 压缩包的内容
+            log_files (list): 压缩包中需要处理的日志文件名
+            pattern_choice: 使用时长的计算模式，见 define_uptime_and_downtime
+            max_workers: 子进程的个数；默认为 CPU 核数
+            progress_callback: (可选) 每处理完一个日志时被调用，参数为 (已完成的个数, 总个数, 已处理的记录数)
+            stage_timer (StageTimer): (可选) 子进程逐设备地记录各阶段的耗时，并随统计结果一并返回
+        """
+        # Workers time their stages on their own, and send the records back with the results
+        # 子进程各自为其阶段计时，并将记录随统计结果一并返回
+        time_stages = stage_timer is not None and stage_timer.enabled
+
+        dfda_logs_individual = [None] * len(log_files)
+        num_rows = 0
+
+        # Workers read the zip package from a temporary file, rather than receiving its content one by one
+        # 子进程从临时文件中读取压缩包，避免将压缩包的内容逐个传递给子进程
+        with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as zip_temp_file:
+            zip_temp_file.write(zip_data)
+
+        try:
+            # Spawn (rather than fork) the workers, since the Streamlit server process runs multiple threads
+            # Streamlit 服务进程是多线程的，因此以 spawn（而非 fork）的方式启动子进程
+            with ProcessPoolExecutor(
+                max_workers=max_workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context('spawn')
+            ) as executor:
+
+                futures = {
+                    executor.submit(_analyse_a_log_in_zip, zip_temp_file.name, log_file, pattern_choice, time_stages): i
+                    for i, log_file in enumerate(log_files)
+                }
+
+                for num_done, future in enumerate(as_completed(futures), start=1):
+                    dfda_logs_individual[futures[future]], num_rows_of_log, stage_records = future.result()
+                    num_rows += num_rows_of_log
+
+                    if time_stages:
+                        stage_timer.extend(stage_records)
+
+                    if progress_callback is not None:
+                        progress_callback(num_done, len(log_files), num_rows)
+
+        finally:
+            os.remove(zip_temp_file.name)
+
+        return pd.concat(dfda_logs_individual, ignore_index=True)
+
+
+def _read_a_log_in_zip(zip_ref, log_file):
+    """
+    读取压缩包中的一个日志（见 open_log_member）并检查其标识列；解压后的副本在读取完成后即被释放。
+    """
+    with open_log_member(zip_ref, log_file) as uploaded_file:
+
+        df_log = get_default_log_cache().read_device_log(uploaded_file)
+
+        DataAnalyserBackendAgent.check_id_existence(df_log, uploaded_file)
+
+    return df_log
+
+
+# Latest update: 2026-10-18
+def _analyse_a_log_in_zip(zip_path, log_file, pattern_choice, time_stages=False):
+    """
+    子进程的任务：读取压缩包中的一个日志，构建其索引表，执行数据分析管道，
+    并返回该设备的统计结果、该日志的记录数，以及各阶段的计时记录（time_stages 为 False 时为空列表）。
+    """
+    stage_timer = StageTimer(enabled=time_stages)
+
+    with stage_timer.stage('read_device_log', device=log_file) as stage:
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            df_log = _read_a_log_in_zip(zip_ref, log_file)
+        stage.rows = len(df_log)
+
+    with stage_timer.stage('index_a_dfda_log', device=log_file, rows=len(df_log)):
+        dfda_log = DataAnalyserBackendAgent.index_a_dfda_log(df_log, format_checked=True)
+
+    with stage_timer.stage('define_uptime_and_downtime', device=log_file, rows=len(df_log)):
+        dfda_log = DataAnalyserBackendAgent.define_uptime_and_downtime(dfda_log, df_log, pattern=pattern_choice)
+
+    dfda_log_updated = DataAnalyserBackendAgent.conduct_the_batch_pipeline(dfda_log, [df_log], stage_timer=stage_timer)
+
+    return dfda_log_updated, len(df_log), stage_timer.records
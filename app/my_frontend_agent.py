@@ -9,7 +9,7 @@ Class-DataAnalyserFrontendAgent (类-数据分析前端代理) 的实现
 # Email: xuanzhichen.42@gmail.com
 # License: MIT
 
-# Latest Update: 2025/07/29
+# Latest Update: 2026/10/18
 
 
 # 导入开源可视化图表库的 —— ECharts —— 基于 JavaScript 风格的配置项 (Options)
@@ -49,6 +49,13 @@ from app.echarts_js_pseudo import (
 
 from streamlit_echarts import st_echarts
 import pandas as pd
+import numpy as np
+
+from utils.chart_series import (
+    STATUS_CODES, ChartSeries, format_date_labels,
+    build_usage_track, build_daily_operation_modes, build_daily_signal_means
+)
+from utils.downsampling import DEFAULT_MAX_POINTS, lttb_indices, category_preserving_indices
 
 
 class DataAnalyserFrontendAgent():
@@ -67,69 +74,35 @@ class DataAnalyserFrontendAgent():
         """
 
         # Helper function to format dates as YY-MM-DD
+        # Latest update: 2026-10-18
+        # 以向量化的方式格式化（见 utils/chart_series.py），而非逐个日期地格式化
         def format_dates(dates):
-
-            formatted_dates = []
-
-            for date in dates:
-                # Get the last two digits of the year
-                year_short = str(date.year)[-2:]
-                formatted_dates.append(f"{year_short}-{date.strftime('%m-%d')}")
-
-            return formatted_dates
+            return format_date_labels(dates).tolist()
         
         # Helper function to map status to a number
+        # Latest update: 2026-10-18
+        # 编码见 utils/chart_series.py 中的 STATUS_CODES：0 '*无类型记录'，1 '上线/下线'，2 '开启灌溉'，3 '设备状态'
         def map_status(status):
-            if status not in ['设备上线', '设备下线', '设备状态', '开启灌溉', '关闭灌溉']:
-                return 0  # '*无类型记录'
-            elif status in ['设备上线', '设备下线']:
-                return 1  # '上线/下线'
-            elif status in ['开启灌溉', '关闭灌溉']:
-                return 2  # '开启灌溉'
-            else:  
-                return 3 # '设备状态'
+            return STATUS_CODES.get(status, 0)
 
         # 生命周期与使用时长-可视化
+        # Latest update: 2026-10-18
+        # 所有 “单设备处理” 的图表都从同一份预先排序的、不可变的图表数据序列 (ChartSeries) 中读取，而不再各自排序或修改日志
         @staticmethod
-        def visualize_usage_track(dfda_log_translated, df_log):
+        def visualize_usage_track(dfda_log_translated, chart_series: ChartSeries):
 
-            def _get_required_parameters(dfda_log_translated, df_log):
+            def _get_required_parameters(dfda_log_translated, chart_series):
 
                 required_parameters = {}
 
-                # Get the date range from the dataframe
-                df_log['创建时间'] = pd.to_datetime(df_log['创建时间']) # Ensure '创建时间' is in datetime format
-                df_log_dates = df_log['创建时间'].dt.date
-                min_date = df_log_dates.min()
-                max_date = df_log_dates.max()
-                
-                # Create date range from min to max date
-                date_range = pd.date_range(start=min_date, end=max_date, freq='D')
-                
-                # Initialize status array (0 = offline, 1 = online)
-                status_data = []
-                
-                # Check each date in the range
-                for date in date_range:
-                    date_only = date.date()
-                    is_online = False
-                    
-                    # Check if this date falls within any online period
-                    for _, row in dfda_log_translated.iterrows():
-                        try:
-                            online_start = pd.to_datetime(row['上线日期']).date()
-                            online_end = pd.to_datetime(row['下线日期 (或日志导出时间)']).date()
-                            
-                            # Check if current date is within the online period
-                            if (online_start <= date_only) and (date_only <= online_end):
-                                is_online = True
-                                break
-                        except:
-
-                            # Handle any date parsing errors
-                            continue
-                    
-                    status_data.append(1 if is_online else 0)
+                # The online/offline status of each day is built from the period intervals with a difference array,
+                # instead of checking every period for every day (see utils/chart_series.py)
+                # 每一天的上下线状态由使用周期的区间经差分数组一次性得到，而不是逐日期地检查每一个使用周期
+                date_range, status_data = build_usage_track(
+                    chart_series.timestamps,
+                    dfda_log_translated['上线日期'],
+                    dfda_log_translated['下线日期 (或日志导出时间)']
+                )
                 
                 # Format dates for x-axis (e.g., 2025-01-01 -> 25-01)
                 x_axis_dates = DataAnalyserFrontendAgent.SingleDeviceProcessing.format_dates(date_range)
@@ -138,12 +111,12 @@ class DataAnalyserFrontendAgent():
                 required_parameters['x_axis_dates'] = x_axis_dates
                 
                 # status_data (list): 设备上下线状态的数据列表，1 表示设备在线（即日志连续），0 表示设备离线（即日志中断）
-                required_parameters['status_data'] = status_data
+                required_parameters['status_data'] = status_data.tolist()
 
                 return required_parameters
 
             # 第一步：根据日志统计表，获取必要的参数
-            required_parameters = _get_required_parameters(dfda_log_translated, df_log)
+            required_parameters = _get_required_parameters(dfda_log_translated, chart_series)
 
             # 第二步：获取 ECharts 基于 JavaScript 风格的配置项 (Options)
             options_usage_track = get_options_usage_track(
@@ -156,43 +129,44 @@ class DataAnalyserFrontendAgent():
 
         # 操作类型（实时）-可视化
         @staticmethod
-        def visualize_operation_real_time(df_log: pd.DataFrame, uploaded_file):
+        def visualize_operation_real_time(chart_series: ChartSeries, uploaded_file, max_points=DEFAULT_MAX_POINTS):
             
-            def _get_required_parameters(df_log):
+            def _get_required_parameters(chart_series):
 
                 required_parameters = {}
 
                 # Define the 4 categories
                 status_categories = ['0', '1', '2', '3']
 
-                # Format dates for real-time status chart
-                x_axis_data = DataAnalyserFrontendAgent.SingleDeviceProcessing.format_dates(
-                    df_log.sort_values('创建时间')['创建时间']
-                )
-
-                status_raw = df_log.sort_values('创建时间')['操作类型'].tolist()    
-                y_axis_data = [DataAnalyserFrontendAgent.SingleDeviceProcessing.map_status(s) for s in status_raw]
+                # Keep at most 'max_points' points
+                # (every operation type present in a stretch of the log survives the downsampling, see utils/downsampling.py)
+                # 将点数降采样至至多 max_points 个（每一段日志中出现过的操作类型都会被保留）
+                kept = category_preserving_indices(chart_series.status_codes, max_points=max_points)
 
                 # x_axis_data (list): 即日志本身的记录范围（未必连续），格式已简化，例如 ['25-01', '25-02', ..., '25-12']
-                required_parameters['x_axis_data'] = x_axis_data
+                required_parameters['x_axis_data'] = chart_series.labels[kept].tolist()
 
                 # y_axis_data (list): 映射日志的每个时间戳 (x_axis_data) 所对应的操作类型（编码）
-                required_parameters['y_axis_data'] = y_axis_data
+                required_parameters['y_axis_data'] = chart_series.status_codes[kept].tolist()
 
                 # status_categories (list): 对不同操作类型的编码，例如 [0, 1, 2, 3]
                 required_parameters['status_categories'] = status_categories
 
+                # n_rows (int): 日志原本的记录数（降采样前）
+                required_parameters['n_rows'] = chart_series.n_rows
+
                 return required_parameters
             
             # 第一步：根据日志统计表，获取必要的参数
-            required_parameters = _get_required_parameters(df_log)
+            required_parameters = _get_required_parameters(chart_series)
             
             # 第二步：获取 ECharts 基于 JavaScript 风格的配置项 (Options)
             options_operation_real_time = get_options_operation_real_time(
                 uploaded_file=uploaded_file,
                 x_axis_data=required_parameters['x_axis_data'],
                 y_axis_data=required_parameters['y_axis_data'],
-                status_categories=required_parameters['status_categories']
+                status_categories=required_parameters['status_categories'],
+                n_rows=required_parameters['n_rows']
             )
             
             # 第三步：使用 Streamlit 的第三方容器 (ECharts) 以可视化图表    
@@ -200,23 +174,21 @@ class DataAnalyserFrontendAgent():
 
         # 操作类型（日均）-可视化
         @staticmethod
-        def visualize_operation_daily_average(df_log: pd.DataFrame, uploaded_file):
+        def visualize_operation_daily_average(chart_series: ChartSeries, uploaded_file):
             
-            def _get_required_parameters(df_log):
+            def _get_required_parameters(chart_series):
 
                 required_parameters = {}
 
                 # Define the 4 categories
                 status_categories = ['0', '1', '2', '3']
 
-                daily_status = df_log.copy()
-                daily_status['date'] = daily_status['创建时间'].dt.date
+                # The daily modes come from a single (day × operation type) count table (see utils/chart_series.py)
+                # 每日的众数由一张 (日期 × 操作类型) 的计数表一次性得到
+                daily_operation_modes = build_daily_operation_modes(chart_series.timestamps, chart_series.operations)
 
-                daily_status_mode = daily_status.groupby('date')['操作类型'].agg(lambda x: x.mode().iloc[0] if not x.mode().empty else None)
-                daily_status_mode = daily_status_mode.sort_index()
-
-                daily_status_mode_idx = daily_status_mode.map(DataAnalyserFrontendAgent.SingleDeviceProcessing.map_status).tolist()
-                daily_status_dates = DataAnalyserFrontendAgent.SingleDeviceProcessing.format_dates(pd.to_datetime(daily_status_mode.index))
+                daily_status_mode_idx = [STATUS_CODES.get(status, 0) for status in daily_operation_modes['operation']]
+                daily_status_dates = DataAnalyserFrontendAgent.SingleDeviceProcessing.format_dates(daily_operation_modes['date'])
 
                 # daily_status_dates (list): 将实时日志按日聚合（降频）后的列表，格式已简化，例如 ['25-01-01', '25-01-02', ..., '25-12-31']
                 required_parameters['daily_status_dates'] = daily_status_dates
@@ -231,7 +203,7 @@ class DataAnalyserFrontendAgent():
                 return required_parameters
 
             # 第一步：根据日志统计表，获取必要的参数
-            required_parameters = _get_required_parameters(df_log)  
+            required_parameters = _get_required_parameters(chart_series)  
             
             # 第二步：获取 ECharts 基于 JavaScript 风格的配置项 (Options)
             options_operation_daily_average = get_options_operation_daily_average(
@@ -246,33 +218,36 @@ class DataAnalyserFrontendAgent():
         
         # 信号强度（实时）-可视化   
         @staticmethod
-        def visualize_signal_real_time(df_log: pd.DataFrame, uploaded_file):
+        def visualize_signal_real_time(chart_series: ChartSeries, uploaded_file, max_points=DEFAULT_MAX_POINTS):
             
-            def _get_required_parameters(df_log):
+            def _get_required_parameters(chart_series):
 
                 required_parameters = {}
 
-                signal_data = [0 if pd.isna(val) else val for val in df_log.sort_values('创建时间')['信号']]
-                x_axis_data_signal = DataAnalyserFrontendAgent.SingleDeviceProcessing.format_dates(
-                    df_log.sort_values('创建时间')['创建时间']
-                )
+                # Keep at most 'max_points' points chosen by LTTB (see utils/downsampling.py)
+                # 以 LTTB 算法将点数降采样至至多 max_points 个
+                kept = lttb_indices(chart_series.signals_filled, max_points=max_points)
 
                 # signal_data (list): 映射日志的每个时间戳 (x_axis_data_signal) 所对应的信号强度值
-                required_parameters['signal_data'] = signal_data
+                required_parameters['signal_data'] = chart_series.signals_filled[kept].tolist()
 
                 # x_axis_data_signal (list): 即日志本身的记录范围（未必连续），格式已简化，例如 ['25-01', '25-02', ..., '25-12']
-                required_parameters['x_axis_data_signal'] = x_axis_data_signal
+                required_parameters['x_axis_data_signal'] = chart_series.labels[kept].tolist()
+
+                # n_rows (int): 日志原本的记录数（降采样前）
+                required_parameters['n_rows'] = chart_series.n_rows
 
                 return required_parameters
 
             # 第一步：根据日志统计表，获取必要的参数
-            required_parameters = _get_required_parameters(df_log)
+            required_parameters = _get_required_parameters(chart_series)
 
             # 第二步：获取 ECharts 基于 JavaScript 风格的配置项 (Options)   
             options_signal_real_time = get_options_signal_real_time(
                 uploaded_file=uploaded_file,
                 signal_data=required_parameters['signal_data'],
-                x_axis_data_signal=required_parameters['x_axis_data_signal']
+                x_axis_data_signal=required_parameters['x_axis_data_signal'],
+                n_rows=required_parameters['n_rows']
             )
 
             # 第三步：使用 Streamlit 的第三方容器 (ECharts) 以可视化图表    
@@ -280,22 +255,16 @@ class DataAnalyserFrontendAgent():
 
         # 信号强度（日均）-可视化
         @staticmethod
-        def visualize_signal_daily_average(df_log: pd.DataFrame, uploaded_file):
+        def visualize_signal_daily_average(chart_series: ChartSeries, uploaded_file):
             
-            def _get_required_parameters(df_log):
+            def _get_required_parameters(chart_series):
 
                 required_parameters = {}
 
-                daily_signal = df_log.copy()
-                daily_signal['date'] = daily_signal['创建时间'].dt.date
+                daily_dates, daily_signal_means = build_daily_signal_means(chart_series.timestamps, chart_series.signals)
 
-                daily_signal_mean = daily_signal.groupby('date')['信号'].mean().round(2)
-                daily_signal_mean = daily_signal_mean.sort_index()
-
-                daily_signal_dates = DataAnalyserFrontendAgent.SingleDeviceProcessing.format_dates(
-                    pd.to_datetime(daily_signal_mean.index)
-                )
-                daily_signal_values = [0 if pd.isna(val) else val for val in daily_signal_mean]
+                daily_signal_dates = DataAnalyserFrontendAgent.SingleDeviceProcessing.format_dates(daily_dates)
+                daily_signal_values = np.nan_to_num(daily_signal_means, nan=0.0).tolist()
 
                 # daily_signal_dates (list): 将实时日志按日聚合（降频）后的列表，格式已简化，例如 ['25-01-01', '25-01-02', ..., '25-12-31']
                 required_parameters['daily_signal_dates'] = daily_signal_dates
@@ -307,7 +276,7 @@ class DataAnalyserFrontendAgent():
                 return required_parameters
 
             # 第一步：根据日志统计表，获取必要的参数
-            required_parameters = _get_required_parameters(df_log)
+            required_parameters = _get_required_parameters(chart_series)
 
             # 第二步：获取 ECharts 基于 JavaScript 风格的配置项 (Options)
             options_signal_daily_average = get_options_signal_daily_average(
@@ -11,7 +11,7 @@ Class-PagesDataAnalysis (类-数据分析页面) 的实现
 # Email: xuanzhichen.42@gmail.com
 # License: MIT
 
-# Latest Update: 2025/07/29
+# Latest Update: 2026/10/18
 
 
 import pandas as pd
@@ -23,9 +23,26 @@ import os
 import streamlit as st
 
 from app.my_backend_agent import DataAnalyserBackendAgent
+from utils.parsed_log_store import ParsedLogStore
+from utils.chart_series import ChartSeries
+from utils.result_cache import ResultCache, get_default_result_cache
+from utils.job_runner import DONE, FAILED, get_default_job_runner
+from utils.log_reader import read_device_log
+from utils.log_cache import get_default_log_cache
+from utils.zip_ingestion import list_log_members
+from utils.stage_timer import DISABLED_STAGE_TIMER, StageTimer
 from app.my_frontend_agent import DataAnalyserFrontendAgent
 
 
+# Number of log files from which the parallel processing is enabled by default
+# 日志数量达到该值时，默认启用多进程并行处理
+PARALLEL_THRESHOLD = 20
+
+# Interval (in seconds) at which the page polls the progress of a background analysis job
+# 页面轮询后台分析任务进度的时间间隔（秒）
+JOB_POLL_INTERVAL = 0.5
+
+
 class PagesDataAnalysis:
     @staticmethod
     def render(page_title):
@@ -40,16 +57,24 @@ class PagesDataAnalysis:
     def _build_an_index_table(
         df_log: pd.DataFrame, 
         uploaded_file: pd.ExcelFile, 
-        pattern_choice: str
+        pattern_choice: str,
+        stage_timer: StageTimer = None
     ):
+        # Latest update: 2026-10-18
+        # stage_timer: (可选) 为以下三个步骤分别计时
+        stage = (stage_timer or DISABLED_STAGE_TIMER).stage
+        device = getattr(uploaded_file, 'name', None)
+
         # Check existence for identification columns: 'imei/IMEI', 'device name/设备ID'
         # 对上传的日志文件，检查 (excel) 这些“标识列”的数值存在性：imei/IMEI', 'device name/设备ID'
-        format_checked = DataAnalyserBackendAgent.check_id_existence(df_log, uploaded_file)
+        with stage('check_id_existence', device=device, rows=len(df_log)):
+            format_checked = DataAnalyserBackendAgent.check_id_existence(df_log, uploaded_file)
 
         # Initialize an index table for the identification columns of (multiple) devices,
         # which is useful for finding and extracting the corresponding log data in (multiple) devices
         # 初始化一张关于（多）设备 “标识列” 的索引表，便于（在多设备情况下）查找和提取对应的日志数据
-        dfda_log = DataAnalyserBackendAgent.index_a_dfda_log(df_log, format_checked)
+        with stage('index_a_dfda_log', device=device, rows=len(df_log)):
+            dfda_log = DataAnalyserBackendAgent.index_a_dfda_log(df_log, format_checked)
 
         # We use the difference between the offline time and the online time to define the usage period of the device,
         # but in actual use, due to reasons such as battery replacement, the device will go offline and the log will be interrupted,
@@ -57,102 +82,60 @@ class PagesDataAnalysis:
         # 我们采用日志的下线时间减去上线时间，来定义设备的使用周期，
         # 但是由于实际使用中，中途更换电池等原因会导致设备离线和日志中断（缺失），从而影响计算的准确性
         # 因此需要根据需求 (pattern) 定义好上线和下线时间，以排除这些因素的影响
-        dfda_log = DataAnalyserBackendAgent.define_uptime_and_downtime(
-            dfda_log, 
-            df_log, 
-            pattern=pattern_choice,
-        )
+        with stage('define_uptime_and_downtime', device=device, rows=len(df_log)):
+            dfda_log = DataAnalyserBackendAgent.define_uptime_and_downtime(
+                dfda_log, 
+                df_log, 
+                pattern=pattern_choice,
+            )
 
         return dfda_log
     
     @staticmethod
-    def _conduct_the_pipeline(data_analyser: DataAnalyserBackendAgent):
-
-        # Simply calculate the life-cycle in months
-        # 简单地计算设备的使用生命周期 (下线时间与上线时间之差)
-        data_analyser.get_usage_period()
-
-        # data_analyser.get_month_len_include_break() # 该函数已弃用
-
-        # if pattern_choice == 'multiple_files_single_period':
-        #
-        #     # Calculate the life-cycle with consideration of day-break events
-        #     # 考虑在设备的整个生命周期内，是否出现显著的日志间断现象，以计算实际的使用生命周期
-        #     data_analyser.get_month_len_exclude_break(
-        #         days_break_threshold=2, 
-        #         threshold_days_for_excluding=30
-        #     )
-
-        #     # Mark the log characteristic as 'Not continued' if maximal broken days over the threshold
-        #     # 如果最大间隔天数超过设定阈值，标记该设备的日志属性为 “不连续”
-        #     data_analyser.get_continued_status(broken_down_threshold=15)
-
-        # Single device processing: Backend program will default to scan and detect the interruption of a single log, and extract all continuous time ranges
-        # Multiple device processing: User may customize the interested time range through the selection of different processing patterns (pattern_choice)
-        # Then: The corresponding time range needs to be extracted as the subsequent parameter statistics space (such as: signal frequency)
-        # 单设备处理：后端程序会默认扫描和检测单个日志下的中断情况，并提取所有连续的时长范围
-        # 多设备处理：用户可以通过选择不同的处理模式 (pattern_choice) 自定义感兴趣的时长范围
-        # 需要据此提取出对应时长范围的 “子日志” (sub-log)，并将该范围作为后续的参数统计空间 (如：信号频次)
-        data_analyser.get_sub_log_based_on_usage_period()
-
-        # Count the frequency of the five operation status recorded in the log over the life-cycle 
-        # 统计日志记录中五种操作状态 (灌溉开启/灌溉关闭/上线/离线/待机) 在设备生命周期内出现的频次
-        data_analyser.get_operation_status()
-
-        # Count the frequency of the four categorizes of signal strength (strong/mid/weak/null)
-        # recorded in the log over the life-cycle
-        # 统计日志记录中四种信号强度 (强信号/中信号/弱信号/无信号) 在设备生命周期内出现的频次 
-        data_analyser.get_signal_strength_frequency()
-
-        # Count the frequency of the cases in which a device went through significant signal switches
-        # 统计日志记录中 (相邻的两个时间戳下) 设备显著切换信号强度的频次
-        data_analyser.get_signal_switch_frequency(window_len=2) 
-
-    @staticmethod
-    def _visualize_usage_track(dfda_log_translated: pd.DataFrame, df_log: pd.DataFrame):
+    def _visualize_usage_track(dfda_log_translated: pd.DataFrame, chart_series: ChartSeries):
 
         DataAnalyserFrontendAgent.SingleDeviceProcessing.visualize_usage_track(
             dfda_log_translated=dfda_log_translated,
-            df_log=df_log,
+            chart_series=chart_series,
         )
 
     @staticmethod
-    def _visualize_operation_real_time(df_log: pd.DataFrame, uploaded_file):
+    def _visualize_operation_real_time(chart_series: ChartSeries, uploaded_file):
 
         st.markdown("<div style='margin-top: 20px;'></div>", unsafe_allow_html=True)
 
         DataAnalyserFrontendAgent.SingleDeviceProcessing.visualize_operation_real_time(
-            df_log=df_log,
+            chart_series=chart_series,
             uploaded_file=uploaded_file
         )
 
     @staticmethod
-    def _visualize_signal_real_time(df_log: pd.DataFrame, uploaded_file):
+    def _visualize_signal_real_time(chart_series: ChartSeries, uploaded_file):
 
         st.markdown("<div style='margin-top: 20px;'></div>", unsafe_allow_html=True)
 
         DataAnalyserFrontendAgent.SingleDeviceProcessing.visualize_signal_real_time(
-            df_log=df_log,
+            chart_series=chart_series,
             uploaded_file=uploaded_file
         )
 
     @staticmethod
-    def _visualize_operation_daily_average(df_log: pd.DataFrame, uploaded_file):
+    def _visualize_operation_daily_average(chart_series: ChartSeries, uploaded_file):
 
         st.markdown("<div style='margin-top: 20px;'></div>", unsafe_allow_html=True)
 
         DataAnalyserFrontendAgent.SingleDeviceProcessing.visualize_operation_daily_average(
-            df_log=df_log,
+            chart_series=chart_series,
             uploaded_file=uploaded_file
         )
 
     @staticmethod
-    def _visualize_signal_daily_average(df_log: pd.DataFrame, uploaded_file):
+    def _visualize_signal_daily_average(chart_series: ChartSeries, uploaded_file):
 
         st.markdown("<div style='margin-top: 20px;'></div>", unsafe_allow_html=True)
 
         DataAnalyserFrontendAgent.SingleDeviceProcessing.visualize_signal_daily_average(
-            df_log=df_log,
+            chart_series=chart_series,
             uploaded_file=uploaded_file
         )
     
@@ -199,6 +182,27 @@ class PagesDataAnalysis:
             dfda_log_translated=dfda_log_translated
         )
 
+    # Latest update: 2026-10-18
+    @staticmethod
+    def _render_the_stage_timings(stage_timer: StageTimer, file_name: str):
+
+        st.markdown("<div style='margin-top: 20px;'></div>", unsafe_allow_html=True)
+
+        with st.expander("各阶段耗时（墙钟时间、CPU 时间与记录数）"):
+
+            st.markdown("按阶段汇总：")
+            st.dataframe(stage_timer.summary(), use_container_width=True)
+
+            st.markdown("逐设备明细：")
+            st.dataframe(stage_timer.to_frame(), use_container_width=True)
+
+            st.download_button(
+                label="导出为 JSON",
+                data=stage_timer.to_json(),
+                file_name=f"{os.path.splitext(file_name)[0]}_stage_timings.json",
+                mime="application/json"
+            )
+
     @staticmethod
     def _render_the_2th_page(): # Page title: 单设备处理
 
@@ -206,8 +210,8 @@ class PagesDataAnalysis:
         # st.markdown("---")
 
         uploaded_file = st.file_uploader(
-            label="请将您感兴趣的日志（仅限xlsx文件）拖放到此处：", 
-            type="xlsx", 
+            label="请将您感兴趣的日志（xlsx, csv, parquet 或 jsonl 文件）拖放到此处：", 
+            type=["xlsx", "csv", "parquet", "jsonl"], 
             accept_multiple_files=False
         )
 
@@ -229,38 +233,39 @@ class PagesDataAnalysis:
             # )
             st.markdown("### 样例日志（预加载）")
             st.markdown(f"文件名（类型）：`{uploaded_file.name}`")
-            st.dataframe(pd.read_excel(uploaded_file), use_container_width=True)
+            st.dataframe(read_device_log(uploaded_file, columns=None), use_container_width=True)
         
-        df_log = pd.read_excel(uploaded_file)
+        # Latest update: 2026-10-18
+        # Per-stage timings cost nothing unless switched on
+        # 分阶段计时默认关闭，关闭时对管道几乎没有额外开销
+        stage_timer = StageTimer(enabled=st.toggle(
+            "记录各阶段耗时",
+            value=False,
+            key="time_stages_of_single_device",
+            help="记录读取日志、构建索引表、定义使用周期以及管道中各项统计的墙钟时间、CPU 时间与记录数，并可导出为 JSON。"
+        ))
+
+        # Latest update: 2026-10-18
+        # 只读取数据分析所需的列，并在读取时一次性地解析 '创建时间'；内容未变的日志直接读取其列式缓存
+        with stage_timer.stage('read_device_log', device=uploaded_file.name) as stage:
+            df_log = get_default_log_cache().read_device_log(uploaded_file)
+            stage.rows = len(df_log)
 
         dfda_log = PagesDataAnalysis._build_an_index_table(
             df_log, 
             uploaded_file, 
-            pattern_choice='single_file_multiple_periods'
+            pattern_choice='single_file_multiple_periods',
+            stage_timer=stage_timer
         )
 
-        # Implement data analysis logic for each device log
-        data_analyser = DataAnalyserBackendAgent(dfda_log)
+        # Latest update: 2026-10-18
+        # Analyse all usage periods at once: the log is sorted and partitioned into periods only once,
+        # instead of re-running the whole pipeline against the full log for each period (row) of the index table
+        # 一次性地分析所有使用周期：日志只被排序并划分一次，而不是对索引表的每个周期（行）都针对完整的日志重新执行一遍管道
+        dfda_log_updated = DataAnalyserBackendAgent.conduct_the_multi_period_pipeline(dfda_log, df_log, stage_timer=stage_timer)
 
-        for index, row in dfda_log.iterrows():
-
-            # We don't need to pass the device_name or imei, as they are same for single device log
-            # device_name = row['device_name']
-            # imei = row['imei']
-
-            # Instead, we need to pass the index to identity the row
-            data_analyser.identify_id_info(
-                df_device_log=df_log, 
-                use_index=True, 
-                index=index,
-                device_name=None,
-                imei=None
-            )
-
-            PagesDataAnalysis._conduct_the_pipeline(data_analyser)
-
-        dfda_log_updated = data_analyser._df_data_analysis
-        dfda_log_translated = DataAnalyserBackendAgent.translate_and_mildly_modify_your_df(dfda_log_updated)
+        with stage_timer.stage('translate_and_mildly_modify_your_df', rows=len(dfda_log_updated)):
+            dfda_log_translated = DataAnalyserBackendAgent.translate_and_mildly_modify_your_df(dfda_log_updated)
 
         st.markdown("### 基于日志的参数统计表")
 
@@ -278,9 +283,16 @@ class PagesDataAnalysis:
 
         st.markdown("### 基于日志的可视化与分析")
 
+        # Latest update: 2026-10-18
+        # All charts below read from one pre-sorted, immutable chart series built once for the uploaded log,
+        # instead of each sorting (and possibly modifying) the shared df_log on its own
+        # 以下所有图表都从同一份为该日志只构建一次的、预先排序的、不可变的图表数据序列中读取，而不再各自排序（甚至修改）共享的 df_log
+        with stage_timer.stage('ChartSeries.from_log', device=uploaded_file.name, rows=len(df_log)):
+            chart_series = ChartSeries.from_log(df_log)
+
         st.markdown("#### A. 生命周期与使用时长")
 
-        PagesDataAnalysis._visualize_usage_track(dfda_log_translated, df_log)
+        PagesDataAnalysis._visualize_usage_track(dfda_log_translated, chart_series)
 
         st.markdown("#### B. 操作类型与信号强度")
 
@@ -294,15 +306,61 @@ class PagesDataAnalysis:
             
         if status_chart_type == '实时（即展示所有日志记录）':
 
-            PagesDataAnalysis._visualize_operation_real_time(df_log, uploaded_file)
+            PagesDataAnalysis._visualize_operation_real_time(chart_series, uploaded_file)
             
-            PagesDataAnalysis._visualize_signal_real_time(df_log, uploaded_file)
+            PagesDataAnalysis._visualize_signal_real_time(chart_series, uploaded_file)
 
         else:
 
-            PagesDataAnalysis._visualize_operation_daily_average(df_log, uploaded_file)
+            PagesDataAnalysis._visualize_operation_daily_average(chart_series, uploaded_file)
+
+            PagesDataAnalysis._visualize_signal_daily_average(chart_series, uploaded_file)
+
+        if stage_timer.enabled:
+            PagesDataAnalysis._render_the_stage_timings(stage_timer, uploaded_file.name)
+
+    # Latest update: 2026-10-18
+    @staticmethod
+    def _analyse_the_zip(zip_data, log_files, pattern_choice, use_parallel, parsed_log_store, progress_callback, time_stages=False):
+        """
+        对压缩包中的所有日志执行数据分析管道（在后台任务中执行，不涉及任何页面元素），返回统计表：
+        'dfda_log_updated' 为翻译前的逐设备统计结果，'dfda_log_translated' 为翻译后用于展示的统计表，
+        'stage_timer' 为本次分析的分阶段计时器（time_stages 为 False 时被禁用）。
+        """
+        stage_timer = StageTimer(enabled=time_stages)
+
+        dfda_log_updated = DataAnalyserBackendAgent.analyse_logs_in_zip(
+            zip_data,
+            log_files,
+            pattern_choice,
+            use_parallel=use_parallel,
+            parsed_log_store=parsed_log_store,
+            progress_callback=progress_callback,
+            stage_timer=stage_timer
+        )
+
+        # Translate and mildly modify the processed statistical analysis table for subsequent visualization
+        with stage_timer.stage('translate_and_mildly_modify_your_df', rows=len(dfda_log_updated)):
+            dfda_log_translated = DataAnalyserBackendAgent.translate_and_mildly_modify_your_df(dfda_log_updated)
+
+        return {
+            'dfda_log_updated': dfda_log_updated,
+            'dfda_log_translated': dfda_log_translated,
+            'stage_timer': stage_timer,
+        }
+
+    @staticmethod
+    def _render_the_job_progress(job):
+
+        progress = job.progress()
+        files_done, files_total = progress['files_done'], progress['files_total']
 
-            PagesDataAnalysis._visualize_signal_daily_average(df_log, uploaded_file)
+        st.info(" 批量处理多设备日志可能耗时较久，分析正在后台执行，期间您可以自由地操作页面...", icon="ℹ️")
+        st.progress(files_done / files_total if files_total else 0.0)
+        st.text(
+            f"任务 {job.job_id[:8]}：已处理 {files_done} / {files_total} 个日志，"
+            f"共 {progress['rows_processed']} 条记录（{progress['throughput']:.0f} 条/秒，已用时 {progress['elapsed']:.1f} 秒）"
+        )
 
     @staticmethod
     def _render_the_3rd_page(): # Page title: 多设备处理
@@ -367,18 +425,31 @@ class PagesDataAnalysis:
             st.session_state.current_pattern = None
             st.session_state.pattern_choice = None
 
+            # Latest update: 2026-10-18
+            # 每个上传的压缩包对应一个新的已解析日志仓库，切换计算模式时将复用其中已解析的日志
+            if 'parsed_log_store' in st.session_state:
+                st.session_state.parsed_log_store.clear()
+            st.session_state.parsed_log_store = ParsedLogStore()
+
+            # A job still running for the previous file keeps running, and its result is cached for later
+            # 上一个文件尚未结束的分析任务将继续在后台执行，其结果会被缓存以备后用
+            st.session_state.analysis_job_id = None
+
         # Read the zip package expected to contain multiple log files related to multiple devices
-        zip_data = uploaded_file.read()
+        # Latest update: 2026-10-18
+        # getvalue() shares the buffer of the uploaded file rather than copying it; members are only listed here,
+        # and are read one by one (see utils.zip_ingestion) by the analysis job
+        # getvalue() 与上传的文件共享缓冲区而不复制；此处只列出日志成员，它们由分析任务逐个读取
+        zip_data = uploaded_file.getvalue()
         zip_buffer = io.BytesIO(zip_data)
         
-        # Extract files from the zip package
+        # List the logs (.xlsx/.csv/.parquet/.jsonl, possibly in nested directories) of the zip package
         with zipfile.ZipFile(zip_buffer, 'r') as zip_ref:
             
-            file_list = zip_ref.namelist()
-            xlsx_files = [f for f in file_list if f.endswith('.xlsx')]
+            log_files = list_log_members(zip_ref)
             
-            # Process each extracted xlsx file
-            if xlsx_files:
+            # Process each log file
+            if log_files:
 
                 if st.session_state.current_file == "智能控制器样例日志（简化测试版）.zip":
                     st.markdown(
@@ -411,6 +482,23 @@ class PagesDataAnalysis:
                         ):
                             st.session_state.pattern_choice = key
 
+                # Latest update: 2026-10-18
+                # 多进程并行模式：每个日志的读取与数据分析管道被分发到不同的子进程中执行（启动子进程本身需要数秒）
+                use_parallel = st.toggle(
+                    "多进程并行处理",
+                    value=len(log_files) >= PARALLEL_THRESHOLD,
+                    key="use_parallel",
+                    help="将日志的读取与分析分发到多个 CPU 核上并行执行；日志数量较多时可显著缩短处理时间。"
+                )
+
+                # Latest update: 2026-10-18
+                time_stages = st.toggle(
+                    "记录各阶段耗时",
+                    value=False,
+                    key="time_stages_of_multiple_devices",
+                    help="逐设备地记录读取日志、构建索引表，并逐批地记录定义使用周期以及管道中各项统计的墙钟时间、CPU 时间与记录数，并可导出为 JSON。"
+                )
+
                 # # Explicitly retrieve the pattern_choice from session state
                 # pattern_choice = st.session_state.pattern_choice
 
@@ -423,6 +511,13 @@ class PagesDataAnalysis:
                 if pattern_choice is not None and pattern_choice != st.session_state.current_pattern:
                     st.session_state.current_pattern = pattern_choice
                     st.session_state.data_processed = False
+
+                # Latest update: 2026-10-18
+                # Switching the timings on (or off) re-runs the analysis, so that the timings shown belong to the result shown
+                # 开启（或关闭）分阶段计时将重新执行分析，使展示的耗时与展示的结果相对应
+                if time_stages != st.session_state.get('current_time_stages', False):
+                    st.session_state.current_time_stages = time_stages
+                    st.session_state.data_processed = False
                 
                 # Launch data processing for either the first time,
                 # or when the pattern choice has changed by users,
@@ -432,104 +527,67 @@ class PagesDataAnalysis:
                     # st.markdown("---")
                     # st.subheader("基于日志的参数统计表")
 
-                    # Add progress indicator
-                    # if len(xlsx_files) > 5：
-                    progress_info = st.info(" 批量处理多设备日志可能耗时较久，请耐心等候...", icon="ℹ️")
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
-                    
-                    # Initialize an empty dataframe to store the index table of 'whole' devices (rows),
-                    # as well as results of data analysis for each 'individual' device (columns)
-                    # dfda: Device Log Data Analysis
-                    dfda_log_whole = pd.DataFrame()
-                    
-                    status_text.text("初始化：正在为日志数据构建设备索引表...")
-                    for i, xlsx_file in enumerate(xlsx_files):
+                    # Latest update: 2026-10-18
+                    # Results are shared by all sessions of the app process, keyed by (zip content, pattern, analyser version);
+                    # a miss is analysed as a background job, so that the page can rerun freely (and be polled) while the job runs
+                    # 分析结果在应用进程的所有会话之间共享，以 (压缩包内容, 计算模式, 分析器版本) 为键；
+                    # 未命中时，分析作为后台任务执行：任务执行期间页面可以自由地重跑，并以轮询的方式展示任务的进度
+                    cache_key = ResultCache.key_of(zip_data, pattern_choice)
+
+                    # Latest update: 2026-10-18
+                    # A timed analysis is cached apart from the untimed one, and keeps the timings of the run that produced it
+                    # 计时的分析结果与未计时的分开缓存，并保留产生该结果的那一次分析的耗时
+                    if time_stages:
+                        cache_key += ('stage_timings',)
+
+                    result = get_default_result_cache().get(cache_key)
+
+                    if result is None:
+
+                        job = get_default_job_runner().get(st.session_state.get('analysis_job_id'))
+
+                        if job is None or job.key != cache_key:
+                            parsed_log_store = st.session_state.parsed_log_store
+
+                            job = get_default_job_runner().submit(
+                                lambda report_progress: get_default_result_cache().get_or_compute(
+                                    cache_key,
+                                    lambda: PagesDataAnalysis._analyse_the_zip(
+                                        zip_data, log_files, pattern_choice, use_parallel, parsed_log_store, report_progress,
+                                        time_stages=time_stages
+                                    )
+                                ),
+                                key=cache_key
+                            )
+                            st.session_state.analysis_job_id = job.job_id
 
-                        # First half of progress: Pre-processing
-                        progress_bar.progress((i + 1) / (len(xlsx_files) * 2))  
-                        
-                        with zip_ref.open(xlsx_file) as uploaded_file:
+                        # Latest update: 2026-10-18
+                        # The status, result and error are read in one snapshot: the job may finish (or fail) at any moment
+                        # 任务的状态、结果与错误在一次快照中读取：任务随时可能结束（或失败）
+                        job_status, job_result, job_error = job.snapshot()
 
-                            df_log = pd.read_excel(uploaded_file)
+                        if job_status not in (DONE, FAILED):
+                            PagesDataAnalysis._render_the_job_progress(job)
 
-                            dfda_log_individual = PagesDataAnalysis._build_an_index_table(
-                                df_log, 
-                                uploaded_file, 
-                                pattern_choice=pattern_choice
-                            )
+                            # Poll the job again shortly
+                            # 稍后再次轮询任务的进度
+                            time.sleep(JOB_POLL_INTERVAL)
+                            st.rerun()
 
-                            # Merge the index tables of each device
-                            dfda_log_whole = DataAnalyserBackendAgent.concat_dfda_log(
-                                dfda_log_whole, dfda_log_individual
-                            )
+                        st.session_state.analysis_job_id = None
 
-                    # Rename the index table for readability
-                    dfda_log = dfda_log_whole.copy()
-                    
-                    # After the index table is built and ready, pass it to the Backend Agent,
-                    # initializing an instance to implement the data analysis pipeline for each device log
-                    data_analyser = DataAnalyserBackendAgent(dfda_log)
-
-                    status_text.text("索引表构建完成！正在调用内置程序处理日志数据...")
-                    for i, xlsx_file in enumerate(xlsx_files):
-
-                        # Second half of progress: Data analysis
-                        progress_bar.progress(0.5 + (i + 1) / (len(xlsx_files) * 2)) 
-
-                        with zip_ref.open(xlsx_file) as uploaded_file:
-
-                            df_log = pd.read_excel(uploaded_file)
-                            device_name = None
-                            imei = None
-                                
-                            if 'device_name' in df_log.columns:
-                                device_name = df_log['device_name'].dropna().iloc[0]
-                            elif '设备ID' in dfda_log.columns:
-                                device_name = df_log['设备ID'].dropna().iloc[0]
-
-                            if 'imei' in dfda_log.columns:
-                                imei = df_log['imei'].dropna().iloc[0]
-                            elif 'IMEI' in dfda_log.columns:
-                                imei = df_log['IMEI'].dropna().iloc[0]
-
-                            # （接下来的）这一步，和之前第一阶段的实习成果最大的区别在于，之前是:
-                            # 根据索引表的 “标识列”（imei, device name）去匹配（上传的压缩包中的以 “标识列” 命名的）日志文件
-                            # 但是，由于后来考虑到，命名问题常常不可控，这里反过来修改为了根据日志文件的 “标识列” 去匹配索引表
-
-                            # 这也导致了这部分的代码存在形同虚设的部分,
-                            # 因为索引表和日志文件都已在缓存内并已排好序，只需在遍历时同时扫描彼此即可，本质上不存在匹配问题
-
-                            # Latest update: 2025-07-17
-                            # 如果未来采用数据库直连的方式，索引表和日志文件的匹配问题将不复存在；
-                            # 因为 “查找日志文件” 的逻辑将由数据库的 select 语句实现
-
-                            data_analyser.identify_id_info(
-                                df_device_log=df_log, 
-                                use_index=False, 
-                                index=None,
-                                device_name=device_name, 
-                                imei=imei
-                            )
-
-                            PagesDataAnalysis._conduct_the_pipeline(data_analyser)
+                        if job_status == FAILED:
+                            st.session_state.pattern_choice = None
+                            st.error(f"日志数据处理失败：{job_error}")
+                            st.stop()
 
-                    # Complete the progress bar
-                    progress_bar.progress(1.0)
-                    status_text.text("处理完成！即将向您展示统计分析与可视化结果...")
-                    
-                    # Clear the progress indicators after a short delay
-                    time.sleep(1.75)
-                    progress_info.empty()
-                    progress_bar.empty()
-                    status_text.empty()
+                        result = job_result
 
-                    # Translate and mildly modify the processed statistical analysis table for subsequent visualization
-                    dfda_log_updated = data_analyser._df_data_analysis
-                    dfda_log_translated = DataAnalyserBackendAgent.translate_and_mildly_modify_your_df(dfda_log_updated)
+                    dfda_log_translated = result['dfda_log_translated']
 
                     # Store the processed data in session state for visualization
                     st.session_state.dfda_log_translated = dfda_log_translated
+                    st.session_state.stage_timer = result['stage_timer']
                     st.session_state.all_devices = dfda_log_translated
                     st.session_state.device_indices = [f'No.{i}' for i in range(len(dfda_log_translated))]
                     
@@ -600,5 +658,11 @@ class PagesDataAnalysis:
                                 dfda_log_translated=st.session_state.dfda_log_translated
                             )
 
+                        # Latest update: 2026-10-18
+                        if st.session_state.get('stage_timer') is not None and st.session_state.stage_timer.enabled:
+                            PagesDataAnalysis._render_the_stage_timings(
+                                st.session_state.stage_timer, st.session_state.current_file
+                            )
+
             else:
-                st.warning("压缩包中没有找到以 '.xlsx' 结尾的日志文件；请检查压缩包的内容并重新上传。")
\ No newline at end of file
+                st.warning("压缩包中没有找到 xlsx, csv, parquet 或 jsonl 格式的日志文件；请检查压缩包的内容并重新上传。")
\ No newline at end of file
@@ -0,0 +1,332 @@
+"""
+数据分析管道的基准测试 (benchmark)
+
+以合成日志（见 utils/synthetic_logs.py）在 1 千、10 万与 1 千万条记录三个规模上，逐阶段地测量数据分析管道的耗时与峰值内存：
+    - 单设备 (single_device)：索引表的构建，define_uptime_and_downtime，DataAnalyser 的各个方法，多周期的批量管道，
+      translate_and_mildly_modify_your_df，以及 “单设备处理” 页面的各个图表参数的构建；
+    - 多设备 (fleet)：相同的总记录数被分给若干台（真实规模的）设备，测量全机群的使用周期定义，批量管道，统计表的翻译，
+      以及 “多设备处理” 页面的各个图表参数的构建。
+
+耗时取多次重复中的最小值；峰值内存则在单独的一次运行中以 tracemalloc 测量（tracemalloc 本身会拖慢运行，因此不与计时混用）。
+结果以 JSON 报告的形式输出，并可与之前的报告（基线）比较，以在部署之前发现性能的退化：
+
+    python benchmarks/benchmark_pipeline.py --output report.json
+    python benchmarks/benchmark_pipeline.py --sizes 1000 100000 --baseline report.json
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import pandas as pd
+import numpy as np
+import contextlib
+import tracemalloc
+import argparse
+import platform
+import datetime
+import types
+import json
+import time
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest import mock
+
+import app.my_frontend_agent
+from app.my_backend_agent import DataAnalyserBackendAgent
+from app.my_frontend_agent import DataAnalyserFrontendAgent
+from utils import DataAnalyser
+from utils.chart_series import ChartSeries
+from utils.synthetic_logs import HEARTBEAT_SECONDS, DEFAULT_ROWS_PER_DEVICE, generate_device_log, generate_fleet_logs
+
+
+REPORT_VERSION = 1
+
+DEFAULT_SIZES = (1_000, 100_000, 10_000_000)
+DEFAULT_REPEATS = 3
+
+# Sizes from which each stage is timed only once
+# 记录数达到该值时，每个阶段只计时一次
+SINGLE_RUN_SIZE = 1_000_000
+
+# A stage is reported as a regression when it is slower than the baseline by this ratio (and by more than the noise floor)
+# 某阶段的耗时超出基线的比例达到该值（且超出噪声下限）时，视为性能退化
+DEFAULT_TOLERANCE = 0.25
+NOISE_FLOOR_SECONDS = 0.005
+
+# A single synthetic log spans at most this long; longer logs get a denser heartbeat (see generate_device_log)
+# 单个合成日志跨越的最长时间；更长的日志将相应地压缩心跳的间隔
+_MAX_LOG_SPAN_SECONDS = 3 * 365 * 86_400
+
+_UPLOADED_FILE = types.SimpleNamespace(name='synthetic_log.xlsx')
+
+
+class _StageRecorder():
+    """Records the elapsed time (or the peak of traced memory) of each stage, in the order the stages run."""
+
+    def __init__(self, trace_memory=False):
+
+        self.trace_memory = trace_memory
+        self.results = {}
+
+    @contextlib.contextmanager
+    def __call__(self, stage):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+
+        if self.trace_memory:
+            self.results[stage] = max(tracemalloc.get_traced_memory()[1] - memory_before, 0)
+        else:
+            self.results[stage] = elapsed
+
+
+def _single_device_stages(df_log, stage):
+    """The stages of the single-device page, on one log."""
+    A = DataAnalyserBackendAgent
+
+    with stage('index_a_dfda_log'):
+        dfda_log = A.index_a_dfda_log(df_log)
+
+    with stage('define_uptime_and_downtime'):
+        dfda_log_periods = A.define_uptime_and_downtime(dfda_log.copy(), df_log, pattern='single_file_multiple_periods')
+
+    # The DataAnalyser methods run over the whole log (a single usage period)
+    # DataAnalyser 的各个方法作用于整个日志（单个使用周期）
+    dfda_log_whole = A.define_uptime_and_downtime(dfda_log.copy(), df_log, pattern='multiple_files_single_period')
+    data_analyser = DataAnalyser(dfda_log_whole)
+
+    with stage('DataAnalyser.identify_id_info'):
+        data_analyser.identify_id_info(df_device_log=df_log, use_index=True, index=0, device_name=None, imei=None)
+    with stage('DataAnalyser.get_usage_period'):
+        data_analyser.get_usage_period()
+    with stage('DataAnalyser.get_sub_log_based_on_usage_period'):
+        data_analyser.get_sub_log_based_on_usage_period()
+    with stage('DataAnalyser.get_operation_status'):
+        data_analyser.get_operation_status()
+    with stage('DataAnalyser.get_signal_strength_frequency'):
+        data_analyser.get_signal_strength_frequency()
+    with stage('DataAnalyser.get_signal_switch_frequency'):
+        data_analyser.get_signal_switch_frequency()
+
+    with stage('conduct_the_multi_period_pipeline'):
+        dfda_log_updated = A.conduct_the_multi_period_pipeline(dfda_log_periods, df_log)
+
+    with stage('translate_and_mildly_modify_your_df'):
+        dfda_log_translated = A.translate_and_mildly_modify_your_df(dfda_log_updated)
+
+    with stage('ChartSeries.from_log'):
+        chart_series = ChartSeries.from_log(df_log)
+
+    charts = DataAnalyserFrontendAgent.SingleDeviceProcessing
+
+    with stage('chart.usage_track'):
+        charts.visualize_usage_track(dfda_log_translated, chart_series)
+    with stage('chart.operation_real_time'):
+        charts.visualize_operation_real_time(chart_series, _UPLOADED_FILE)
+    with stage('chart.operation_daily_average'):
+        charts.visualize_operation_daily_average(chart_series, _UPLOADED_FILE)
+    with stage('chart.signal_real_time'):
+        charts.visualize_signal_real_time(chart_series, _UPLOADED_FILE)
+    with stage('chart.signal_daily_average'):
+        charts.visualize_signal_daily_average(chart_series, _UPLOADED_FILE)
+
+
+def _fleet_stages(df_logs, stage):
+    """The stages of the multi-device page, on the logs of a fleet."""
+    A = DataAnalyserBackendAgent
+
+    with stage('index_a_dfda_log'):
+        dfda_log = pd.concat([A.index_a_dfda_log(df_log) for df_log in df_logs], ignore_index=True)
+
+    with stage('define_uptime_and_downtime_for_fleet'):
+        dfda_log, _ = A.define_uptime_and_downtime_for_fleet(dfda_log, df_logs, pattern='multiple_files_single_period')
+
+    with stage('conduct_the_batch_pipeline'):
+        dfda_log_updated = A.conduct_the_batch_pipeline(dfda_log, df_logs)
+
+    with stage('translate_and_mildly_modify_your_df'):
+        dfda_log_translated = A.translate_and_mildly_modify_your_df(dfda_log_updated)
+
+    charts = DataAnalyserFrontendAgent.MultipleDevicesProcessing
+
+    with stage('chart.usage_lifecycle'):
+        charts.visualize_usage_lifecycle(dfda_log_translated)
+    with stage('chart.operation_freq_by_device_id'):
+        charts.visualize_operation_freq_by_device_id(dfda_log_translated)
+    with stage('chart.operation_freq_by_device_amount'):
+        charts.visualize_operation_freq_by_device_amount(dfda_log_translated)
+    with stage('chart.signal_freq_by_device_id'):
+        charts.visualize_signal_freq_by_device_id(dfda_log_translated)
+    with stage('chart.signal_freq_by_device_amount'):
+        charts.visualize_signal_freq_by_device_amount(dfda_log_translated)
+
+
+def generate_inputs(n_rows, seed=0):
+    """
+    Returns:
+        tuple: (单设备的日志, 多设备的日志列表)，两者的总记录数均约为 n_rows
+    """
+    heartbeat_seconds = min(HEARTBEAT_SECONDS, _MAX_LOG_SPAN_SECONDS / n_rows)
+    df_log = generate_device_log(n_rows, seed=seed, heartbeat_seconds=heartbeat_seconds)
+
+    n_devices = max(n_rows // DEFAULT_ROWS_PER_DEVICE, 1)
+    df_logs = generate_fleet_logs(n_devices, n_rows_per_device=n_rows // n_devices, seed=seed)
+
+    return df_log, df_logs
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeats=DEFAULT_REPEATS, seed=0, trace_memory=True, log=None):
+    """
+    在每个规模上运行所有阶段，返回基准测试报告。
+
+    Args:
+        sizes: 日志的总记录数
+        repeats: 每个阶段计时的重复次数（取最小值）；达到 SINGLE_RUN_SIZE 的规模只计时一次
+        seed: 合成日志的随机数种子
+        trace_memory: 是否（在单独的一次运行中）测量各阶段的峰值内存
+        log: (可选) 接收进度信息的函数，例如 print
+
+    Returns:
+        dict: 'meta' 为运行环境的信息，'results' 为每个 (场景, 阶段, 规模) 的一条记录
+    """
+    results = []
+
+    # The charts are only built, not sent to a browser
+    # 图表只构建其配置项，而不发送给浏览器
+    with mock.patch.object(app.my_frontend_agent, 'st_echarts', lambda **kwargs: None):
+
+        for n_rows in sizes:
+            df_log, df_logs = generate_inputs(n_rows, seed=seed)
+
+            for scenario, run_stages, inputs in (
+                ('single_device', _single_device_stages, df_log),
+                ('fleet', _fleet_stages, df_logs),
+            ):
+                if log is not None:
+                    log(f"{scenario}: {n_rows} rows")
+
+                timings = []
+                for _ in range(1 if n_rows >= SINGLE_RUN_SIZE else repeats):
+                    recorder = _StageRecorder()
+                    run_stages(inputs, recorder)
+                    timings.append(recorder.results)
+
+                peak_memory = {}
+                if trace_memory:
+                    recorder = _StageRecorder(trace_memory=True)
+                    tracemalloc.start()
+                    try:
+                        run_stages(inputs, recorder)
+                    finally:
+                        tracemalloc.stop()
+                    peak_memory = recorder.results
+
+                for stage in timings[0]:
+                    seconds = min(timing[stage] for timing in timings)
+                    results.append({
+                        'scenario': scenario,
+                        'stage': stage,
+                        'n_rows': n_rows,
+                        'n_devices': 1 if scenario == 'single_device' else len(df_logs),
+                        'seconds': seconds,
+                        'rows_per_second': n_rows / seconds if seconds > 0 else None,
+                        'peak_memory_bytes': peak_memory.get(stage),
+                    })
+
+    return {
+        'meta': {
+            'report_version': REPORT_VERSION,
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeats': repeats,
+        },
+        'results': results,
+    }
+
+
+def compare_reports(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    将报告与基线比较，返回所有退化的阶段（两份报告中都存在的 (场景, 阶段, 规模) 才会被比较）。
+
+    Returns:
+        list[dict]: 每个退化的阶段一条记录：'scenario', 'stage', 'n_rows', 'seconds', 'baseline_seconds', 'ratio'
+    """
+    baseline_seconds = {
+        (result['scenario'], result['stage'], result['n_rows']): result['seconds'] for result in baseline['results']
+    }
+
+    regressions = []
+    for result in report['results']:
+        key = (result['scenario'], result['stage'], result['n_rows'])
+        if key not in baseline_seconds:
+            continue
+
+        seconds, previous = result['seconds'], baseline_seconds[key]
+        if seconds > previous * (1 + tolerance) and seconds - previous > NOISE_FLOOR_SECONDS:
+            regressions.append({
+                'scenario': key[0],
+                'stage': key[1],
+                'n_rows': key[2],
+                'seconds': seconds,
+                'baseline_seconds': previous,
+                'ratio': seconds / previous if previous > 0 else float('inf'),
+            })
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="数据分析管道的基准测试")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="日志的总记录数")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help="每个阶段计时的重复次数")
+    parser.add_argument('--seed', type=int, default=0, help="合成日志的随机数种子")
+    parser.add_argument('--no-memory', action='store_true', help="不测量峰值内存")
+    parser.add_argument('--output', help="JSON 报告的输出路径；默认输出到标准输出")
+    parser.add_argument('--baseline', help="用于比较的基线报告；存在性能退化时以非零状态码退出")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="视为退化的耗时增长比例")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        sizes=args.sizes,
+        repeats=args.repeats,
+        seed=args.seed,
+        trace_memory=not args.no_memory,
+        log=lambda message: print(message, file=sys.stderr)
+    )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare_reports(report, json.load(f), tolerance=args.tolerance)
+
+        for regression in regressions:
+            print(
+                f"退化：{regression['scenario']} / {regression['stage']} @ {regression['n_rows']} 条记录："
+                f"{regression['baseline_seconds']:.4f} 秒 -> {regression['seconds']:.4f} 秒 (x{regression['ratio']:.2f})",
+                file=sys.stderr
+            )
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+# Latest update: 2026-10-18
+#
+# Shared by the tests that check an optimized pipeline (batch, multi-period, streaming, log store)
+# against the reference one: DataAnalyser run period by period, as the pages used to
+
+import pandas as pd
+import numpy as np
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import DataAnalyser
+from utils.build_your_df_features import index_a_dfda_log
+
+
+STATISTICS_COLUMNS = [
+    'days_len', 'months_len',
+    'times_of_standby', 'times_of_irrigation_start', 'times_of_irrigation_close',
+    'times_of_uptime', 'times_of_downtime',
+    'times_of_strong_signal', 'times_of_mid_signal', 'times_of_weak_signal', 'times_of_null_signal',
+    'average_signal', 'min_signal', 'max_signal',
+    'times_signal_switch_strong_mid', 'times_signal_switch_strong_weak', 'times_signal_switch_strong_null',
+    'times_signal_switch_mid_weak', 'times_signal_switch_mid_null', 'times_signal_switch_weak_null',
+]
+
+
+# Helper function to build the index table of a log with the given (uptime, downtime) periods, one row per period
+def make_dfda_log(df_log, periods):
+    dfda_log = pd.concat([index_a_dfda_log(df_log)] * len(periods), ignore_index=True)
+    dfda_log['uptime'] = [pd.Timestamp(uptime).date() for uptime, _ in periods]
+    dfda_log['downtime'] = [pd.Timestamp(downtime).date() for _, downtime in periods]
+
+    return dfda_log
+
+
+# Helper function to run the reference pipeline over every row (usage period) of the index table of a log
+def run_the_per_period_pipeline(dfda_log, df_log, window_len=2):
+    data_analyser = DataAnalyser(dfda_log.copy())
+
+    for index in range(len(dfda_log)):
+        data_analyser.identify_id_info(
+            df_device_log=df_log, use_index=True, index=index, device_name=None, imei=None
+        )
+        data_analyser.get_usage_period()
+        data_analyser.get_sub_log_based_on_usage_period()
+        data_analyser.get_operation_status()
+        data_analyser.get_signal_strength_frequency()
+        data_analyser.get_signal_switch_frequency(window_len=window_len)
+
+    return data_analyser._df_data_analysis
+
+
+# Helper function to compare the statistics columns of two tables
+def assert_statistics_equal(df_actual, df_expected, err_msg=''):
+    for column in STATISTICS_COLUMNS:
+        np.testing.assert_allclose(
+            df_actual[column].to_numpy(dtype=float),
+            df_expected[column].to_numpy(dtype=float),
+            err_msg=f'{column} {err_msg}'.strip()
+        )
+
+
+# Helper function to compare two whole tables: the same columns, periods and statistics
+def assert_same_table(df_actual, df_expected):
+    assert list(df_actual.columns) == list(df_expected.columns)
+
+    for column in df_expected.columns:
+        if column in ('uptime', 'downtime', 'device_name'):
+            assert list(df_actual[column]) == list(df_expected[column]), column
+        else:
+            np.testing.assert_allclose(
+                df_actual[column].to_numpy(dtype=float), df_expected[column].to_numpy(dtype=float), err_msg=column
+            )
@@ -0,0 +1,100 @@
+# Latest update: 2026-10-18
+#
+# The expected statistics (baseline_statistics.csv) were computed once, with the original DataAnalyser
+# run period by period as the pages used to, on the bundled sample logs; they do not depend on any of the optimized pipelines
+
+import pandas as pd
+import zipfile
+import pytest
+import io
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.my_backend_agent import DataAnalyserBackendAgent
+from utils.log_store import LogStore
+from utils.zip_ingestion import list_log_members
+from reference_pipeline import run_the_per_period_pipeline, assert_statistics_equal
+
+# Setup global variables
+current_file_path = os.path.abspath(__file__)
+PROJECT_ROOT_PATH = os.path.dirname(os.path.dirname(current_file_path))
+PATH_SAMPLE_ZIP = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.zip'
+)
+PATH_SAMPLE_XLSX = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.xlsx'
+)
+PATH_BASELINE_STATISTICS = os.path.join(os.path.dirname(current_file_path), 'baseline_statistics.csv')
+
+SINGLE_FILE_CASES = ['single_file_multiple_periods', 'single_file_multiple_periods_with_breaks']
+ZIP_PATTERNS = ['multiple_files_single_period', 'multiple_files_latest_period', 'multiple_files_max_period']
+
+
+# Helper function to read the sample log of a single device case
+def read_the_sample_log(case):
+    df_log = pd.read_excel(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_XLSX))
+
+    # Drop a few days in the middle, so that the log has more continuous periods
+    if case == 'single_file_multiple_periods_with_breaks':
+        days = pd.to_datetime(df_log['创建时间']).dt.strftime('%Y-%m-%d')
+        df_log = df_log[~days.isin(['2025-05-10', '2025-05-11', '2025-05-20'])].reset_index(drop=True)
+
+    return df_log
+
+
+# Helper function to compare a table with the baseline statistics of a case (rows ordered by device and period)
+def assert_matches_the_baseline(df_actual, case):
+    df_expected = pd.read_csv(PATH_BASELINE_STATISTICS)
+    df_expected = df_expected[df_expected['case'] == case].reset_index(drop=True)
+    df_actual = df_actual.sort_values(['imei', 'uptime'], kind='stable').reset_index(drop=True)
+
+    assert len(df_actual) == len(df_expected)
+    assert list(df_actual['imei'].astype('int64')) == list(df_expected['imei'])
+    for column in ['uptime', 'downtime']:
+        assert list(pd.to_datetime(df_actual[column])) == list(pd.to_datetime(df_expected[column])), column
+
+    assert_statistics_equal(df_actual, df_expected, err_msg=case)
+
+
+# Latest update: 2026-10-18
+@pytest.mark.parametrize('case', SINGLE_FILE_CASES)
+def test_the_single_device_pipelines_match_the_baseline(tmp_path, case):
+    df_log = read_the_sample_log(case)
+
+    dfda_log = DataAnalyserBackendAgent.index_a_dfda_log(df_log)
+    dfda_log = DataAnalyserBackendAgent.define_uptime_and_downtime(dfda_log, df_log, pattern='single_file_multiple_periods')
+
+    assert_matches_the_baseline(run_the_per_period_pipeline(dfda_log, df_log), case)
+    assert_matches_the_baseline(DataAnalyserBackendAgent.conduct_the_multi_period_pipeline(dfda_log, df_log), case)
+
+    path = str(tmp_path / 'log.csv')
+    df_log.to_csv(path, index=False)
+    assert_matches_the_baseline(DataAnalyserBackendAgent.conduct_the_streaming_pipeline(path, chunk_size=100), case)
+
+    with LogStore(':memory:') as log_store:
+        log_store.ingest(df_log)
+        df_actual = DataAnalyserBackendAgent.conduct_the_store_pipeline(log_store, pattern='single_file_multiple_periods')
+    assert_matches_the_baseline(df_actual, case)
+
+
+# Latest update: 2026-10-18
+@pytest.mark.parametrize('pattern', ZIP_PATTERNS)
+def test_the_zip_pipelines_match_the_baseline(pattern):
+    with open(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_ZIP), 'rb') as f:
+        zip_data = f.read()
+
+    with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_ref:
+        log_files = list_log_members(zip_ref)
+
+    assert_matches_the_baseline(DataAnalyserBackendAgent.analyse_logs_in_zip(zip_data, log_files, pattern), pattern)
+
+    with LogStore(':memory:') as log_store:
+        with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_ref:
+            for log_file in log_files:
+                uploaded_file = io.BytesIO(zip_ref.read(log_file))
+                uploaded_file.name = log_file
+                log_store.ingest_file(uploaded_file)
+
+        df_actual = DataAnalyserBackendAgent.conduct_the_store_pipeline(log_store, pattern=pattern)
+    assert_matches_the_baseline(df_actual, pattern)
@@ -0,0 +1,73 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import numpy as np
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import BatchDataAnalyser
+from utils.batch_analyser import combine_device_logs
+from reference_pipeline import make_dfda_log, run_the_per_period_pipeline, assert_statistics_equal
+
+# Setup global variables
+current_file_path = os.path.abspath(__file__)
+PROJECT_ROOT_PATH = os.path.dirname(os.path.dirname(current_file_path))
+PATH_SAMPLE_LOG = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.xlsx'
+)
+
+
+# Helper function to build a small log with two continuous periods
+def make_df_log():
+    create_time = pd.to_datetime([
+        '2025-03-05 10:00:00', '2025-03-05 09:00:00', '2025-03-05 08:00:00',
+        '2025-03-04 12:00:00', '2025-03-04 11:00:00',
+        '2025-03-01 09:00:00', '2025-03-01 08:00:00', '2025-03-01 07:00:00',
+    ])
+    return pd.DataFrame({
+        '创建时间': create_time.strftime('%Y-%m-%d %H:%M:%S'),
+        'imei': [865118070038652.0] * 8,
+        '设备ID': ['sample'] * 8,
+        '信号': [25.0, 12.0, np.nan, 3.0, 25.0, 0.5, 12.0, 25.0],
+        '操作类型': ['设备状态', '设备状态', '设备下线', '设备状态', '设备状态', '设备状态', '开启灌溉', '设备状态'],
+    })
+
+
+# Latest update: 2026-10-18
+def test_batch_analyser_matches_the_per_device_pipeline():
+    df_log = make_df_log()
+    dfda_log = make_dfda_log(df_log, [('2025-03-04', '2025-03-05'), ('2025-03-01', '2025-03-01')])
+
+    df_expected = run_the_per_period_pipeline(dfda_log, df_log)
+    df_actual = BatchDataAnalyser(dfda_log.copy()).analyse(
+        combine_device_logs([df_log]), device_keys=[0, 0]
+    )._df_data_analysis
+
+    assert_statistics_equal(df_actual, df_expected)
+
+
+# Latest update: 2026-10-18
+def test_batch_analyser_over_multiple_devices():
+    df_logs = [make_df_log(), make_df_log().iloc[3:]]
+    dfda_log = pd.concat([
+        make_dfda_log(df_logs[0], [('2025-03-01', '2025-03-05')]),
+        make_dfda_log(df_logs[1], [('2025-03-01', '2025-03-04')]),
+    ], ignore_index=True)
+
+    df_actual = BatchDataAnalyser(dfda_log.copy()).analyse(combine_device_logs(df_logs))._df_data_analysis
+
+    for i, df_log in enumerate(df_logs):
+        df_expected = run_the_per_period_pipeline(dfda_log.iloc[[i]].reset_index(drop=True), df_log)
+        assert_statistics_equal(df_actual.iloc[[i]], df_expected)
+
+
+# Latest update: 2026-10-18
+def test_batch_analyser_on_the_sample_log():
+    df_log = pd.read_excel(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_LOG))
+    dfda_log = make_dfda_log(df_log, [('2025-05-01', '2025-05-31')])
+
+    df_expected = run_the_per_period_pipeline(dfda_log, df_log)
+    df_actual = BatchDataAnalyser(dfda_log.copy()).analyse(combine_device_logs([df_log]))._df_data_analysis
+
+    assert_statistics_equal(df_actual, df_expected)
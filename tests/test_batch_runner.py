@@ -0,0 +1,98 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import zipfile
+import pytest
+import io
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.batch_runner import FILE_COLUMN, EXIT_FAILED_LOGS, EXIT_NO_LOGS, collect_log_files, resolve_pattern, main
+from app.my_backend_agent import DataAnalyserBackendAgent
+from utils.zip_ingestion import list_log_members
+
+# Setup global variables
+current_file_path = os.path.abspath(__file__)
+PROJECT_ROOT_PATH = os.path.dirname(os.path.dirname(current_file_path))
+PATH_SAMPLE_ZIP = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.zip'
+)
+
+
+# Helper function to extract the first logs of the sample zip package into a directory, next to files that are not logs
+def extract_the_sample_logs(directory, n_logs=3):
+    with zipfile.ZipFile(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_ZIP), 'r') as zip_ref:
+        names = list_log_members(zip_ref)[:n_logs]
+
+        for i, name in enumerate(names):
+            sub_directory = directory / ('nested' if i else '')
+            sub_directory.mkdir(exist_ok=True)
+            (sub_directory / os.path.basename(name)).write_bytes(zip_ref.read(name))
+
+
+    (directory / 'README.txt').write_text('nightly export')
+    (directory / ('~$' + os.path.basename(names[0]))).write_bytes(b'\0' * 16)
+
+    return names
+
+
+# Latest update: 2026-10-18
+def test_logs_are_collected_from_directories_and_globs(tmp_path):
+    extract_the_sample_logs(tmp_path)
+
+    log_files = collect_log_files([str(tmp_path)])
+    assert len(log_files) == 3
+    assert all(log_file.endswith('.xlsx') and '~$' not in log_file for log_file in log_files)
+
+    assert collect_log_files([str(tmp_path / 'nested' / '*.xlsx')]) == [f for f in log_files if 'nested' in f]
+    assert collect_log_files([str(tmp_path / '**' / '*.xlsx'), str(tmp_path)]) == log_files
+    assert collect_log_files([str(tmp_path / 'missing')]) == []
+
+
+# Latest update: 2026-10-18
+def test_patterns_are_resolved_from_options_or_names():
+    assert resolve_pattern('a') == 'multiple_files_single_period'
+    assert resolve_pattern('C') == 'multiple_files_max_period'
+    assert resolve_pattern('single_file_multiple_periods') == 'single_file_multiple_periods'
+
+    with pytest.raises(ValueError):
+        resolve_pattern('D')
+
+
+# Latest update: 2026-10-18
+def test_the_runner_matches_the_zip_analysis_and_reports_bad_logs(tmp_path):
+    input_dir = tmp_path / 'logs'
+    input_dir.mkdir()
+    extract_the_sample_logs(input_dir)
+    (input_dir / 'broken.csv').write_text('创建时间,操作类型\n2025-05-01 00:00:00,设备状态\n')
+
+    output_path = tmp_path / 'fleet.csv'
+    exit_code = main([str(input_dir), '--pattern', 'A', '--workers', '1', '--output', str(output_path), '--no-cache'])
+    assert exit_code == EXIT_FAILED_LOGS
+
+    df_output = pd.read_csv(output_path, encoding='utf-8-sig')
+    df_errors = pd.read_csv(tmp_path / 'fleet_errors.csv', encoding='utf-8-sig')
+
+    assert list(df_errors['file']) == [str(input_dir / 'broken.csv')]
+    assert df_errors['error_type'].iloc[0] == 'ValueError'
+
+    # Same statistics as the “多设备处理” page, one row per log
+    with open(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_ZIP), 'rb') as f:
+        zip_data = f.read()
+    with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_ref:
+        names = list_log_members(zip_ref)[:3]
+
+    df_expected = DataAnalyserBackendAgent.translate_and_mildly_modify_your_df(
+        DataAnalyserBackendAgent.analyse_logs_in_zip(zip_data, names, 'multiple_files_single_period')
+    )
+
+    assert [os.path.basename(log_file) for log_file in df_output[FILE_COLUMN]] == [os.path.basename(name) for name in names]
+    for column in ['imei', '使用天数', '待机次数', '强信号次数', '强/中信号切换次数']:
+        assert list(df_output[column]) == list(df_expected[column]), column
+
+
+# Latest update: 2026-10-18
+def test_the_runner_exits_when_there_is_no_log(tmp_path):
+    assert main([str(tmp_path), '--output', str(tmp_path / 'fleet.parquet')]) == EXIT_NO_LOGS
+    assert not (tmp_path / 'fleet.parquet').exists()
@@ -0,0 +1,111 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import pytest
+import numpy as np
+import datetime
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.chart_series import ChartSeries, build_usage_track, build_daily_operation_modes, build_daily_signal_means
+
+
+# Latest update: 2026-10-18
+def test_build_usage_track_from_period_intervals():
+    timestamps = pd.to_datetime(['2025-05-10 08:00:00', '2025-05-06 12:00:00', '2025-05-01 09:00:00'])
+
+    # Overlapping periods, a period outside the log range, and an unparsable one
+    uptimes = [datetime.date(2025, 5, 8), '2025-05-07', datetime.date(2025, 4, 28), None, '2025-06-01']
+    downtimes = ['2025-05-10', '2025-05-09', datetime.date(2025, 5, 2), '2025-05-05', '2025-06-03']
+
+    dates, status = build_usage_track(timestamps, uptimes, downtimes)
+
+    assert dates[0] == pd.Timestamp('2025-05-01') and dates[-1] == pd.Timestamp('2025-05-10')
+    assert status.tolist() == [1, 1, 0, 0, 0, 0, 1, 1, 1, 1]
+
+
+# Latest update: 2026-10-18
+def test_build_usage_track_on_an_empty_log():
+    dates, status = build_usage_track(pd.Series([], dtype='datetime64[ns]'), [], [])
+
+    assert len(dates) == 0 and len(status) == 0
+
+
+# Latest update: 2026-10-18
+def test_build_daily_operation_modes_matches_the_groupby_mode():
+    timestamps = pd.to_datetime([
+        '2025-05-03 10:00:00', '2025-05-03 09:00:00',
+        '2025-05-02 12:00:00', '2025-05-02 11:00:00', '2025-05-02 10:00:00',
+        '2025-05-01 09:00:00', 'not a time',
+    ], errors='coerce')
+    operations = ['设备状态', np.nan, '开启灌溉', '设备上线', '设备上线', np.nan, '设备状态']
+    df_log = pd.DataFrame({'创建时间': timestamps, '操作类型': operations})
+
+    daily_operation_modes = build_daily_operation_modes(df_log['创建时间'], df_log['操作类型'])
+
+    df_log_valid = df_log.dropna(subset=['创建时间'])
+    df_expected = df_log_valid.groupby(df_log_valid['创建时间'].dt.date)['操作类型'].agg(
+        lambda x: x.mode().iloc[0] if not x.mode().empty else None
+    )
+
+    assert list(pd.to_datetime(daily_operation_modes['date']).date) == list(df_expected.index)
+    assert list(daily_operation_modes['operation']) == [None, '设备上线', '设备状态']
+    assert list(daily_operation_modes['operation']) == list(df_expected)
+
+
+# Latest update: 2026-10-18
+def test_build_daily_operation_modes_over_a_fleet():
+    timestamps = pd.to_datetime(['2025-05-02 10:00:00', '2025-05-02 09:00:00', '2025-05-02 08:00:00', '2025-05-01 09:00:00'])
+
+    # A tie on device 1 is broken towards the lexicographically smallest operation type
+    operations = ['设备状态', '开启灌溉', '关闭灌溉', '设备状态']
+    device_keys = [1, 1, 0, 1]
+
+    daily_operation_modes = build_daily_operation_modes(timestamps, operations, device_keys)
+
+    assert daily_operation_modes['device_key'].tolist() == [0, 1, 1]
+    assert daily_operation_modes['date'].astype(str).tolist() == ['2025-05-02', '2025-05-01', '2025-05-02']
+    assert list(daily_operation_modes['operation']) == ['关闭灌溉', '设备状态', min('设备状态', '开启灌溉')]
+
+
+# Latest update: 2026-10-18
+def test_chart_series_is_sorted_once_and_leaves_the_log_untouched():
+    df_log = pd.DataFrame({
+        '创建时间': ['2025-05-02 09:00:00', '2025-05-01 10:00:00', '2025-05-01 10:00:00', None],
+        '操作类型': ['设备状态', '开启灌溉', '设备上线', '设备状态'],
+        '信号': [25.0, np.nan, 12.0, 3.0],
+    })
+    df_log_copy = df_log.copy()
+
+    chart_series = ChartSeries.from_log(df_log)
+
+    pd.testing.assert_frame_equal(df_log, df_log_copy)
+
+    # Records without a valid time are left out; records of the same time are put in reversed file order
+    assert chart_series.n_rows == 3
+    assert chart_series.labels.tolist() == ['25-05-01', '25-05-01', '25-05-02']
+    assert chart_series.status_codes.tolist() == [1, 2, 3]
+    assert chart_series.signals_filled.tolist() == [12.0, 0.0, 25.0]
+    assert np.isnan(chart_series.signals[1])
+
+
+# Latest update: 2026-10-18
+def test_chart_series_is_immutable():
+    df_log = pd.DataFrame({'创建时间': pd.to_datetime(['2025-05-01']), '操作类型': ['设备状态'], '信号': [25.0]})
+    chart_series = ChartSeries.from_log(df_log)
+
+    with pytest.raises(AttributeError):
+        chart_series.signals = np.zeros(1)
+
+    with pytest.raises(ValueError):
+        chart_series.signals[0] = 0.0
+
+
+# Latest update: 2026-10-18
+def test_build_daily_signal_means_skips_missing_values():
+    timestamps = pd.to_datetime(['2025-05-01 08:00:00', '2025-05-01 09:00:00', '2025-05-03 08:00:00'])
+    dates, means = build_daily_signal_means(timestamps, [20.0, 25.0, np.nan])
+
+    assert dates.astype(str).tolist() == ['2025-05-01', '2025-05-03']
+    assert means[0] == 22.5 and np.isnan(means[1])
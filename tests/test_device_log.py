@@ -0,0 +1,73 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import numpy as np
+import zipfile
+import pickle
+import io
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.my_backend_agent import DataAnalyserBackendAgent
+from utils.device_log import DeviceLog
+from utils.log_reader import read_device_log
+from utils.statistics_accumulator import STATISTICS_DTYPES
+
+# Setup global variables
+current_file_path = os.path.abspath(__file__)
+PROJECT_ROOT_PATH = os.path.dirname(os.path.dirname(current_file_path))
+PATH_SAMPLE_XLSX = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.xlsx'
+)
+PATH_SAMPLE_ZIP = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.zip'
+)
+
+
+# Helper function to read the first few logs of the sample zip package
+def read_the_sample_logs(n_logs=3):
+    df_logs = []
+
+    with zipfile.ZipFile(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_ZIP), 'r') as zip_ref:
+        for info in [info for info in zip_ref.infolist() if not info.is_dir()][:n_logs]:
+            df_logs.append(read_device_log(io.BytesIO(zip_ref.read(info))))
+
+    return df_logs
+
+
+# Latest update: 2026-10-18
+def test_a_compact_log_restores_the_frame_it_comes_from():
+    for df_log in read_the_sample_logs():
+        device_log = DeviceLog.from_frame(df_log)
+
+        assert len(device_log) == len(df_log)
+        pd.testing.assert_frame_equal(device_log.to_frame(), df_log)
+
+        # Spilled to disk (pickled) by the parsed log store
+        pd.testing.assert_frame_equal(pickle.loads(pickle.dumps(device_log)).to_frame(), df_log)
+
+
+# Latest update: 2026-10-18
+def test_a_compact_log_is_several_times_smaller():
+    df_raw = pd.read_excel(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_XLSX))
+    device_log = DeviceLog.from_frame(read_device_log(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_XLSX)))
+
+    # Unused columns are dropped, and each record takes 8 (time) + 1 (operation) + 4 (signal) bytes, plus its identifiers
+    assert device_log.columns == ['创建时间', 'imei', '设备ID', '信号', '操作类型']
+    assert device_log.nbytes <= 16 * len(device_log) + 1024
+    assert df_raw.memory_usage(deep=True).sum() > 10 * device_log.nbytes
+
+
+# Latest update: 2026-10-18
+def test_the_counters_of_the_index_table_are_int32():
+    df_log = read_the_sample_logs()[0]
+
+    dfda_log = DataAnalyserBackendAgent.index_a_dfda_log(df_log)
+    dfda_log = DataAnalyserBackendAgent.define_uptime_and_downtime(dfda_log, df_log, pattern='multiple_files_single_period')
+    dfda_log_updated = DataAnalyserBackendAgent.conduct_the_batch_pipeline(dfda_log, [df_log])
+
+    for column, dtype in STATISTICS_DTYPES.items():
+        assert dfda_log_updated[column].dtype == dtype, column
+
+    assert dfda_log_updated['times_of_standby'].dtype == np.int32
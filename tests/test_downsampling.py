@@ -0,0 +1,40 @@
+# Latest update: 2026-10-18
+
+import numpy as np
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.downsampling import lttb_indices, category_preserving_indices
+
+
+# Latest update: 2026-10-18
+def test_lttb_keeps_the_end_points_and_the_spikes():
+    rng = np.random.default_rng(0)
+    y = 20 + rng.normal(0, 0.5, size=10_000)
+    y[[1234, 5678]] = [31.0, 0.0]
+
+    kept = lttb_indices(y, max_points=200)
+
+    assert len(kept) == 200
+    assert kept[0] == 0 and kept[-1] == len(y) - 1
+    assert np.all(np.diff(kept) > 0)
+    assert 1234 in kept and 5678 in kept
+
+
+# Latest update: 2026-10-18
+def test_lttb_leaves_short_series_untouched():
+    assert lttb_indices([1.0, 2.0, 3.0], max_points=10).tolist() == [0, 1, 2]
+
+
+# Latest update: 2026-10-18
+def test_category_preserving_indices_keep_every_rare_code():
+    codes = np.full(10_000, 3)
+    codes[[10, 4321, 9999]] = [1, 2, 0]
+
+    kept = category_preserving_indices(codes, max_points=100)
+
+    assert len(kept) <= 100
+    assert np.all(np.diff(kept) > 0)
+    assert {10, 4321, 9999} <= set(kept.tolist())
+    assert set(codes[kept].tolist()) == {0, 1, 2, 3}
@@ -0,0 +1,88 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import pytest
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.build_your_df_features import index_a_dfda_log
+from utils.log_reader import read_device_log
+from utils.streaming_analyser import StreamingDataAnalyser, aggregate_log_chunks
+from utils.incremental_state import DeviceStateStore, get_device_id, update_device_state
+
+# Setup global variables
+current_file_path = os.path.abspath(__file__)
+PROJECT_ROOT_PATH = os.path.dirname(os.path.dirname(current_file_path))
+PATH_SAMPLE_LOG = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.xlsx'
+)
+
+
+# Helper function to split a log into chunks of a given size (in file order)
+def split_into_chunks(df_log, chunk_size):
+    return [df_log.iloc[i:i + chunk_size].reset_index(drop=True) for i in range(0, len(df_log), chunk_size)]
+
+
+def analyse(aggregate, periods):
+    dfda_log = pd.concat([index_a_dfda_log(aggregate.digest_log())] * len(periods), ignore_index=True)
+    dfda_log['uptime'] = [pd.Timestamp(uptime).date() for uptime, _ in periods]
+    dfda_log['downtime'] = [pd.Timestamp(downtime).date() for _, downtime in periods]
+
+    return StreamingDataAnalyser(dfda_log).analyse(aggregate)._df_data_analysis
+
+
+# Latest update: 2026-10-18
+def test_incremental_update_matches_a_full_reanalysis(tmp_path):
+    df_log = read_device_log(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_LOG))
+    state_store = DeviceStateStore(state_dir=str(tmp_path))
+
+    # The previous export ends a few days before the current one (the log is in descending order)
+    df_log_previous = df_log[df_log['创建时间'] < pd.Timestamp('2025-05-25')].reset_index(drop=True)
+
+    _, _, n_new_rows = update_device_state(split_into_chunks(df_log_previous, 30), state_store)
+    assert n_new_rows == len(df_log_previous)
+
+    # Only the rows newer than the previous export are aggregated this time
+    _, state, n_new_rows = update_device_state(split_into_chunks(df_log, 30), state_store)
+    assert n_new_rows == len(df_log) - len(df_log_previous)
+
+    # The state persisted (as JSON) gives the same statistics as analysing the whole log from scratch
+    device_id, state_reloaded, _ = update_device_state(split_into_chunks(df_log, 30), state_store)
+    aggregate = aggregate_log_chunks(split_into_chunks(df_log, 30))
+
+    periods = [('2025-05-19', '2025-05-31'), ('2025-05-24', '2025-05-26')]
+    df_expected = analyse(aggregate, periods)
+
+    for state_updated in [state, state_reloaded, state_store.load(device_id)]:
+        pd.testing.assert_frame_equal(analyse(state_updated, periods), df_expected)
+
+
+# Latest update: 2026-10-18
+def test_records_appended_in_the_latest_second_are_not_dropped(tmp_path):
+    df_log = read_device_log(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_LOG))
+    state_store = DeviceStateStore(state_dir=str(tmp_path))
+
+    # The latest four records share a second, and the previous export has only the last two of them
+    df_log.loc[:3, '创建时间'] = df_log.loc[3, '创建时间']
+    df_log_previous = df_log.iloc[2:].reset_index(drop=True)
+
+    update_device_state(split_into_chunks(df_log_previous, 30), state_store)
+    _, state, n_new_rows = update_device_state(split_into_chunks(df_log, 30), state_store)
+    assert n_new_rows == len(df_log) - len(df_log_previous)
+    assert state.n_rows == len(df_log)
+
+    aggregate = aggregate_log_chunks(split_into_chunks(df_log, 30))
+    periods = [('2025-05-19', '2025-05-31')]
+    pd.testing.assert_frame_equal(analyse(state, periods), analyse(aggregate, periods))
+
+
+# Latest update: 2026-10-18
+def test_a_log_not_in_descending_order_is_rejected(tmp_path):
+    df_log = read_device_log(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_LOG))
+    state_store = DeviceStateStore(state_dir=str(tmp_path))
+
+    with pytest.raises(ValueError):
+        update_device_state(split_into_chunks(df_log.iloc[::-1].reset_index(drop=True), 30), state_store)
+
+    assert state_store.load(get_device_id(df_log)) is None
@@ -0,0 +1,128 @@
+# Latest update: 2026-10-18
+
+import threading
+import time
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.job_runner import JobRunner, DONE, FAILED
+
+
+# Helper function to wait until a job has finished
+def wait_for(job, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not job.is_finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert job.is_finished
+
+
+# Latest update: 2026-10-18
+def test_a_job_reports_its_progress_and_keeps_its_result():
+    job_runner = JobRunner()
+    release = threading.Event()
+
+    def task(report_progress):
+        report_progress(1, 4, 1000)
+        release.wait(5.0)
+        report_progress(4, 4, 4000)
+        return 'result'
+
+    job = job_runner.submit(task)
+    assert job_runner.get(job.job_id) is job
+
+    deadline = time.monotonic() + 5.0
+    while job.progress()['files_done'] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    progress = job.progress()
+    assert not job.is_finished
+    assert (progress['files_done'], progress['files_total'], progress['rows_processed']) == (1, 4, 1000)
+
+    release.set()
+    wait_for(job)
+
+    progress = job.progress()
+    assert job.status == DONE and job.result == 'result'
+    assert progress['rows_processed'] == 4000
+    assert progress['throughput'] == progress['rows_processed'] / progress['elapsed']
+
+
+# Latest update: 2026-10-18
+def test_unfinished_jobs_with_the_same_key_are_not_submitted_twice():
+    job_runner = JobRunner()
+    release = threading.Event()
+    n_calls = []
+
+    def task(report_progress):
+        n_calls.append(1)
+        release.wait(5.0)
+        return len(n_calls)
+
+    job = job_runner.submit(task, key='zip')
+    assert job_runner.submit(task, key='zip') is job
+    assert job_runner.submit(task, key='other zip') is not job
+
+    release.set()
+    wait_for(job)
+
+    # Once finished, the same key starts a new job
+    assert job_runner.submit(task, key='zip') is not job
+
+
+# Latest update: 2026-10-18
+def test_a_failed_job_keeps_its_error():
+    job_runner = JobRunner()
+
+    def task(report_progress):
+        raise ValueError("broken zip")
+
+    job = job_runner.submit(task)
+    wait_for(job)
+
+    assert job.status == FAILED
+    assert isinstance(job.error, ValueError)
+    assert job.result is None
+
+
+# Latest update: 2026-10-18
+def test_the_oldest_finished_jobs_are_forgotten():
+    job_runner = JobRunner(max_finished_jobs=2)
+
+    jobs = []
+    for _ in range(4):
+        jobs.append(job_runner.submit(lambda report_progress: None))
+        wait_for(jobs[-1])
+
+    # The oldest ones are forgotten when a new job is submitted
+    job_runner.submit(lambda report_progress: None)
+
+    assert job_runner.get(jobs[0].job_id) is None
+    assert job_runner.get(jobs[-1].job_id) is jobs[-1]
+
+
+# Latest update: 2026-10-18
+def test_a_snapshot_never_sees_a_finished_job_without_its_outcome():
+    job_runner = JobRunner()
+
+    for outcome in ['result', 'error']:
+        def task(report_progress):
+            time.sleep(0.05)
+            if outcome == 'error':
+                raise ValueError("broken zip")
+            return {'dfda_log_translated': 'table'}
+
+        job = job_runner.submit(task)
+
+        while True:
+            status, result, error = job.snapshot()
+            if status == DONE:
+                assert result == {'dfda_log_translated': 'table'} and error is None
+                break
+            if status == FAILED:
+                assert isinstance(error, ValueError) and result is None
+                break
+            assert result is None and error is None
+
+        assert status == (DONE if outcome == 'result' else FAILED)
@@ -0,0 +1,55 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils.log_cache
+from utils.log_cache import LogCache
+from utils.log_reader import read_device_log
+
+# Setup global variables
+current_file_path = os.path.abspath(__file__)
+PROJECT_ROOT_PATH = os.path.dirname(os.path.dirname(current_file_path))
+PATH_SAMPLE_LOG = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.xlsx'
+)
+
+
+# Latest update: 2026-10-18
+def test_cache_skips_parsing_of_an_unchanged_log(tmp_path, monkeypatch):
+    path = os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_LOG)
+    cache = LogCache(cache_dir=str(tmp_path))
+
+    calls = []
+    def counting_reader(uploaded_file):
+        calls.append(1)
+        return read_device_log(uploaded_file)
+    monkeypatch.setattr(utils.log_cache, 'read_device_log', counting_reader)
+
+    df_parsed = cache.read_device_log(path)
+    with open(path, 'rb') as f:
+        df_cached = cache.read_device_log(f)
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(df_cached, df_parsed)
+    assert df_cached['设备ID'].isna().all()
+
+
+# Latest update: 2026-10-18
+def test_cache_evicts_the_least_recently_used_entries(tmp_path):
+    df_log = pd.DataFrame({'信号': [float(i) for i in range(1000)]})
+
+    cache = LogCache(cache_dir=str(tmp_path))
+    cache.put('a', df_log)
+    entry_bytes = cache.size()
+
+    cache.max_bytes = int(entry_bytes * 2.5)
+    cache.put('b', df_log)
+    os.utime(cache._path_of('a'), (0, 0))  # 'a' is the least recently used one
+    cache.put('c', df_log)
+
+    assert cache.get('a') is None
+    pd.testing.assert_frame_equal(cache.get('b'), df_log)
+    pd.testing.assert_frame_equal(cache.get('c'), df_log)
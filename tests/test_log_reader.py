@@ -0,0 +1,107 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import pytest
+import io
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.my_backend_agent import DataAnalyserBackendAgent
+from utils.log_reader import read_device_log, iter_device_log_chunks, sniff_log_format, EXCEL, CSV, PARQUET, JSONL
+
+# Setup global variables
+current_file_path = os.path.abspath(__file__)
+PROJECT_ROOT_PATH = os.path.dirname(os.path.dirname(current_file_path))
+PATH_SAMPLE_LOG = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.xlsx'
+)
+
+
+# Latest update: 2026-10-18
+def test_read_device_log_projects_and_types_the_columns():
+    path = os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_LOG)
+
+    df_log = read_device_log(path)
+    df_log_raw = pd.read_excel(path)
+
+    # Only the identification columns and the columns needed by the pipeline are read
+    assert set(df_log.columns) == {'创建时间', 'imei', '设备ID', '信号', '操作类型'}
+    assert df_log['创建时间'].dtype == 'datetime64[ns]'
+    assert df_log['信号'].dtype == 'float32'
+    assert df_log['操作类型'].dtype == 'category'
+
+    pd.testing.assert_series_equal(df_log['创建时间'], pd.to_datetime(df_log_raw['创建时间']))
+    pd.testing.assert_series_equal(df_log['信号'].astype('float64'), df_log_raw['信号'])
+    pd.testing.assert_series_equal(df_log['操作类型'].astype(object), df_log_raw['操作类型'])
+
+    # All columns are kept when previewing the log
+    assert list(read_device_log(path, columns=None).columns) == list(df_log_raw.columns)
+
+
+# Helper function to export the sample log in another format, as the IoT backend does
+def export_the_sample_log(log_format):
+    df_log_raw = pd.read_excel(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_LOG))
+    buffer = io.BytesIO()
+
+    if log_format == CSV:
+        df_log_raw.to_csv(buffer, index=False, encoding='utf-8-sig')
+    elif log_format == PARQUET:
+        df_log_raw.to_parquet(buffer, index=False)
+    else:
+        df_log_raw.to_json(buffer, orient='records', lines=True, force_ascii=False)
+
+    buffer.seek(0)
+
+    return buffer
+
+
+# Latest update: 2026-10-18
+@pytest.mark.parametrize('log_format', [CSV, PARQUET, JSONL])
+def test_every_format_is_read_into_the_same_typed_log(log_format):
+    df_log_xlsx = read_device_log(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_LOG))
+
+    uploaded_file = export_the_sample_log(log_format)
+    # The format is told by the signature of the file, not by its name
+    uploaded_file.name = 'exported_log.xlsx'
+
+    assert sniff_log_format(uploaded_file) == log_format
+    assert uploaded_file.tell() == 0
+
+    df_log = read_device_log(uploaded_file)
+
+    pd.testing.assert_frame_equal(df_log[df_log_xlsx.columns], df_log_xlsx, check_categorical=False)
+    assert read_device_log(export_the_sample_log(log_format), columns=None).shape[1] > df_log.shape[1]
+
+
+# Latest update: 2026-10-18
+def test_the_signature_of_an_xlsx_log_is_recognized():
+    with open(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_LOG), 'rb') as f:
+        assert sniff_log_format(f) == EXCEL
+
+
+# Latest update: 2026-10-18
+@pytest.mark.parametrize('log_format', [CSV, PARQUET, JSONL])
+def test_every_format_is_read_chunk_by_chunk(log_format):
+    df_log = read_device_log(export_the_sample_log(log_format))
+
+    df_chunks = list(iter_device_log_chunks(export_the_sample_log(log_format), chunk_size=1000))
+    assert len(df_chunks) == -(-len(df_log) // 1000)
+    assert all(df_chunk['信号'].dtype == 'float32' for df_chunk in df_chunks)
+
+    # The categories differ from chunk to chunk, hence the comparison as objects
+    df_combined = pd.concat(df_chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(
+        df_combined[df_log.columns].astype({'操作类型': object, '设备ID': object}),
+        df_log.astype({'操作类型': object, '设备ID': object}),
+    )
+
+
+# Latest update: 2026-10-18
+def test_the_streaming_pipeline_reads_a_csv_log():
+    df_expected = DataAnalyserBackendAgent.conduct_the_streaming_pipeline(
+        os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_LOG), chunk_size=1000
+    )
+    df_actual = DataAnalyserBackendAgent.conduct_the_streaming_pipeline(export_the_sample_log(CSV), chunk_size=1000)
+
+    pd.testing.assert_frame_equal(df_actual, df_expected)
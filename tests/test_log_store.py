@@ -0,0 +1,150 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import numpy as np
+import zipfile
+import pytest
+import io
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.my_backend_agent import DataAnalyserBackendAgent
+from utils.log_store import LogStore
+from utils.zip_ingestion import list_log_members
+from reference_pipeline import assert_same_table
+
+# Setup global variables
+current_file_path = os.path.abspath(__file__)
+PROJECT_ROOT_PATH = os.path.dirname(os.path.dirname(current_file_path))
+PATH_SAMPLE_ZIP = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.zip'
+)
+PATH_SAMPLE_XLSX = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.xlsx'
+)
+
+
+# Helper function to read the sample zip package and list its logs
+def read_the_sample_zip():
+    with open(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_ZIP), 'rb') as f:
+        zip_data = f.read()
+
+    with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_ref:
+        log_files = list_log_members(zip_ref)
+
+    return zip_data, log_files
+
+
+# Helper function to ingest every log of the sample zip package into a store
+def ingest_the_sample_zip(log_store, zip_data, log_files):
+    with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_ref:
+        for log_file in log_files:
+            uploaded_file = io.BytesIO(zip_ref.read(log_file))
+            uploaded_file.name = log_file
+            log_store.ingest_file(uploaded_file)
+
+
+# Latest update: 2026-10-18
+@pytest.mark.parametrize(
+    'pattern', ['multiple_files_single_period', 'multiple_files_latest_period', 'multiple_files_max_period']
+)
+def test_the_store_pipeline_matches_the_zip_analysis(tmp_path, pattern):
+    zip_data, log_files = read_the_sample_zip()
+
+    with LogStore(str(tmp_path / 'log_store.sqlite3')) as log_store:
+        ingest_the_sample_zip(log_store, zip_data, log_files)
+        df_actual = DataAnalyserBackendAgent.conduct_the_store_pipeline(log_store, pattern=pattern)
+
+    # The store lists its devices by imei (each log of the sample is a different device)
+    df_expected = DataAnalyserBackendAgent.analyse_logs_in_zip(zip_data, log_files, pattern)
+    df_expected = df_expected.sort_values('imei').reset_index(drop=True)
+
+    assert_same_table(df_actual, df_expected)
+
+
+# Latest update: 2026-10-18
+def test_the_store_pipeline_matches_the_multi_period_one():
+    df_log = pd.read_excel(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_XLSX))
+
+    # Drop a few days in the middle, so that the log has several continuous periods
+    days = pd.to_datetime(df_log['创建时间']).dt.strftime('%Y-%m-%d')
+    df_log = df_log[~days.isin(['2025-05-10', '2025-05-11', '2025-05-20'])].reset_index(drop=True)
+
+    dfda_log = DataAnalyserBackendAgent.index_a_dfda_log(df_log)
+    dfda_log = DataAnalyserBackendAgent.define_uptime_and_downtime(dfda_log, df_log, pattern='single_file_multiple_periods')
+    assert len(dfda_log) > 2
+
+    with LogStore(':memory:') as log_store:
+        log_store.ingest(df_log)
+        df_actual = DataAnalyserBackendAgent.conduct_the_store_pipeline(log_store, pattern='single_file_multiple_periods')
+
+    assert_same_table(df_actual, DataAnalyserBackendAgent.conduct_the_multi_period_pipeline(dfda_log, df_log))
+
+
+# Latest update: 2026-10-18
+def test_logs_are_ingested_only_once(tmp_path):
+    zip_data, log_files = read_the_sample_zip()
+    path = str(tmp_path / 'log_store.sqlite3')
+
+    with LogStore(path) as log_store:
+        ingest_the_sample_zip(log_store, zip_data, log_files[:2])
+        n_rows = len(log_store)
+
+    # Reopened: the same files are skipped by their content, and an overlapping export adds no record
+    with LogStore(path) as log_store:
+        ingest_the_sample_zip(log_store, zip_data, log_files[:2])
+        assert len(log_store) == n_rows
+
+        imei = log_store.devices()['imei'].iloc[0]
+        df_log = log_store.read_device_log(imei)
+        assert log_store.ingest(df_log.iloc[100:500]) == 0
+        assert len(log_store) == n_rows
+
+
+# Latest update: 2026-10-18
+def test_device_logs_are_read_back_by_time_range():
+    zip_data, log_files = read_the_sample_zip()
+
+    with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_ref:
+        df_log = pd.read_excel(io.BytesIO(zip_ref.read(log_files[0])))
+
+    with LogStore(':memory:') as log_store:
+        log_store.ingest(df_log)
+        imei = int(df_log['imei'].dropna().iloc[0])
+
+        # The whole log comes back with the same records, in the descending order of the export
+        df_read = log_store.read_device_log(imei)
+        assert len(df_read) == len(df_log)
+        assert df_read['创建时间'].is_monotonic_decreasing
+        assert df_read['信号'].dtype == np.float32
+
+        key_columns = ['创建时间', '操作类型', '信号']
+        df_original = df_log[key_columns].assign(
+            创建时间=pd.to_datetime(df_log['创建时间']), 操作类型=df_log['操作类型'].astype(str)
+        )
+        df_restored = df_read[key_columns].assign(操作类型=df_read['操作类型'].astype(str))
+        pd.testing.assert_frame_equal(
+            df_restored.sort_values(key_columns).reset_index(drop=True),
+            df_original.astype({'信号': np.float32}).sort_values(key_columns).reset_index(drop=True),
+        )
+
+        # A time range is a range query over [start, end)
+        start, end = pd.Timestamp('2025-04-01'), pd.Timestamp('2025-04-03')
+        df_range = log_store.query(imei, start=start, end=end)
+        timestamps = pd.to_datetime(df_log['创建时间'])
+
+        assert len(df_range) == ((timestamps >= start) & (timestamps < end)).sum()
+        assert df_range['创建时间'].is_monotonic_increasing
+        assert log_store.query(imei + 1).empty
+
+
+# Latest update: 2026-10-18
+def test_a_log_without_imei_is_rejected():
+    df_log = pd.DataFrame({
+        '创建时间': pd.to_datetime(['2025-05-01 00:00:00']), '操作类型': ['设备状态'], '信号': [20.0], '设备ID': ['abc']
+    })
+
+    with LogStore(':memory:') as log_store:
+        with pytest.raises(ValueError):
+            log_store.ingest(df_log)
@@ -0,0 +1,34 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.my_backend_agent import DataAnalyserBackendAgent
+from reference_pipeline import run_the_per_period_pipeline, assert_same_table
+
+# Setup global variables
+current_file_path = os.path.abspath(__file__)
+PROJECT_ROOT_PATH = os.path.dirname(os.path.dirname(current_file_path))
+PATH_SAMPLE_LOG = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.xlsx'
+)
+
+
+# Latest update: 2026-10-18
+def test_multi_period_pipeline_matches_the_per_period_one():
+    df_log = pd.read_excel(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_LOG))
+
+    # Drop a few days in the middle, so that the log has several continuous periods
+    days = pd.to_datetime(df_log['创建时间']).dt.strftime('%Y-%m-%d')
+    df_log = df_log[~days.isin(['2025-05-10', '2025-05-11', '2025-05-20'])].reset_index(drop=True)
+
+    dfda_log = DataAnalyserBackendAgent.index_a_dfda_log(df_log)
+    dfda_log = DataAnalyserBackendAgent.define_uptime_and_downtime(dfda_log, df_log, pattern='single_file_multiple_periods')
+    assert len(dfda_log) > 2
+
+    df_expected = run_the_per_period_pipeline(dfda_log, df_log)
+    df_actual = DataAnalyserBackendAgent.conduct_the_multi_period_pipeline(dfda_log.copy(), df_log)
+
+    assert_same_table(df_actual, df_expected)
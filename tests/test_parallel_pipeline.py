@@ -0,0 +1,61 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import zipfile
+import io
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.my_backend_agent import DataAnalyserBackendAgent
+
+# Setup global variables
+current_file_path = os.path.abspath(__file__)
+PROJECT_ROOT_PATH = os.path.dirname(os.path.dirname(current_file_path))
+PATH_SAMPLE_ZIP = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.zip'
+)
+
+
+# Helper function replicating the sequential branch of the multi-device page
+def run_the_sequential_pipeline(zip_data, log_files, pattern_choice):
+    dfda_logs_individual, df_logs = [], []
+
+    with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_ref:
+        for log_file in log_files:
+            with zip_ref.open(log_file) as uploaded_file:
+                df_log = pd.read_excel(uploaded_file)
+
+                format_checked = DataAnalyserBackendAgent.check_id_existence(df_log, uploaded_file)
+                dfda_log = DataAnalyserBackendAgent.index_a_dfda_log(df_log, format_checked)
+                dfda_log = DataAnalyserBackendAgent.define_uptime_and_downtime(dfda_log, df_log, pattern=pattern_choice)
+
+                dfda_logs_individual.append(dfda_log)
+                df_logs.append(df_log)
+
+    dfda_log = pd.concat(dfda_logs_individual, ignore_index=True)
+
+    return DataAnalyserBackendAgent.conduct_the_batch_pipeline(dfda_log, df_logs)
+
+
+# Latest update: 2026-10-18
+def test_parallel_pipeline_matches_the_sequential_one():
+    with open(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_ZIP), 'rb') as f:
+        zip_data = f.read()
+
+    with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_ref:
+        log_files = [f for f in zip_ref.namelist() if f.endswith('.xlsx')]
+
+    progress = []
+    df_parallel = DataAnalyserBackendAgent.analyse_logs_in_parallel(
+        zip_data,
+        log_files,
+        'multiple_files_latest_period',
+        max_workers=2,
+        progress_callback=lambda num_done, num_total, num_rows: progress.append((num_done, num_total))
+    )
+    df_sequential = run_the_sequential_pipeline(zip_data, log_files, 'multiple_files_latest_period')
+
+    # Results are merged in the order of the log files, regardless of the order in which workers finish
+    pd.testing.assert_frame_equal(df_parallel, df_sequential)
+    assert progress[-1] == (len(log_files), len(log_files))
@@ -0,0 +1,60 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.parsed_log_store import ParsedLogStore
+from utils.device_log import DeviceLog
+
+
+# Helper function to build a log of a given number of rows (with the dtypes of read_device_log)
+def make_df_log(n_rows):
+    return pd.DataFrame({
+        '创建时间': pd.date_range('2025-03-01', periods=n_rows, freq='h'),
+        'imei': [866_000_000_000_001.0] * n_rows,
+        '设备ID': pd.Categorical(['04k6Q7fMvfJbVqrr1qy4'] * n_rows),
+        '信号': pd.Series([25.0] * n_rows, dtype='float32'),
+        '操作类型': pd.Categorical(['设备状态'] * n_rows),
+    })
+
+
+# Latest update: 2026-10-18
+def test_store_parses_each_log_once():
+    store = ParsedLogStore()
+    calls = []
+
+    def parse():
+        calls.append(1)
+        return make_df_log(3)
+
+    df_first = store.get_or_parse('a.xlsx', parse)
+    df_second = store.get_or_parse('a.xlsx', parse)
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(df_second, df_first)
+    pd.testing.assert_frame_equal(df_first, make_df_log(3))
+    assert store.get('b.xlsx') is None
+
+
+# Latest update: 2026-10-18
+def test_store_spills_to_disk_over_the_memory_limit():
+    df_log = make_df_log(100)
+    n_bytes = DeviceLog.from_frame(df_log).nbytes
+
+    store = ParsedLogStore(memory_limit=int(n_bytes * 1.5))
+    store.put('a.xlsx', df_log)
+    store.put('b.xlsx', make_df_log(100))
+
+    # The least recently used log is spilled, and read back from disk when needed
+    assert store.memory_usage == n_bytes
+    assert len(store) == 2
+    pd.testing.assert_frame_equal(store.get('a.xlsx'), df_log)
+
+    spill_dir = store._spill_dir
+    assert len(os.listdir(spill_dir)) == 1
+
+    store.clear()
+    assert len(store) == 0
+    assert not os.path.exists(spill_dir)
@@ -0,0 +1,107 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import numpy as np
+import threading
+import pytest
+import time
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.result_cache import ResultCache
+from utils.stage_timer import StageTimer
+
+
+# Helper function to build a result of (roughly) the given number of bytes
+def make_result(n_bytes):
+    return {'dfda_log_updated': pd.DataFrame({'value': np.zeros(n_bytes // 8)})}
+
+
+# Latest update: 2026-10-18
+def test_result_cache_key_depends_on_the_content_and_the_pattern():
+    key = ResultCache.key_of(b'zip content', 'multiple_files_single_period')
+
+    assert key == ResultCache.key_of(b'zip content', 'multiple_files_single_period')
+    assert key != ResultCache.key_of(b'zip content', 'multiple_files_max_period')
+    assert key != ResultCache.key_of(b'other content', 'multiple_files_single_period')
+
+
+# Latest update: 2026-10-18
+def test_result_cache_evicts_the_least_recently_used_results():
+    result_cache = ResultCache(memory_limit=25_000)
+
+    result_cache.put('a', make_result(10_000))
+    result_cache.put('b', make_result(10_000))
+    assert result_cache.get('a') is not None
+
+    # 'b' is now the least recently used one
+    result_cache.put('c', make_result(10_000))
+
+    assert 'a' in result_cache and 'c' in result_cache
+    assert 'b' not in result_cache
+    assert result_cache.memory_usage <= 25_000
+
+    # A result larger than the whole cache is not kept
+    result_cache.put('d', make_result(50_000))
+    assert 'd' not in result_cache
+
+
+# Latest update: 2026-10-18
+def test_concurrent_identical_requests_compute_only_once():
+    result_cache = ResultCache()
+    n_calls = []
+    n_waits = []
+
+    def compute():
+        n_calls.append(1)
+        time.sleep(0.2)
+        return make_result(800)
+
+    results = []
+
+    def request():
+        results.append(result_cache.get_or_compute('key', compute, on_wait=lambda: n_waits.append(1)))
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(n_calls) == 1
+    assert len(n_waits) == 7
+    assert all(result is results[0] for result in results)
+
+    # Later requests are served from the cache
+    assert result_cache.get_or_compute('key', compute) is results[0]
+    assert len(n_calls) == 1
+
+
+# Latest update: 2026-10-18
+def test_a_failed_computation_is_not_cached():
+    result_cache = ResultCache()
+
+    def compute():
+        raise ValueError("broken zip")
+
+    with pytest.raises(ValueError):
+        result_cache.get_or_compute('key', compute)
+
+    assert 'key' not in result_cache
+    assert result_cache.get_or_compute('key', lambda: make_result(800)) is not None
+
+
+# Latest update: 2026-10-18
+def test_the_stage_timer_of_a_result_is_counted():
+    stage_timer = StageTimer()
+    for device in range(500):
+        with stage_timer.stage('read_log', device=f'device_{device}', rows=1_000):
+            pass
+
+    result_cache = ResultCache()
+    result_cache.put('without_timer', make_result(800))
+    n_bytes = result_cache.memory_usage
+
+    result_cache.put('with_timer', {**make_result(800), 'stage_timer': stage_timer})
+    assert result_cache.memory_usage - n_bytes > n_bytes + 500 * 8
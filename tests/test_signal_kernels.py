@@ -0,0 +1,65 @@
+# Latest update: 2026-10-18
+
+import numpy as np
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.signal_kernels import SIGNAL_SWITCH_COLUMNS, count_signal_switches
+
+
+# Helper function replicating the original per-value loop of get_signal_switch_frequency (for window_len=2)
+def count_signal_switches_by_loop(signal_values, window_len=2):
+
+    def get_signal_strength_category(signal_value):
+        if 0 < signal_value < 1.5:
+            return "null"
+        elif 1.5 <= signal_value < 11.5:
+            return "weak"
+        elif 11.5 <= signal_value < 21.5:
+            return "mid"
+        else:
+            return "strong"
+
+    strength_order = {"strong": 3, "mid": 2, "weak": 1, "null": 0}
+    counts = dict.fromkeys(SIGNAL_SWITCH_COLUMNS, 0)
+
+    for i in range(len(signal_values) - (window_len - 1)):
+        current_interval = get_signal_strength_category(signal_values[i])
+        next_interval = get_signal_strength_category(signal_values[i + (window_len - 1)])
+
+        if current_interval != next_interval:
+            intervals = sorted([current_interval, next_interval], key=lambda x: strength_order[x], reverse=True)
+            counts[f'times_signal_switch_{intervals[0]}_{intervals[1]}'] += 1
+
+    return [counts[column] for column in SIGNAL_SWITCH_COLUMNS]
+
+
+# Latest update: 2026-10-18
+def test_count_signal_switches_matches_the_loop():
+    rng = np.random.default_rng(42)
+    signal_values = rng.choice([np.nan, 0.0, 0.5, 1.5, 7.0, 11.5, 16.0, 21.5, 31.0], size=500)
+
+    for window_len in [2, 3, 5]:
+        np.testing.assert_array_equal(
+            count_signal_switches(signal_values, window_len=window_len)[0],
+            count_signal_switches_by_loop(signal_values.tolist(), window_len=window_len)
+        )
+
+
+# Latest update: 2026-10-18
+def test_count_signal_switches_within_segments():
+    signal_values = np.array([25.0, 12.0, 3.0, 25.0, 12.0])
+    segment_ids = np.array([0, 0, 0, 1, 1])
+
+    counts = count_signal_switches(signal_values, segment_ids=segment_ids, n_segments=2)
+
+    # No switch is counted across the boundary of the two segments (3.0 -> 25.0)
+    np.testing.assert_array_equal(counts[0], count_signal_switches_by_loop([25.0, 12.0, 3.0]))
+    np.testing.assert_array_equal(counts[1], count_signal_switches_by_loop([25.0, 12.0]))
+
+
+# Latest update: 2026-10-18
+def test_count_signal_switches_on_short_input():
+    assert count_signal_switches(np.array([12.0, 3.0]), window_len=3).sum() == 0
+    assert count_signal_switches(np.array([]), window_len=2).sum() == 0
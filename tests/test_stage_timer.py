@@ -0,0 +1,93 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import zipfile
+import json
+import io
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.my_backend_agent import DataAnalyserBackendAgent
+from utils.stage_timer import StageTimer
+from utils.zip_ingestion import list_log_members
+
+# Setup global variables
+current_file_path = os.path.abspath(__file__)
+PROJECT_ROOT_PATH = os.path.dirname(os.path.dirname(current_file_path))
+PATH_SAMPLE_ZIP = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.zip'
+)
+
+PIPELINE_STEPS = [
+    'get_sub_log_based_on_usage_period', 'get_operation_status', 'get_signal_strength_frequency', 'get_signal_switch_frequency'
+]
+
+
+# Helper function to read the sample zip package and list its logs
+def read_the_sample_zip():
+    with open(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_ZIP), 'rb') as f:
+        zip_data = f.read()
+
+    with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_ref:
+        log_files = list_log_members(zip_ref)
+
+    return zip_data, log_files
+
+
+# Latest update: 2026-10-18
+def test_stages_record_wall_time_cpu_time_and_rows():
+    stage_timer = StageTimer()
+
+    for device in ['a.xlsx', 'b.xlsx']:
+        with stage_timer.stage('read_device_log', device=device) as stage:
+            sum(range(10_000))
+            stage.rows = 100
+    with stage_timer.stage('combine_device_logs'):
+        pass
+
+    df_summary = stage_timer.summary()
+    assert list(df_summary['stage']) == ['read_device_log', 'combine_device_logs']
+    assert list(df_summary['calls']) == [2, 1]
+    assert df_summary['rows'].iloc[0] == 200
+    assert pd.isna(df_summary['rows'].iloc[1]) and pd.isna(df_summary['rows_per_second'].iloc[1])
+    assert (df_summary['wall_seconds'] >= 0).all() and (df_summary['cpu_seconds'] >= 0).all()
+
+    report = json.loads(stage_timer.to_json())
+    assert [record['device'] for record in report['records']] == ['a.xlsx', 'b.xlsx', None]
+    assert len(report['summary']) == 2
+
+
+# Latest update: 2026-10-18
+def test_a_disabled_timer_records_nothing():
+    stage_timer = StageTimer(enabled=False)
+
+    # The same empty stage is handed out every time, and row counts are silently ignored
+    assert stage_timer.stage('read_device_log') is stage_timer.stage('index_a_dfda_log')
+    with stage_timer.stage('read_device_log') as stage:
+        stage.rows = 100
+
+    stage_timer.extend([{'stage': 'read_device_log'}])
+    assert stage_timer.records == []
+
+
+# Latest update: 2026-10-18
+def test_the_zip_analysis_is_timed_per_device_and_per_step():
+    zip_data, log_files = read_the_sample_zip()
+
+    stage_timer = StageTimer()
+    df_timed = DataAnalyserBackendAgent.analyse_logs_in_zip(
+        zip_data, log_files, 'multiple_files_single_period', stage_timer=stage_timer
+    )
+    df_untimed = DataAnalyserBackendAgent.analyse_logs_in_zip(zip_data, log_files, 'multiple_files_single_period')
+
+    pd.testing.assert_frame_equal(df_timed, df_untimed)
+
+    df_records = stage_timer.to_frame()
+    df_reads = df_records[df_records['stage'] == 'read_device_log']
+    assert list(df_reads['device']) == log_files
+    assert (df_reads['rows'] > 0).all()
+
+    stages = set(df_records['stage'])
+    assert {'index_a_dfda_log', 'define_uptime_and_downtime', 'combine_device_logs'} <= stages
+    assert set(PIPELINE_STEPS) <= stages
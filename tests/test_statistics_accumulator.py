@@ -0,0 +1,89 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import numpy as np
+import pytest
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import DataAnalyser
+from utils.build_your_df_features import index_a_dfda_log
+from utils.statistics_accumulator import StatisticsAccumulator
+
+
+# Helper function to build a log for a single device
+def make_df_log(imei, signals):
+    return pd.DataFrame({
+        '创建时间': pd.date_range('2025-03-01', periods=len(signals), freq='h')[::-1].strftime('%Y-%m-%d %H:%M:%S'),
+        'imei': [float(imei)] * len(signals),
+        '信号': signals,
+        '操作类型': ['设备状态'] * len(signals),
+    })
+
+
+# Latest update: 2026-10-18
+def test_accumulator_materializes_once():
+    dfda_log = index_a_dfda_log(make_df_log(1, [25.0]))
+    accumulator = StatisticsAccumulator(dfda_log)
+
+    accumulator.set([0], 'times_of_standby', 3)
+    accumulator.add([0], 'times_of_standby', 2)
+    accumulator.set([0], 'min_signal', 0.5)
+
+    # Nothing is written to the table before materializing
+    assert dfda_log.loc[0, 'times_of_standby'] == 0
+
+    df_materialized = accumulator.materialize()
+    assert df_materialized is dfda_log
+    assert dfda_log.loc[0, 'times_of_standby'] == 5
+    assert dfda_log['min_signal'].dtype == np.float64
+    assert dfda_log.loc[0, 'min_signal'] == 0.5
+
+
+# Latest update: 2026-10-18
+def test_accumulator_accepts_a_table_with_missing_counters():
+    dfda_log = index_a_dfda_log(make_df_log(1, [25.0]))
+
+    # e.g. a table read back from a spreadsheet, where an empty cell becomes NaN
+    dfda_log['times_of_standby'] = np.nan
+    dfda_log['min_signal'] = np.nan
+    accumulator = StatisticsAccumulator(dfda_log)
+
+    accumulator.add([0], 'times_of_standby', 2)
+    df_materialized = accumulator.materialize()
+
+    assert df_materialized['times_of_standby'].dtype == np.int32
+    assert df_materialized.loc[0, 'times_of_standby'] == 2
+    assert np.isnan(df_materialized.loc[0, 'min_signal'])
+
+    dfda_log['times_of_uptime'] = 'unknown'
+    with pytest.raises(ValueError, match='times_of_uptime'):
+        StatisticsAccumulator(dfda_log)
+
+
+# Latest update: 2026-10-18
+def test_data_analyser_identified_by_imei():
+    df_logs = [make_df_log(1, [25.0, 12.0, 25.0]), make_df_log(2, [3.0, 3.0])]
+    dfda_log = pd.concat([index_a_dfda_log(df_log) for df_log in df_logs], ignore_index=True)
+    dfda_log['uptime'] = pd.Timestamp('2025-03-01').date()
+    dfda_log['downtime'] = pd.Timestamp('2025-03-01').date()
+
+    data_analyser = DataAnalyser(dfda_log)
+
+    for df_log, imei in zip(df_logs, [1, 2]):
+        data_analyser.identify_id_info(
+            df_device_log=df_log, use_index=False, index=None, device_name=None, imei=imei
+        )
+        data_analyser.get_usage_period()
+        data_analyser.get_sub_log_based_on_usage_period()
+        data_analyser.get_operation_status()
+        data_analyser.get_signal_strength_frequency()
+        data_analyser.get_signal_switch_frequency(window_len=2)
+
+    df_data_analysis = data_analyser._df_data_analysis
+
+    np.testing.assert_array_equal(df_data_analysis['days_len'], [1, 1])
+    np.testing.assert_array_equal(df_data_analysis['times_of_standby'], [3, 2])
+    np.testing.assert_array_equal(df_data_analysis['times_signal_switch_strong_mid'], [2, 0])
+    np.testing.assert_allclose(df_data_analysis['average_signal'], [20.67, 3.0])
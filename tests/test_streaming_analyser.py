@@ -0,0 +1,52 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.log_reader import read_device_log, iter_device_log_chunks
+from utils.streaming_analyser import StreamingAggregate, StreamingDataAnalyser, aggregate_log_chunks
+from reference_pipeline import make_dfda_log, run_the_per_period_pipeline, assert_statistics_equal
+
+# Setup global variables
+current_file_path = os.path.abspath(__file__)
+PROJECT_ROOT_PATH = os.path.dirname(os.path.dirname(current_file_path))
+PATH_SAMPLE_LOG = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.xlsx'
+)
+
+
+# Latest update: 2026-10-18
+def test_streaming_analyser_matches_the_in_memory_pipeline():
+    path = os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_LOG)
+    df_log = read_device_log(path)
+    periods = [('2025-05-01', '2025-05-31'), ('2025-05-10', '2025-05-12'), ('2025-05-20', '2025-05-20')]
+
+    for window_len in [2, 3, 5]:
+        df_expected = run_the_per_period_pipeline(make_dfda_log(df_log, periods), df_log, window_len=window_len)
+
+        # Tiny chunks, so that the switch windows cross the boundaries of chunks
+        for chunk_size in [1, 7]:
+            aggregate = aggregate_log_chunks(iter_device_log_chunks(path, chunk_size=chunk_size), window_len=window_len)
+            df_actual = StreamingDataAnalyser(make_dfda_log(df_log, periods)).analyse(aggregate)._df_data_analysis
+
+            assert_statistics_equal(df_actual, df_expected, err_msg=f'(window_len={window_len}, chunk_size={chunk_size})')
+
+
+# Latest update: 2026-10-18
+def test_streaming_aggregate_rejects_an_ascending_log():
+    df_log = pd.DataFrame({
+        '创建时间': pd.to_datetime(['2025-03-01 08:00:00', '2025-03-01 09:00:00']),
+        'imei': [1.0, 1.0],
+        '信号': [25.0, 3.0],
+        '操作类型': ['设备状态', '设备状态'],
+    })
+    aggregate = StreamingAggregate.from_chunk(df_log)
+
+    assert not aggregate.is_descending
+    try:
+        StreamingDataAnalyser(make_dfda_log(df_log, [('2025-03-01', '2025-03-01')])).analyse(aggregate)
+        assert False, "An ascending log should be rejected"
+    except ValueError:
+        pass
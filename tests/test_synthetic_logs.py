@@ -0,0 +1,65 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import numpy as np
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.my_backend_agent import DataAnalyserBackendAgent
+from benchmarks.benchmark_pipeline import run_benchmarks, compare_reports
+from utils.synthetic_logs import generate_device_log, generate_fleet_logs
+
+
+# Latest update: 2026-10-18
+def test_a_synthetic_log_looks_like_an_export():
+    df_log = generate_device_log(20_000, seed=1)
+
+    assert len(df_log) == 20_000
+    assert list(df_log.columns) == ['创建时间', 'imei', '设备ID', '信号', '操作类型']
+    assert df_log['创建时间'].is_monotonic_decreasing
+
+    # Calibrated on the real exports
+    shares = df_log['操作类型'].value_counts(normalize=True)
+    assert abs(shares['设备状态'] - 0.65) < 0.02
+    assert abs(shares['设备上线'] - shares['设备下线']) < 0.01
+
+    is_standby = df_log['操作类型'] == '设备状态'
+    assert df_log.loc[is_standby, '信号'].between(0, 31).all()
+    assert df_log.loc[~is_standby, '信号'].isna().all()
+
+    heartbeats = df_log.loc[is_standby, '创建时间'].diff(-1).dt.total_seconds()
+    assert 3000 < heartbeats.median() < 4500
+
+    pd.testing.assert_frame_equal(df_log, generate_device_log(20_000, seed=1))
+
+
+# Latest update: 2026-10-18
+def test_a_synthetic_fleet_goes_through_the_batch_pipeline():
+    df_logs = generate_fleet_logs(5, n_rows_per_device=2_000, seed=3)
+    assert len({df_log['设备ID'].iloc[0] for df_log in df_logs}) == 5
+
+    dfda_log = pd.concat([DataAnalyserBackendAgent.index_a_dfda_log(df_log) for df_log in df_logs], ignore_index=True)
+    dfda_log, _ = DataAnalyserBackendAgent.define_uptime_and_downtime_for_fleet(dfda_log, df_logs)
+    dfda_log_updated = DataAnalyserBackendAgent.conduct_the_batch_pipeline(dfda_log, df_logs)
+
+    n_records = sum(len(df_log) for df_log in df_logs)
+    n_counted = dfda_log_updated[[
+        'times_of_standby', 'times_of_irrigation_start', 'times_of_irrigation_close', 'times_of_uptime', 'times_of_downtime'
+    ]].to_numpy().sum()
+    assert 0 < n_counted <= n_records
+
+
+# Latest update: 2026-10-18
+def test_the_benchmark_report_flags_regressions():
+    report = run_benchmarks(sizes=[1_000], repeats=1)
+
+    stages = {(result['scenario'], result['stage']) for result in report['results']}
+    assert ('single_device', 'DataAnalyser.get_signal_switch_frequency') in stages
+    assert ('fleet', 'conduct_the_batch_pipeline') in stages
+    assert all(result['peak_memory_bytes'] is not None for result in report['results'])
+
+    assert compare_reports(report, report) == []
+
+    slower = {'results': [dict(result, seconds=result['seconds'] * 3 + 1) for result in report['results']]}
+    assert len(compare_reports(slower, report)) == len(report['results'])
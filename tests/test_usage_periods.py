@@ -0,0 +1,94 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import numpy as np
+import datetime
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.build_your_df_features import index_a_dfda_log
+from utils.usage_periods import find_continuous_periods, define_usage_periods
+
+
+# Helper function to build a descending log with one record per listed day (plus a second record on each day)
+def build_timestamps(days):
+    timestamps = [pd.Timestamp(day) + pd.Timedelta(hours=hour) for day in days for hour in (20, 8)]
+    return pd.Series(sorted(timestamps, reverse=True))
+
+
+def build_index_table(n_devices):
+    df_log = pd.DataFrame({'imei': [0.0], '创建时间': [pd.Timestamp('2025-01-01')], '信号': [20.0], '操作类型': ['设备待机']})
+    dfda_log = pd.concat([index_a_dfda_log(df_log)] * n_devices, ignore_index=True)
+    dfda_log['imei'] = np.arange(n_devices, dtype=float)
+    dfda_log['uptime'] = None
+    dfda_log['downtime'] = None
+
+    return dfda_log
+
+
+def as_date(day):
+    return datetime.date.fromisoformat(day)
+
+
+# Three periods: 05-01 ~ 05-03 (3 days), 05-06 ~ 05-08 (3 days), 05-10 (1 day)
+DAYS = ['2025-05-01', '2025-05-02', '2025-05-03', '2025-05-06', '2025-05-07', '2025-05-08', '2025-05-10']
+
+
+# Latest update: 2026-10-18
+def test_find_continuous_periods_latest_first():
+    periods = find_continuous_periods(build_timestamps(DAYS))
+
+    assert list(periods['length']) == [1, 3, 3]
+    assert list(periods['device_key']) == [0, 0, 0]
+
+    uptimes = pd.to_datetime(periods['uptime_day'] * 86_400 * 10**9).strftime('%Y-%m-%d').tolist()
+    assert uptimes == ['2025-05-10', '2025-05-06', '2025-05-01']
+
+
+# Latest update: 2026-10-18
+def test_define_usage_periods_for_each_pattern():
+    timestamps = build_timestamps(DAYS)
+
+    df, row_keys = define_usage_periods(build_index_table(1), timestamps, pattern='single_file_multiple_periods')
+    assert list(row_keys) == [0, 0, 0]
+    assert list(df['uptime']) == [as_date('2025-05-10'), as_date('2025-05-06'), as_date('2025-05-01')]
+    assert list(df['downtime']) == [as_date('2025-05-10'), as_date('2025-05-08'), as_date('2025-05-03')]
+
+    df, _ = define_usage_periods(build_index_table(1), timestamps, pattern='multiple_files_single_period')
+    assert (df.loc[0, 'uptime'], df.loc[0, 'downtime']) == (as_date('2025-05-01'), as_date('2025-05-10'))
+    assert list(df.columns[6:8]) == ['实际使用天数', '实际使用月数']
+
+    df, _ = define_usage_periods(build_index_table(1), timestamps, pattern='multiple_files_latest_period')
+    assert (df.loc[0, 'uptime'], df.loc[0, 'downtime']) == (as_date('2025-05-10'), as_date('2025-05-10'))
+
+    # The two longest periods are of the same length; the latest one wins
+    df, _ = define_usage_periods(build_index_table(1), timestamps, pattern='multiple_files_max_period')
+    assert (df.loc[0, 'uptime'], df.loc[0, 'downtime']) == (as_date('2025-05-06'), as_date('2025-05-08'))
+
+
+# Latest update: 2026-10-18
+def test_define_usage_periods_for_a_fleet():
+    timestamps_a = build_timestamps(DAYS)
+    timestamps_b = build_timestamps(['2025-04-01', '2025-04-02'])
+
+    timestamps = pd.concat([timestamps_a, timestamps_b], ignore_index=True)
+    device_keys = np.repeat([0, 1], [len(timestamps_a), len(timestamps_b)])
+
+    # Device 2 has no record at all, and keeps its row untouched
+    df, row_keys = define_usage_periods(
+        build_index_table(3), timestamps, device_keys, pattern='multiple_files_max_period'
+    )
+
+    assert list(row_keys) == [0, 1, 2]
+    assert list(df['uptime']) == [as_date('2025-05-06'), as_date('2025-04-01'), None]
+    assert list(df['downtime']) == [as_date('2025-05-08'), as_date('2025-04-02'), None]
+
+    # Each device's result is the same as defining its periods on its own
+    for key, timestamps_device in enumerate([timestamps_a, timestamps_b]):
+        df_device, _ = define_usage_periods(
+            build_index_table(3).iloc[[key]].reset_index(drop=True),
+            timestamps_device,
+            pattern='multiple_files_max_period'
+        )
+        pd.testing.assert_frame_equal(df.iloc[[key]].reset_index(drop=True), df_device)
@@ -0,0 +1,102 @@
+# Latest update: 2026-10-18
+
+import pandas as pd
+import zipfile
+import pytest
+import io
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.my_backend_agent import DataAnalyserBackendAgent
+from utils.zip_ingestion import list_log_members, open_log_member
+
+# Setup global variables
+current_file_path = os.path.abspath(__file__)
+PROJECT_ROOT_PATH = os.path.dirname(os.path.dirname(current_file_path))
+PATH_SAMPLE_ZIP = os.path.join(
+    'data', 'testing_instances_for_app', 'intell_controller_sample_log_simplified_beta.zip'
+)
+
+
+# Helper function to repack the sample logs: nested directories, a csv log, and entries that are not logs
+def make_a_mixed_zip():
+    with zipfile.ZipFile(os.path.join(PROJECT_ROOT_PATH, PATH_SAMPLE_ZIP), 'r') as zip_ref:
+        members = [(info.filename.split('/')[-1], zip_ref.read(info)) for info in zip_ref.infolist() if not info.is_dir()]
+
+    (first_name, first_content), others = members[0], members[1:4]
+    df_first = pd.read_excel(io.BytesIO(first_content))
+
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+        zip_ref.writestr('logs/', b'')
+        zip_ref.writestr('logs/' + first_name.replace('.xlsx', '.csv'), df_first.to_csv(index=False).encode('utf-8-sig'))
+        for i, (name, content) in enumerate(others):
+            zip_ref.writestr(f'logs/week_{i}/nested/{name}', content)
+        zip_ref.writestr('__MACOSX/logs/._' + first_name, b'\0' * 16)
+        zip_ref.writestr('logs/~$' + first_name, b'\0' * 16)
+        zip_ref.writestr('logs/README.txt', b'weekly export')
+
+    return zip_buffer.getvalue(), first_content
+
+
+# Latest update: 2026-10-18
+def test_only_the_logs_are_listed_wherever_they_are():
+    zip_data, _ = make_a_mixed_zip()
+
+    with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_ref:
+        log_files = list_log_members(zip_ref)
+
+    assert len(log_files) == 4
+    assert log_files[0].endswith('.csv')
+    assert all('/nested/' in name for name in log_files[1:])
+
+
+# Latest update: 2026-10-18
+def test_large_members_are_spooled_to_disk_and_oversized_ones_refused():
+    zip_data, _ = make_a_mixed_zip()
+
+    with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_ref:
+        name = list_log_members(zip_ref)[1]
+        content = zip_ref.read(name)
+
+        with open_log_member(zip_ref, name) as log_member:
+            assert not log_member._rolled
+            assert log_member.name == name
+
+        with open_log_member(zip_ref, name, spool_size=1024) as log_member:
+            assert log_member._rolled
+            assert log_member.read() == content
+
+        with pytest.raises(ValueError):
+            with open_log_member(zip_ref, name, max_member_size=1024):
+                pass
+
+
+# Latest update: 2026-10-18
+def test_batches_of_devices_match_a_single_batch():
+    zip_data, first_content = make_a_mixed_zip()
+
+    with zipfile.ZipFile(io.BytesIO(zip_data), 'r') as zip_ref:
+        log_files = list_log_members(zip_ref)
+
+    progress = []
+    df_batches = DataAnalyserBackendAgent.analyse_logs_in_zip(
+        zip_data,
+        log_files,
+        'multiple_files_single_period',
+        progress_callback=lambda num_done, num_total, num_rows: progress.append(num_done),
+        batch_rows=1
+    )
+    df_single_batch = DataAnalyserBackendAgent.analyse_logs_in_zip(zip_data, log_files, 'multiple_files_single_period')
+
+    pd.testing.assert_frame_equal(df_batches, df_single_batch)
+    assert progress == [1, 2, 3, 4]
+
+    # The csv log is analysed just as its xlsx original
+    first_zip = io.BytesIO()
+    with zipfile.ZipFile(first_zip, 'w') as zip_ref:
+        zip_ref.writestr('first.xlsx', first_content)
+
+    df_xlsx = DataAnalyserBackendAgent.analyse_logs_in_zip(first_zip.getvalue(), ['first.xlsx'], 'multiple_files_single_period')
+    pd.testing.assert_frame_equal(df_batches.iloc[:1], df_xlsx)
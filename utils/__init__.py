@@ -3,6 +3,9 @@ Utility functions for the project.
 """
 
 from .data_analyser import DataAnalyser
+from .batch_analyser import BatchDataAnalyser
+from .streaming_analyser import StreamingDataAnalyser
+from .log_store_analyser import LogStoreDataAnalyser
 # from .my_backend_agent import MyBackendAgent
 
 
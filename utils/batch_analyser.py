@@ -0,0 +1,264 @@
+"""
+Class-BatchDataAnalyser (类-批量数据分析) 的实现
+
+DataAnalyser 逐设备、逐周期地执行数据分析管道，并将每一项统计量逐个单元格地写入统计表；
+当一个项目下有成百上千台控制器时，这种 Python 层面的循环和逐单元格写入会成为主要的耗时来源。
+
+该类将（多设备的）日志合并为一张以设备为键 (device_key) 的大表，
+并以少数几次分组的、向量化的计算，一次性得到整张 “基于日志的参数统计表”。
+其统计口径与 DataAnalyser 的管道保持一致：
+get_usage_period → get_sub_log_based_on_usage_period → get_operation_status
+→ get_signal_strength_frequency → get_signal_switch_frequency
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import numpy as np
+import pandas as pd
+
+from .signal_kernels import SIGNAL_SWITCH_COLUMNS, count_signal_switches
+from .statistics_accumulator import StatisticsAccumulator
+from .stage_timer import DISABLED_STAGE_TIMER
+from .device_log import LOG_COLUMNS
+
+
+# The column added to the combined log frame to tell devices apart,
+# i.e. the position of the corresponding log in the list passed to 'combine_device_logs'
+# 合并日志时新增的 “设备键” 列，即该日志在传入列表中的位置
+DEVICE_KEY = 'device_key'
+
+
+# Operation types and the counters they are written to (order matters: it defines the operation codes)
+# 操作类型及其对应的统计列（顺序即操作类型的编码）
+OPERATION_COLUMNS = {
+    '设备状态': 'times_of_standby',
+    '开启灌溉': 'times_of_irrigation_start',
+    '关闭灌溉': 'times_of_irrigation_close',
+    '设备上线': 'times_of_uptime',
+    '设备下线': 'times_of_downtime',
+}
+
+SIGNAL_STRENGTH_COLUMNS = [
+    'times_of_strong_signal',
+    'times_of_mid_signal',
+    'times_of_weak_signal',
+    'times_of_null_signal',
+]
+
+# Nanoseconds per day: timestamps (int64 nanoseconds since the epoch) are floor-divided by it into day numbers
+# 每天的纳秒数：时间戳（自 1970-01-01 起的 int64 纳秒）整除以它即得到日期编号
+NS_PER_DAY = 86_400 * 10**9
+
+
+def combine_device_logs(df_logs):
+    """
+    将多份（单设备）日志合并为一张以设备为键的大表，仅保留参与统计的列。
+
+    Args:
+        df_logs (list[pd.DataFrame]): 日志列表；第 i 份日志的所有行的 device_key 均为 i
+    """
+    df_logs_projected = []
+
+    for device_key, df_log in enumerate(df_logs):
+        df_log_projected = df_log[LOG_COLUMNS].copy()
+        df_log_projected[DEVICE_KEY] = device_key
+        df_logs_projected.append(df_log_projected)
+
+    if not df_logs_projected:
+        return pd.DataFrame(columns=LOG_COLUMNS + [DEVICE_KEY])
+
+    return pd.concat(df_logs_projected, ignore_index=True)
+
+
+def _to_day_numbers(values):
+    """Convert dates (or timestamps) to the number of days since 1970-01-01."""
+    timestamps = pd.to_datetime(pd.Series(values)).to_numpy(dtype='datetime64[ns]')
+
+    return np.floor_divide(timestamps.view('int64'), NS_PER_DAY)
+
+
+class BatchDataAnalyser():
+    """
+    BatchDataAnalyser takes the same index table (df_data_analysis) as DataAnalyser,
+    but analyses all devices and all usage periods at once over a combined, device-keyed log frame.
+
+    BatchDataAnalyser 接受与 DataAnalyser 相同的索引表 (df_data_analysis)，
+    但针对一张合并后的、以设备为键的日志大表，一次性完成所有设备、所有使用周期的统计。
+    """
+
+    def __init__(self, df_data_analysis):
+
+        self._df_data_analysis = df_data_analysis
+
+    # Latest update: 2026-10-18
+    def analyse(self, df_logs_combined, device_keys=None, window_len=2, stage_timer=None):
+        """
+        Args:
+            df_logs_combined: 由 combine_device_logs 得到的合并日志
+            device_keys: 索引表每一行所对应的设备键；默认为索引表的行号 (即每台设备一行)
+            window_len: 信号切换的比较窗口长度，与 DataAnalyser.get_signal_switch_frequency 一致
+            stage_timer (StageTimer): (可选) 按 DataAnalyser 管道的步骤名为以下各步骤计时
+        """
+        stage = (stage_timer or DISABLED_STAGE_TIMER).stage
+
+        n_rows = len(self._df_data_analysis)
+        self._accumulator = StatisticsAccumulator(self._df_data_analysis)
+
+        if device_keys is None:
+            device_keys = np.arange(n_rows, dtype=np.int64)
+        else:
+            device_keys = np.asarray(device_keys, dtype=np.int64)
+
+        # Usage period for each row of the index table (same rule as get_usage_period)
+        # 计算索引表每一行的使用周期（与 get_usage_period 的规则一致）
+        uptime_days = _to_day_numbers(self._df_data_analysis['uptime'])
+        downtime_days = _to_day_numbers(self._df_data_analysis['downtime'])
+
+        days_diff = downtime_days - uptime_days
+        days_len = np.where(days_diff == 0, 1, np.abs(days_diff))
+        months_len = days_len // 30
+
+        with stage('get_sub_log_based_on_usage_period', rows=len(df_logs_combined)):
+
+            # Sort the combined log by (device, time) once, leaving out records without a valid time;
+            # the exported logs are in descending order, so records with the same time are put in reversed file order
+            # 对合并日志按 (设备, 时间) 仅排序一次，并剔除创建时间无效的记录；
+            # 导出的日志为倒序排列，因此创建时间相同的记录按文件中的逆序排列，使信号切换的统计与逐设备的管道一致
+            timestamps = pd.to_datetime(df_logs_combined['创建时间']).to_numpy(dtype='datetime64[ns]')
+            is_valid = ~np.isnat(timestamps)
+            positions = np.flatnonzero(is_valid)
+
+            log_keys = df_logs_combined[DEVICE_KEY].to_numpy(dtype=np.int64)[positions]
+            log_ts = timestamps[positions].view('int64')
+            order = np.lexsort((-positions, log_ts, log_keys))
+            positions = positions[order]
+            log_keys = log_keys[order]
+            log_days = np.floor_divide(log_ts[order], NS_PER_DAY)
+
+            # Cut each usage period out of the sorted log with a binary search on a composite (device, day) key
+            # 在有序日志上，以 (设备, 日期) 组合键二分查找，截取每个使用周期对应的 “子日志”
+            if len(positions) > 0:
+                day_min = log_days.min()
+                day_span = int(log_days.max() - day_min) + 3
+            else:
+                day_min, day_span = 0, 3
+
+            composite = log_keys * day_span + (log_days - day_min + 1)
+            lower = device_keys * day_span + np.clip(uptime_days - day_min + 1, 0, day_span - 1)
+            upper = device_keys * day_span + np.clip(downtime_days - day_min + 1, 0, day_span - 1)
+
+            starts = np.searchsorted(composite, lower, side='left')
+            stops = np.searchsorted(composite, upper, side='right')
+            lengths = np.maximum(stops - starts, 0)
+
+            # Gather the sub-logs back to back: 'row_ids' tells which row of the index table each record belongs to
+            # 将所有子日志首尾相接地收集起来；row_ids 表示每条记录所属的索引表行
+            row_ids = np.repeat(np.arange(n_rows), lengths)
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            gathered = np.arange(lengths.sum()) + np.repeat(starts - offsets, lengths)
+            gathered = positions[gathered]
+
+            operations = df_logs_combined['操作类型'].to_numpy()[gathered]
+            signals = df_logs_combined['信号'].to_numpy(dtype=np.float64)[gathered]
+
+        results = {
+            'days_len': days_len,
+            'months_len': months_len,
+        }
+        with stage('get_operation_status', rows=len(operations)):
+            results.update(self._count_operations(operations, row_ids, n_rows))
+
+        is_standby = operations == '设备状态'
+        with stage('get_signal_strength_frequency', rows=int(is_standby.sum())):
+            results.update(
+                self._describe_signal_strength(signals[is_standby], row_ids[is_standby], n_rows)
+            )
+        with stage('get_signal_switch_frequency', rows=int(is_standby.sum())):
+            results.update(
+                self._count_signal_switches(signals[is_standby], row_ids[is_standby], n_rows, window_len)
+            )
+
+        # Write each statistics column once, instead of once per cell
+        # 每个统计列只写入一次，而非逐个单元格地写入
+        for column, values in results.items():
+            self._accumulator.set_column(column, values)
+
+        self._accumulator.materialize()
+
+        return self
+
+    @staticmethod
+    def _count_operations(operations, row_ids, n_rows):
+
+        operation_types = list(OPERATION_COLUMNS.keys())
+        codes = pd.Categorical(operations, categories=operation_types).codes
+
+        is_known = codes >= 0
+        counts = np.bincount(
+            row_ids[is_known] * len(operation_types) + codes[is_known],
+            minlength=n_rows * len(operation_types)
+        ).reshape(n_rows, len(operation_types))
+
+        return {column: counts[:, i] for i, column in enumerate(OPERATION_COLUMNS.values())}
+
+    def _describe_signal_strength(self, signals, row_ids, n_rows):
+
+        results = {}
+
+        # Strong (>= 21.5), mid ([11.5, 21.5)), weak ([1.5, 11.5)) and null (< 1.5); missing values are not counted
+        # 强 (>= 21.5)、中 ([11.5, 21.5))、弱 ([1.5, 11.5)) 和无 (< 1.5) 信号；空值不计入
+        is_valid = ~np.isnan(signals)
+        valid_signals = signals[is_valid]
+        valid_row_ids = row_ids[is_valid]
+
+        buckets = 3 - np.searchsorted(np.array([1.5, 11.5, 21.5]), valid_signals, side='right')
+        counts = np.bincount(
+            valid_row_ids * 4 + buckets, minlength=n_rows * 4
+        ).reshape(n_rows, 4)
+
+        for i, column in enumerate(SIGNAL_STRENGTH_COLUMNS):
+            results[column] = counts[:, i]
+
+        # Basic statistics are only updated for rows whose sub-log contains standby records
+        # 仅当子日志中存在 “设备状态” 记录时，才更新平均/最小/最大信号强度
+        num_standby = np.bincount(row_ids, minlength=n_rows)
+        num_valid = np.bincount(valid_row_ids, minlength=n_rows)
+        signal_sum = np.bincount(valid_row_ids, weights=valid_signals, minlength=n_rows)
+
+        signal_min = np.full(n_rows, np.nan)
+        signal_max = np.full(n_rows, np.nan)
+        has_valid = num_valid > 0
+        if has_valid.any():
+            segment_starts = np.searchsorted(valid_row_ids, np.flatnonzero(has_valid))
+            signal_min[has_valid] = np.minimum.reduceat(valid_signals, segment_starts)
+            signal_max[has_valid] = np.maximum.reduceat(valid_signals, segment_starts)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            signal_mean = signal_sum / num_valid
+
+        has_standby = num_standby > 0
+        average_signal = self._accumulator.get(slice(None), 'average_signal').copy()
+        min_signal = self._accumulator.get(slice(None), 'min_signal').copy()
+        max_signal = self._accumulator.get(slice(None), 'max_signal').copy()
+
+        average_signal[has_standby] = [round(value, 2) for value in signal_mean[has_standby]]
+        min_signal[has_standby] = signal_min[has_standby]
+        max_signal[has_standby] = signal_max[has_standby]
+
+        results['average_signal'] = average_signal
+        results['min_signal'] = min_signal
+        results['max_signal'] = max_signal
+
+        return results
+
+    @staticmethod
+    def _count_signal_switches(signals, row_ids, n_rows, window_len):
+
+        # Compare each standby record with the one (window_len - 1) records later within the same sub-log
+        # 在同一子日志内，比较每条待机记录与其后第 (window_len - 1) 条记录的信号类别
+        counts = count_signal_switches(signals, window_len=window_len, segment_ids=row_ids, n_segments=n_rows)
+
+        return {column: counts[:, i] for i, column in enumerate(SIGNAL_SWITCH_COLUMNS)}
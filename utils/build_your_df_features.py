@@ -1,7 +1,9 @@
 # Historical update: 2025-05-19
-# Latest update: 2025-06-17
+# Latest update: 2026-10-18
 
 import pandas as pd
+import numpy as np
+import sys
 import os
 
 current_file_path = os.path.abspath(__file__)
@@ -182,8 +184,11 @@ def index_a_dfda_log(df_log):
     df_log_data_analysis['uptime'] = pd.Series(dtype='datetime64[ns]')
     df_log_data_analysis['downtime'] = pd.Series(dtype='datetime64[ns]')
 
-    df_log_data_analysis['days_len'] = 0
-    df_log_data_analysis['months_len'] = 0
+    # Latest update: 2026-10-18
+    # Counters are int32 (see STATISTICS_DTYPES of utils.statistics_accumulator): a device never logs 2^31 records
+    # 计数列均为 int32（见 utils.statistics_accumulator 的 STATISTICS_DTYPES）：单台设备的记录数远不会达到 2^31
+    df_log_data_analysis['days_len'] = np.int32(0)
+    df_log_data_analysis['months_len'] = np.int32(0)
 
     # df_log_data_analysis['num_days_breaks'] = 0
     # df_log_data_analysis['max_days_break'] = 0
@@ -191,26 +196,26 @@ def index_a_dfda_log(df_log):
     # df_log_data_analysis['months_len_exclude_breaks'] = 0
     # df_log_data_analysis['continued_status'] = 'T'
 
-    df_log_data_analysis['times_of_standby'] = 0
-    df_log_data_analysis['times_of_irrigation_start'] = 0
-    df_log_data_analysis['times_of_irrigation_close'] = 0
-    df_log_data_analysis['times_of_uptime'] = 0
-    df_log_data_analysis['times_of_downtime'] = 0
+    df_log_data_analysis['times_of_standby'] = np.int32(0)
+    df_log_data_analysis['times_of_irrigation_start'] = np.int32(0)
+    df_log_data_analysis['times_of_irrigation_close'] = np.int32(0)
+    df_log_data_analysis['times_of_uptime'] = np.int32(0)
+    df_log_data_analysis['times_of_downtime'] = np.int32(0)
 
-    df_log_data_analysis['times_of_strong_signal'] = 0
-    df_log_data_analysis['times_of_mid_signal'] = 0
-    df_log_data_analysis['times_of_weak_signal'] = 0
-    df_log_data_analysis['times_of_null_signal'] = 0
+    df_log_data_analysis['times_of_strong_signal'] = np.int32(0)
+    df_log_data_analysis['times_of_mid_signal'] = np.int32(0)
+    df_log_data_analysis['times_of_weak_signal'] = np.int32(0)
+    df_log_data_analysis['times_of_null_signal'] = np.int32(0)
     df_log_data_analysis['average_signal'] = 0.0
     df_log_data_analysis['min_signal'] = 0
     df_log_data_analysis['max_signal'] = 0
 
-    df_log_data_analysis['times_signal_switch_strong_mid'] = 0
-    df_log_data_analysis['times_signal_switch_strong_weak'] = 0
-    df_log_data_analysis['times_signal_switch_strong_null'] = 0
-    df_log_data_analysis['times_signal_switch_mid_weak'] = 0
-    df_log_data_analysis['times_signal_switch_mid_null'] = 0
-    df_log_data_analysis['times_signal_switch_weak_null'] = 0
+    df_log_data_analysis['times_signal_switch_strong_mid'] = np.int32(0)
+    df_log_data_analysis['times_signal_switch_strong_weak'] = np.int32(0)
+    df_log_data_analysis['times_signal_switch_strong_null'] = np.int32(0)
+    df_log_data_analysis['times_signal_switch_mid_weak'] = np.int32(0)
+    df_log_data_analysis['times_signal_switch_mid_null'] = np.int32(0)
+    df_log_data_analysis['times_signal_switch_weak_null'] = np.int32(0)
 
     # return index_success, df_log_data_analysis
     return df_log_data_analysis
@@ -223,7 +228,11 @@ def main():
     # print(df_data_analysis)
     # print(f"Shape: {df_data_analysis.shape}")
 
-    df_log = pd.read_excel(
+    # Latest update: 2026-10-18
+    sys.path.append(PROJECT_ROOT_PATH)
+    from utils.log_cache import get_default_log_cache
+
+    df_log = get_default_log_cache().read_device_log(
         os.path.join(PROJECT_ROOT_PATH, PATH_SUPERIOR, 
                     'j4wE36eNXBk1M63f7TUh.xlsx'),
     )
@@ -0,0 +1,263 @@
+"""
+Class-ChartSeries (类-图表数据序列) 的实现，以及图表数据序列的构建
+
+“单设备处理” 页面的五个可视化图表原本各自对日志排序（有时排序两次）、逐个时间戳地格式化日期，甚至直接修改调用方的日志。
+ChartSeries 为每一份上传的日志只构建一次：按时间排序的时间戳、向量化格式化的 YY-MM-DD 日期标签、操作类型及其编码、信号强度，
+均以只读的 NumPy 数组保存，所有的图表都从中读取，而不再接触（或修改）原始日志。
+
+其余的函数以向量化的方式一次性构建图表所需的数据序列，返回以 NumPy 数组为底层的序列；
+前端代理只需将其转换为列表，即可传给 ECharts 的配置项 (Options)。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import numpy as np
+import pandas as pd
+
+from .batch_analyser import NS_PER_DAY
+
+
+# Codes of the operation types on the charts; any other (or missing) type is coded 0 ('*无类型记录')
+# 操作类型在图表中的编码；其他（或缺失的）操作类型编码为 0
+STATUS_CODES = {
+    '设备上线': 1,
+    '设备下线': 1,
+    '开启灌溉': 2,
+    '关闭灌溉': 2,
+    '设备状态': 3,
+}
+
+
+class ChartSeries():
+    """
+    一份日志的、按时间升序排列的（不可变的）图表数据序列；创建时间无效的记录不参与绘图。
+    """
+
+    __slots__ = ('_timestamps', '_labels', '_operations', '_status_codes', '_signals', '_signals_filled')
+
+    def __init__(self, timestamps, operations, signals):
+
+        timestamps = np.asarray(timestamps, dtype='datetime64[ns]')
+        operations = np.asarray(operations, dtype=object)
+
+        # Each distinct operation type is encoded once
+        # 每种操作类型只编码一次
+        inverse, categories = pd.factorize(operations, use_na_sentinel=False)
+        status_codes = np.array([STATUS_CODES.get(category, 0) for category in categories], dtype=np.int8)
+
+        signals = np.asarray(signals, dtype=np.float64)
+
+        fields = {
+            '_timestamps': timestamps,
+            '_labels': format_date_labels(timestamps),
+            '_operations': operations,
+            '_status_codes': status_codes[inverse],
+            '_signals': signals,
+            '_signals_filled': np.nan_to_num(signals, nan=0.0),
+        }
+
+        for name, values in fields.items():
+            values.flags.writeable = False
+            object.__setattr__(self, name, values)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"'{type(self).__name__}' object is immutable")
+
+    @classmethod
+    def from_log(cls, df_log):
+        """
+        由一份日志构建图表数据序列：只排序一次，且不会修改传入的日志。
+        导出的日志为倒序排列，因此创建时间相同的记录按文件中的逆序排列（与 BatchDataAnalyser 的排序方式一致）。
+        """
+        timestamps = pd.to_datetime(df_log['创建时间'], errors='coerce').to_numpy(dtype='datetime64[ns]')
+        is_valid = ~np.isnat(timestamps)
+
+        positions = np.flatnonzero(is_valid)
+        order = positions[np.lexsort((-positions, timestamps[positions]))]
+
+        return cls(
+            timestamps=timestamps[order],
+            operations=df_log['操作类型'].to_numpy(dtype=object)[order],
+            signals=df_log['信号'].to_numpy(dtype=np.float64)[order],
+        )
+
+    @property
+    def n_rows(self):
+        return len(self._timestamps)
+
+    @property
+    def timestamps(self):
+        """datetime64[ns], ascending"""
+        return self._timestamps
+
+    @property
+    def labels(self):
+        """'YY-MM-DD' labels of the timestamps"""
+        return self._labels
+
+    @property
+    def operations(self):
+        return self._operations
+
+    @property
+    def status_codes(self):
+        """int8 codes of the operation types, see STATUS_CODES"""
+        return self._status_codes
+
+    @property
+    def signals(self):
+        """float64, with NaN for missing signal values"""
+        return self._signals
+
+    @property
+    def signals_filled(self):
+        """float64, with missing signal values filled with 0"""
+        return self._signals_filled
+
+
+def format_date_labels(dates):
+    """
+    将日期（或时间戳）格式化为 'YY-MM-DD' 形式的标签，例如 2025-01-01 -> '25-01-01'。
+    """
+    return np.asarray(pd.DatetimeIndex(dates).strftime('%y-%m-%d'), dtype=object)
+
+
+def build_usage_track(timestamps, uptimes, downtimes):
+    """
+    构建设备的在线状态时间线：日志的起止日期范围内的每一天，若落在任一使用周期 [uptime, downtime] 之内，则为在线。
+
+    在线状态由差分数组得到：每个使用周期在其起始日 +1、在其结束日的次日 -1，累加后大于 0 的日期即为在线；
+    成本为 O(日期数 + 周期数)，而不是逐日期、逐周期地比较。无法解析的（或上线晚于下线的）周期将被忽略。
+
+    Args:
+        timestamps: 日志记录的创建时间，用于确定时间线的起止日期
+        uptimes: 各使用周期的上线日期
+        downtimes: 各使用周期的下线日期
+
+    Returns:
+        tuple: (pd.DatetimeIndex 按天连续的日期, np.ndarray 与之等长的在线状态，1 为在线、0 为离线)
+    """
+    timestamps = pd.to_datetime(pd.Series(timestamps), errors='coerce').dropna()
+
+    if len(timestamps) == 0:
+        return pd.DatetimeIndex([]), np.zeros(0, dtype=np.int8)
+
+    dates = pd.date_range(start=timestamps.min().normalize(), end=timestamps.max().normalize(), freq='D')
+    first_day = dates[0].value // NS_PER_DAY
+    n_days = len(dates)
+
+    uptime_days = _to_day_numbers(uptimes) - first_day
+    downtime_days = _to_day_numbers(downtimes) - first_day
+
+    is_valid = ~np.isnan(uptime_days) & ~np.isnan(downtime_days) & (uptime_days <= downtime_days)
+    is_valid &= (downtime_days >= 0) & (uptime_days < n_days)
+
+    starts = np.clip(uptime_days[is_valid], 0, n_days).astype(np.int64)
+    stops = np.clip(downtime_days[is_valid] + 1, 0, n_days).astype(np.int64)
+
+    # Difference array over the day index
+    # 基于日期索引的差分数组
+    diff = np.zeros(n_days + 1, dtype=np.int64)
+    np.add.at(diff, starts, 1)
+    np.add.at(diff, stops, -1)
+
+    status = (np.cumsum(diff[:-1]) > 0).astype(np.int8)
+
+    return dates, status
+
+
+def build_daily_operation_modes(timestamps, operations, device_keys=None):
+    """
+    计算（每台设备）每一天出现次数最多的操作类型（众数）。
+
+    操作类型只被编码一次（按字典序编码为小整数），再以一次 bincount 得到 (设备, 日期) × 操作类型的计数表，
+    并按行取 argmax；次数相同时取编码最小（即字典序最小）的操作类型，与 pd.Series.mode().iloc[0] 的结果一致。
+    某一天若没有任何有效的操作类型，则其众数为 None。
+
+    Args:
+        timestamps: 日志记录的创建时间（无效的时间将被忽略）
+        operations: 日志记录的操作类型
+        device_keys: (可选) 每条记录所属的设备键；默认所有记录属于同一台设备 (0)，可用于一次性地计算整个设备群
+
+    Returns:
+        dict: 'device_key', 'date' (datetime64[D]), 'operation' 三个等长的数组，按 (设备键, 日期) 升序排列
+    """
+    timestamps = pd.to_datetime(pd.Series(timestamps), errors='coerce').to_numpy(dtype='datetime64[ns]')
+    operations = pd.Series(operations, dtype=object).to_numpy()
+
+    if device_keys is None:
+        device_keys = np.zeros(len(timestamps), dtype=np.int64)
+    else:
+        device_keys = np.asarray(device_keys, dtype=np.int64)
+
+    is_valid = ~np.isnat(timestamps)
+    days = np.floor_divide(timestamps[is_valid].view('int64'), NS_PER_DAY)
+    keys = device_keys[is_valid]
+
+    # Encode the operation types to small ints once, in lexicographic order (NaN is encoded as -1)
+    # 将操作类型按字典序一次性地编码为小整数（空值编码为 -1）
+    codes, categories = pd.factorize(operations[is_valid], sort=True)
+    n_categories = len(categories)
+
+    # One group per (device, day), in ascending order
+    # 每个 (设备, 日期) 为一组，按升序排列
+    day_min = days.min() if len(days) > 0 else 0
+    day_span = int(days.max() - day_min) + 1 if len(days) > 0 else 1
+    composite = keys * day_span + (days - day_min)
+    group_composites, group_ids = np.unique(composite, return_inverse=True)
+    n_groups = len(group_composites)
+
+    # Cross-tabulate (group × operation type) counts, and take the most frequent type of each group
+    # 统计 (组 × 操作类型) 的计数表，并取每组出现次数最多的操作类型
+    has_code = codes >= 0
+    counts = np.bincount(
+        group_ids[has_code] * n_categories + codes[has_code], minlength=n_groups * n_categories
+    ).reshape(n_groups, n_categories)
+
+    modes = np.full(n_groups, None, dtype=object)
+    if n_categories > 0:
+        has_any = counts.sum(axis=1) > 0
+        modes[has_any] = np.asarray(categories, dtype=object)[counts.argmax(axis=1)[has_any]]
+
+    return {
+        'device_key': group_composites // day_span,
+        'date': (group_composites % day_span + day_min).astype('datetime64[D]'),
+        'operation': modes,
+    }
+
+
+def build_daily_signal_means(timestamps, signals, decimals=2):
+    """
+    计算每一天的信号强度平均值（忽略空值；某一天若没有任何信号强度值，则为 NaN）。
+
+    Returns:
+        tuple: (np.ndarray datetime64[D] 日志中出现过的日期，升序；np.ndarray 与之等长的日平均信号强度)
+    """
+    timestamps = np.asarray(timestamps, dtype='datetime64[ns]')
+    signals = np.asarray(signals, dtype=np.float64)
+
+    is_valid = ~np.isnat(timestamps)
+    day_numbers, day_ids = np.unique(
+        np.floor_divide(timestamps[is_valid].view('int64'), NS_PER_DAY), return_inverse=True
+    )
+    signals = signals[is_valid]
+
+    has_signal = ~np.isnan(signals)
+    sums = np.bincount(day_ids[has_signal], weights=signals[has_signal], minlength=len(day_numbers))
+    counts = np.bincount(day_ids[has_signal], minlength=len(day_numbers))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.round(sums / counts, decimals)
+
+    return day_numbers.astype('datetime64[D]'), means
+
+
+def _to_day_numbers(values):
+    """Convert dates to the number of days since 1970-01-01 (as floats, NaN for unparsable values)."""
+    timestamps = pd.to_datetime(pd.Series(values, dtype=object), errors='coerce')
+    nanoseconds = timestamps.to_numpy(dtype='datetime64[ns]').view('int64')
+
+    return np.where(timestamps.isna().to_numpy(), np.nan, np.floor_divide(nanoseconds, NS_PER_DAY))
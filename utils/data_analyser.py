@@ -12,11 +12,16 @@ Class-DataAnalyser (类-数据分析) 的实现
 # Email: xuanzhichen.42@gmail.com
 # License: MIT
 
-# Latest Update: 2025/07/03
+# Latest Update: 2026/10/18
 
 
+import numpy as np
 import pandas as pd
 
+from .signal_kernels import SIGNAL_SWITCH_COLUMNS, count_signal_switches
+from .statistics_accumulator import StatisticsAccumulator
+from .device_log import LOG_COLUMNS
+
 
 class DataAnalyser():
     """
@@ -29,12 +34,30 @@ class DataAnalyser():
     并返回一个统计表 (df_data_analysis) 作为我的实习雇主所需要的定量证据，或作为可用于可视化的数据来源。
     """
 
-    # Latest update: 2025-05-13
+    # Latest update: 2026-10-18
     def __init__(self, df_data_analysis):
 
         self._df_data_analysis = df_data_analysis
 
-    # Latest update: 2025-06-20
+        # The device log which has been sorted on its pre-parsed timestamps (see '_prepare_the_sorted_log'),
+        # so that the sub-logs of (multiple) usage periods can be cut out by binary search
+        # 已按（预先解析的）时间戳排好序的设备日志，以便通过二分查找截取（多个）使用周期的子日志
+        self._df_device_log_source = None
+
+    # Latest update: 2026-10-18
+    @property
+    def _df_data_analysis(self):
+        """
+        The statistics are accumulated in typed arrays (see StatisticsAccumulator) by the get_* methods,
+        and are only materialized into the table when the table is read.
+        """
+        return self._accumulator.materialize()
+
+    @_df_data_analysis.setter
+    def _df_data_analysis(self, df_data_analysis):
+        self._accumulator = StatisticsAccumulator(df_data_analysis)
+
+    # Latest update: 2026-10-18
     def identify_id_info(
             self, 
             df_device_log,
@@ -47,7 +70,13 @@ class DataAnalyser():
         特别提醒关于 use_index: 历史原因；当处理单设备日志时，所有的 "标识列" 数值都是一样的
         """
         self._device_name = device_name
-        self._df_device_log = df_device_log
+
+        # Parse and sort the log only once, even if the same log is identified again for another usage period
+        # 同一份日志（例如单设备日志的多个使用周期）只解析和排序一次
+        if df_device_log is not self._df_device_log_source:
+            self._prepare_the_sorted_log(df_device_log)
+
+        self._df_device_log = self._df_device_log_sorted
 
         self._use_index = use_index
         self._index = index
@@ -55,27 +84,56 @@ class DataAnalyser():
 
         # Create a mask once and reuse it to speed up the process
         if self._device_name is not None:
-            self._mask = self._df_data_analysis['device_name'] == self._device_name
+            self._mask = self._accumulator.frame['device_name'] == self._device_name
         else: # imei for identify
-            self._mask = self._df_data_analysis['imei'] == self._imei
+            self._mask = self._accumulator.frame['imei'] == self._imei
 
-        # Filter the dataframe to only include rows where operation is '设备状态'
-        # A non-null value of signal_strength is only recorded when the operation is '设备状态'
-        self._df_device_log_standby = self._df_device_log[self._df_device_log['操作类型'] == '设备状态']
-        # self._df_device_log_standby = self._df_device_log[self._df_device_log['operation'] == '设备状态']
+        # Row positions of the device in the table, which are where the statistics are accumulated
+        # 该设备在统计表中的行位置，即统计量的写入位置
+        if self._use_index:
+            self._positions = self._accumulator.positions_of(index=self._index)
+        else:
+            self._positions = self._accumulator.positions_of(mask=self._mask)
+
+        self._df_device_log_standby = self._df_device_log_standby_sorted
         
         return self
+
+    # Latest update: 2026-10-18
+    def _prepare_the_sorted_log(self, df_device_log):
+        """
+        将 '创建时间' 解析为 int64 (纳秒) 时间戳，并按时间戳对日志排序；
+        导出的日志为倒序排列，因此创建时间相同的记录按文件中的逆序排列 (与逐行倒序遍历的结果一致)。
+        """
+        timestamps = pd.to_datetime(df_device_log['创建时间']).to_numpy(dtype='datetime64[ns]').view('int64')
+        order = np.lexsort((-np.arange(len(timestamps)), timestamps))
+
+        # Latest update: 2026-10-18
+        # Only the analysed columns are sorted (and later sliced), rather than full-width copies of the log
+        # 只对参与统计的列排序（及之后的切片），而不是复制整份日志的所有列
+        self._df_device_log_source = df_device_log
+        self._df_device_log_sorted = df_device_log[LOG_COLUMNS].iloc[order]
+        self._timestamps_sorted = timestamps[order]
+
+        # Filter the dataframe to only include rows where operation is '设备状态'
+        # A non-null value of signal_strength is only recorded when the operation is '设备状态'
+        standby_positions = np.flatnonzero(self._df_device_log_sorted['操作类型'].to_numpy() == '设备状态')
+        # standby_positions = np.flatnonzero(self._df_device_log_sorted['operation'].to_numpy() == '设备状态')
+
+        self._df_device_log_standby_sorted = self._df_device_log_sorted.iloc[standby_positions]
+        self._timestamps_standby_sorted = self._timestamps_sorted[standby_positions]
     
-    # Latest update: 2025-06-20
+    # Latest update: 2026-10-18
     def get_usage_period(self):
+        # The index columns (uptime, downtime) are never accumulated, so they are read from the table directly
         if self._use_index:
             # Get the first (and should be only) value using index
-            downtime = self._df_data_analysis.loc[self._index, 'downtime']
-            uptime = self._df_data_analysis.loc[self._index, 'uptime']
+            downtime = self._accumulator.frame.loc[self._index, 'downtime']
+            uptime = self._accumulator.frame.loc[self._index, 'uptime']
 
         else:
-            downtime = self._df_data_analysis.loc[self._mask, 'downtime'].iloc[0]
-            uptime = self._df_data_analysis.loc[self._mask, 'uptime'].iloc[0]
+            downtime = self._accumulator.frame.loc[self._mask, 'downtime'].iloc[0]
+            uptime = self._accumulator.frame.loc[self._mask, 'uptime'].iloc[0]
             
         # Calculate the time difference between downtime and uptime in days and in months
         if downtime == uptime:
@@ -86,17 +144,12 @@ class DataAnalyser():
         months_len = days_len // 30
 
         # Update days_len and months_len for the specified device
-        if self._use_index:
-            self._df_data_analysis.loc[self._index, 'days_len'] = days_len
-            self._df_data_analysis.loc[self._index, 'months_len'] = months_len
-
-        else:
-            self._df_data_analysis.loc[self._mask, 'days_len'] = days_len
-            self._df_data_analysis.loc[self._mask, 'months_len'] = months_len
+        self._accumulator.set(self._positions, 'days_len', days_len)
+        self._accumulator.set(self._positions, 'months_len', months_len)
 
         return self
     
-    # Latest update: 2025-06-25
+    # Latest update: 2026-10-18
     def get_sub_log_based_on_usage_period(self):
         """
         Implement this function immediately after running 'get_usage_period'.
@@ -105,28 +158,39 @@ class DataAnalyser():
         不涉及日志范围内的计数和统计。同时，由于历史原因，“使用天数” 和 “使用月数” 作为统计表最靠前的两个特征，
         其在类里面的实现方式被我过早地确定了，我也就遵守这个顺序了。
         """
+        lower_bound, upper_bound = self._bounds_of_usage_period()
+
+        # Cut the sub-log out of the sorted log by binary search (a slice rather than a boolean filter)
+        start, stop = np.searchsorted(self._timestamps_sorted, [lower_bound, upper_bound], side='left')
+        self._df_device_log = self._df_device_log_sorted.iloc[start:stop]
+
+        # Update the df_device_log_standby in the same way
+        start, stop = np.searchsorted(self._timestamps_standby_sorted, [lower_bound, upper_bound], side='left')
+        self._df_device_log_standby = self._df_device_log_standby_sorted.iloc[start:stop]
+
+        return self
+    
+    # Latest update: 2026-10-18
+    def _bounds_of_usage_period(self):
+        """
+        使用周期的时间范围 [上线日期的 00:00, 下线日期次日的 00:00)，以 int64 (纳秒) 时间戳表示。
+        """
         # Get downtime and uptime timestamps from df_data_analysis
         if self._use_index:
-            downtime = self._df_data_analysis.loc[self._index, 'downtime']
-            uptime = self._df_data_analysis.loc[self._index, 'uptime']
+            downtime = self._accumulator.frame.loc[self._index, 'downtime']
+            uptime = self._accumulator.frame.loc[self._index, 'uptime']
         else:
-            downtime = self._df_data_analysis.loc[self._mask, 'downtime'].iloc[0]
-            uptime = self._df_data_analysis.loc[self._mask, 'uptime'].iloc[0]
+            downtime = self._accumulator.frame.loc[self._mask, 'downtime'].iloc[0]
+            uptime = self._accumulator.frame.loc[self._mask, 'uptime'].iloc[0]
             # downtime = self._df_data_analysis.loc[self._mask, 'downtime']
             # uptime = self._df_data_analysis.loc[self._mask, 'uptime']
-        
-        # Normalize timestamps to date-only and filter the device log based on the time range
-        self._df_device_log = self._df_device_log[
-            (pd.to_datetime(self._df_device_log['创建时间']).dt.date <= pd.to_datetime(downtime).date()) &
-            (pd.to_datetime(self._df_device_log['创建时间']).dt.date >= pd.to_datetime(uptime).date())
-        ]
 
-        # Update the df_device_log_standby
-        self._df_device_log_standby = self._df_device_log[self._df_device_log['操作类型'] == '设备状态']
-        # self._df_device_log_standby = self._df_device_log[self._df_device_log['operation'] == '设备状态']
+        # Normalize timestamps to date-only, i.e. [00:00 of the uptime date, 00:00 of the day after the downtime date)
+        lower_bound = pd.Timestamp(pd.to_datetime(uptime).date()).value
+        upper_bound = (pd.Timestamp(pd.to_datetime(downtime).date()) + pd.Timedelta(days=1)).value
+
+        return lower_bound, upper_bound
 
-        return self
-    
     # Latest update: 2025-05-19
     def get_log_len(self):
         log_len = len(self._df_device_log)
@@ -169,27 +233,26 @@ class DataAnalyser():
         months_len = days_len // 30
 
         # Update months_len for the specified device
-        self._df_data_analysis.loc[
-            self._df_data_analysis['device_name'] == self._device_name, 'months_len'
-        ] = months_len
+        self._accumulator.set(
+            self._accumulator.positions_of(mask=self._accumulator.frame['device_name'] == self._device_name),
+            'months_len',
+            months_len
+        )
 
         return self
 
     # Latest update: 2025-07-03
     def get_month_len_exclude_break(self, days_break_threshold=2, threshold_days_for_excluding=30):
+        # months_len is accumulated by get_usage_period, so it is read from the accumulator
+        months_len_include_breaks = self._accumulator.get(self._positions, 'months_len')[0]
+
         if self._use_index:
             # Initialize months_len_exclude_breaks assuming no breaks
-            months_len_include_breaks = self._df_data_analysis.loc[
-                self._index, 'months_len'
-            ]
             self._df_data_analysis.loc[
                 self._index, 'months_len_exclude_breaks'
             ] = months_len_include_breaks
 
         else:
-            months_len_include_breaks = self._df_data_analysis.loc[
-                self._mask, 'months_len'
-            ].iloc[0]
             self._df_data_analysis.loc[
                 self._mask, 'months_len_exclude_breaks'
             ] = months_len_include_breaks
@@ -276,7 +339,7 @@ class DataAnalyser():
 
         return self
     
-    # Latest update: 2025-06-25
+    # Latest update: 2026-10-18
     def get_operation_status(self):
         # times_of_standby = len(self._df_device_log[self._df_device_log['operation'] == '设备状态'])
         # times_of_irrigation_start = len(self._df_device_log[self._df_device_log['operation'] == '开启灌溉'])
@@ -291,135 +354,76 @@ class DataAnalyser():
         times_of_downtime = len(self._df_device_log[self._df_device_log['操作类型'] == '设备下线'])
 
         # Update times_of_standby (设备状态)
-        if self._use_index:
-            self._df_data_analysis.loc[self._index, 'times_of_standby'] = times_of_standby
-        else:
-            self._df_data_analysis.loc[self._mask, 'times_of_standby'] = times_of_standby
+        self._accumulator.set(self._positions, 'times_of_standby', times_of_standby)
  
         # Update times_of_irrigation_start (开启灌溉)
-        if self._use_index:
-            self._df_data_analysis.loc[self._index, 'times_of_irrigation_start'] = times_of_irrigation_start
-        else:
-            self._df_data_analysis.loc[self._mask, 'times_of_irrigation_start'] = times_of_irrigation_start
+        self._accumulator.set(self._positions, 'times_of_irrigation_start', times_of_irrigation_start)
 
         # Update times_of_irrigation_close (关闭灌溉)
         # Notes: This record will finally be deleted for CH translation simplicity, however
-        if self._use_index:
-            self._df_data_analysis.loc[self._index, 'times_of_irrigation_close'] = times_of_irrigation_close
-        else:
-            self._df_data_analysis.loc[self._mask, 'times_of_irrigation_close'] = times_of_irrigation_close
+        self._accumulator.set(self._positions, 'times_of_irrigation_close', times_of_irrigation_close)
 
         # Update times_of_uptime (设备上线)
-        if self._use_index:
-            self._df_data_analysis.loc[self._index, 'times_of_uptime'] = times_of_uptime
-        else:
-            self._df_data_analysis.loc[self._mask, 'times_of_uptime'] = times_of_uptime
+        self._accumulator.set(self._positions, 'times_of_uptime', times_of_uptime)
 
         # Update times_of_downtime (设备下线)
         # Notes: This record will finally be deleted for CH translation simplicity, however
-        if self._use_index:
-            self._df_data_analysis.loc[self._index, 'times_of_downtime'] = times_of_downtime
-        else:
-            self._df_data_analysis.loc[self._mask, 'times_of_downtime'] = times_of_downtime
+        self._accumulator.set(self._positions, 'times_of_downtime', times_of_downtime)
 
         return self
     
-    # Latest update: 2025-06-26
+    # Latest update: 2026-10-18
     def get_signal_strength_frequency(self):
         # Instead of looping through rows, vectorized operations for signal statistics
-        signal_strength = self._df_device_log_standby['信号']
+        # The log stores the signal as float32; the statistics are computed in float64
+        # 日志中的信号以 float32 存储，统计量则以 float64 计算
+        signal_strength = self._df_device_log_standby['信号'].astype('float64')
         # signal_strength = self._df_device_log_standby['signal_strength']
 
         # Count strong signals (>= 21.5)
         strong_signals = (signal_strength >= 21.5).sum()
-        if self._use_index:
-            self._df_data_analysis.loc[self._index, 'times_of_strong_signal'] = strong_signals
-        else:
-            self._df_data_analysis.loc[self._mask, 'times_of_strong_signal'] = strong_signals
+        self._accumulator.set(self._positions, 'times_of_strong_signal', strong_signals)
         
         # Count medium signals (>= 11.5 and < 21.5)
         mid_signals = ((signal_strength >= 11.5) & (signal_strength < 21.5)).sum()
-        if self._use_index:
-            self._df_data_analysis.loc[self._index, 'times_of_mid_signal'] = mid_signals
-        else:
-            self._df_data_analysis.loc[self._mask, 'times_of_mid_signal'] = mid_signals
+        self._accumulator.set(self._positions, 'times_of_mid_signal', mid_signals)
         
         # Count weak signals (>= 1.5 and < 11.5)
         weak_signals = ((signal_strength >= 1.5) & (signal_strength < 11.5)).sum()
-        if self._use_index:
-            self._df_data_analysis.loc[self._index, 'times_of_weak_signal'] = weak_signals
-        else:
-            self._df_data_analysis.loc[self._mask, 'times_of_weak_signal'] = weak_signals
+        self._accumulator.set(self._positions, 'times_of_weak_signal', weak_signals)
         
         # Count null signals (< 1.5)
         null_signals = (signal_strength < 1.5).sum()
-        if self._use_index:
-            self._df_data_analysis.loc[self._index, 'times_of_null_signal'] = null_signals
-        else:
-            self._df_data_analysis.loc[self._mask, 'times_of_null_signal'] = null_signals
+        self._accumulator.set(self._positions, 'times_of_null_signal', null_signals)
 
         # Calculate some basic statistics (if there are numeric values)
-        if self._use_index:
-            if signal_strength.empty:
-                pass
-            else:
-                self._df_data_analysis.loc[self._index, 'average_signal'] = round(signal_strength.mean(), 2)
-                self._df_data_analysis.loc[self._index, 'min_signal'] = signal_strength.min()
-                self._df_data_analysis.loc[self._index, 'max_signal'] = signal_strength.max()
+        if signal_strength.empty:
+            pass
         else:
-            if signal_strength.empty:
-                pass
-            else:
-                self._df_data_analysis.loc[self._mask, 'average_signal'] = round(signal_strength.mean(), 2)
-                self._df_data_analysis.loc[self._mask, 'min_signal'] = signal_strength.min()
-                self._df_data_analysis.loc[self._mask, 'max_signal'] = signal_strength.max()
+            self._accumulator.set(self._positions, 'average_signal', round(signal_strength.mean(), 2))
+            self._accumulator.set(self._positions, 'min_signal', signal_strength.min())
+            self._accumulator.set(self._positions, 'max_signal', signal_strength.max())
 
         return self
 
-    # Latest update: 2025-06-26
+    # Latest update: 2026-10-18
     def get_signal_switch_frequency(self, window_len=2):
-        # Function to determine which interval a signal value falls into
-        def get_signal_strength_category(signal_value):
-            if 0< signal_value < 1.5:
-                return "null"
-            elif 1.5 <= signal_value < 11.5:
-                return "weak"
-            elif 11.5 <= signal_value < 21.5:
-                return "mid"
-            else: # 21.5 <= signal_value < float('inf')
-                return "strong"
-            
-        # Define the order: strong > mid > weak > null
-        strength_order = {"strong": 3, "mid": 2, "weak": 1, "null": 0}
+        """
+        统计信号强度在 strong/mid/weak/null 四个区间之间的切换次数。
 
-        # Get signal strength values as a list for easier iteration
-        signal_values = self._df_device_log_standby['信号'].tolist()
-        # signal_values = self._df_device_log_standby['signal_strength'].tolist()
-        
-        # Iterate through adjacent signal values
-        for i in range(len(signal_values) - 1):
-            current_signal = signal_values[i]
-            next_signal = signal_values[i + (window_len - 1)]
-            # next_signal = signal_values[i + 1]
-            
-            # Determine which intervals the signals fall into
-            current_interval = get_signal_strength_category(current_signal)
-            next_interval = get_signal_strength_category(next_signal)
-            
-            # Skip if both signals fall into the same interval
-            if current_interval == next_interval:
-                continue
-            # Sort different intervals (strong > mid > weak > null) to ensure consistent column
-            else:
-                intervals = sorted([current_interval, next_interval], 
-                                key=lambda x: strength_order[x], 
-                                reverse=True)
-                column_name = f'times_signal_switch_{intervals[0]}_{intervals[1]}'
-                
-                # Update the counter for the specific switch type
-                if self._use_index:
-                    self._df_data_analysis.loc[self._index, column_name] += 1
-                else:
-                    self._df_data_analysis.loc[self._mask, column_name] += 1
+        所有信号值被一次性地划分区间，再与其后第 (window_len - 1) 个信号值比较 (window_len=2 即相邻的两个信号值)，
+        六种切换类型的计数由一次 bincount 得到，并且每个统计列只累加一次。
+        """
+        # Get signal strength values as an array for vectorized processing
+        signal_values = self._df_device_log_standby['信号'].to_numpy(dtype='float64')
+        # signal_values = self._df_device_log_standby['signal_strength'].to_numpy(dtype='float64')
+
+        # Count the switches between different intervals (strong > mid > weak > null) all at once
+        switch_counts = count_signal_switches(signal_values, window_len=window_len)[0]
+
+        for column_name, switch_count in zip(SIGNAL_SWITCH_COLUMNS, switch_counts):
+
+            # Update the counter for the specific switch type
+            self._accumulator.add(self._positions, column_name, switch_count)
              
-        return self
+        return self
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Class-DeviceLog (类-紧凑的设备日志) 的实现
+
+read_device_log 读取的日志是一张 DataFrame：除了参与统计的三列之外，每一行还重复保存着设备的标识列，
+其中 '设备ID' 这类字符串列逐行地保存着相同的 Python 字符串，占去了整份日志的大部分内存。
+而已解析日志仓库 (ParsedLogStore) 需要在整个会话中保存压缩包中的每一份日志。
+
+DeviceLog 只保留数据分析所需的列，并以紧凑的形式保存：
+'创建时间' 为 int64 (纳秒) 时间戳，'操作类型' 为 int8 编码（及其类别），'信号' 为 float32，
+标识列则按类别编码（一份日志通常只有一个取值，每行仅占一个字节）。
+需要时，to_frame 还原出与 read_device_log 的输出相同的列与数据类型。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import numpy as np
+import pandas as pd
+
+from .log_reader import ID_COLUMNS
+
+
+# Only these columns of a log (besides its identification columns) are involved in the statistics
+# 除标识列外，只有以下日志列参与统计
+LOG_COLUMNS = ['创建时间', '操作类型', '信号']
+
+
+class DeviceLog():
+    """
+    一份设备日志的紧凑表示；各列以 NumPy 数组（或 pd.Categorical）保存，行顺序与原日志一致。
+    """
+
+    __slots__ = ('_columns', '_timestamps', '_operations', '_signals', '_identities')
+
+    def __init__(self, columns, timestamps, operations, signals, identities):
+
+        self._columns = tuple(columns)
+
+        # Own copies, so that a compact log never keeps the (much larger) frame it comes from alive
+        # 保存各列的副本，使紧凑的日志不会让其来源的（大得多的）DataFrame 继续驻留在内存中
+
+        # int64 nanoseconds since the epoch (NaT is kept as its int64 sentinel)
+        # 自 1970-01-01 起的 int64 纳秒时间戳（NaT 保存为其 int64 哨兵值）
+        self._timestamps = np.array(timestamps, dtype=np.int64)
+
+        # int8 codes (-1 for missing) along with the operation types
+        # int8 编码（缺失值为 -1）及其对应的操作类型
+        self._operations = pd.Categorical(operations, copy=True)
+
+        self._signals = np.array(signals, dtype=np.float32)
+
+        # Identification column -> (pd.Categorical, dtype to restore); a well-formed log has a single category
+        # 标识列 -> (pd.Categorical, 还原时的数据类型)；格式正确的日志只有一个类别
+        self._identities = {
+            column: (pd.Categorical(values, copy=True), getattr(values, 'dtype', None))
+            for column, values in identities.items()
+        }
+
+    @classmethod
+    def from_frame(cls, df_log):
+        """
+        Args:
+            df_log (pd.DataFrame): read_device_log 的输出；除标识列与 LOG_COLUMNS 之外的列不被保留
+        """
+        missing_columns = [column for column in LOG_COLUMNS if column not in df_log.columns]
+        if missing_columns:
+            raise ValueError(f"日志中缺少数据分析所需的列：{missing_columns}")
+
+        columns = [column for column in df_log.columns if column in LOG_COLUMNS or column in ID_COLUMNS]
+
+        return cls(
+            columns=columns,
+            timestamps=pd.to_datetime(df_log['创建时间']).to_numpy(dtype='datetime64[ns]').view(np.int64),
+            operations=df_log['操作类型'],
+            signals=pd.to_numeric(df_log['信号'], errors='coerce').to_numpy(dtype=np.float32),
+            identities={column: df_log[column] for column in columns if column in ID_COLUMNS},
+        )
+
+    def __len__(self):
+        return len(self._timestamps)
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    @property
+    def nbytes(self):
+        """Memory held by the columns (in bytes)."""
+        n_bytes = self._timestamps.nbytes + self._signals.nbytes + self._operations.nbytes
+
+        for values, _ in self._identities.values():
+            n_bytes += values.nbytes
+
+        return int(n_bytes)
+
+    def to_frame(self):
+        """
+        Returns:
+            pd.DataFrame: 与 read_device_log 的输出相同的列（及其顺序）与数据类型
+        """
+        data = {
+            '创建时间': self._timestamps.view('datetime64[ns]'),
+            '操作类型': self._operations,
+            '信号': self._signals,
+        }
+
+        # Identification columns are restored to their original dtypes (e.g. imei as float64)
+        # 标识列还原为其原本的数据类型（例如 imei 为 float64）
+        for column, (values, dtype) in self._identities.items():
+            if isinstance(dtype, pd.CategoricalDtype):
+                data[column] = values
+            else:
+                data[column] = np.asarray(values, dtype=dtype)
+
+        return pd.DataFrame({column: data[column] for column in self._columns})
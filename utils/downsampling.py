@@ -0,0 +1,104 @@
+"""
+实时图表的降采样
+
+“单设备处理” 页面的实时图表（信号强度，操作类型）原本为日志的每一条记录绘制一个点；
+对于十万行级别的日志，ECharts 的配置项会达到数 MB，浏览器的标签页也会因此卡顿。
+
+该模块在服务端将序列降采样至给定的点数（默认 DEFAULT_MAX_POINTS）：
+    - 数值序列（信号强度）：Largest-Triangle-Three-Buckets (LTTB)，在保留折线视觉形状的前提下挑选代表点；
+    - 类别序列（操作类型的编码）：按桶保留每一种出现过的编码的第一个点，任何一次（哪怕是罕见的）操作类型都不会在图中消失。
+
+两个函数都返回被保留的记录的下标（升序），便于同时截取 x 轴（时间）与 y 轴（数值）。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import numpy as np
+
+
+DEFAULT_MAX_POINTS = 2000
+
+
+def lttb_indices(y, max_points=DEFAULT_MAX_POINTS, x=None):
+    """
+    以 LTTB 算法降采样一个数值序列：首尾两点总被保留，其余的点均分为 (max_points - 2) 个桶，
+    每个桶中保留与 “上一个被保留的点” 以及 “下一个桶的均值点” 所围成的三角形面积最大的点。
+
+    Args:
+        y: 数值序列（不能含有 NaN）
+        max_points: 降采样后的点数；若不小于序列的长度，则不做降采样
+        x: (可选) 各点的横坐标；默认为各点的下标（即类别轴上等间距的点）
+
+    Returns:
+        np.ndarray: 被保留的点的下标（升序）
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+
+    if max_points >= n:
+        return np.arange(n)
+
+    if max_points < 3:
+        return np.array([0, n - 1][:max(max_points, 0)], dtype=np.int64)
+
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+
+    # Bucket k spans [edges[k], edges[k + 1]); the first and the last points are kept on their own
+    # 第 k 个桶为 [edges[k], edges[k + 1])；首尾两点单独保留
+    n_buckets = max_points - 2
+    edges = np.floor(np.arange(n_buckets + 1) * ((n - 2) / n_buckets)).astype(np.int64) + 1
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for k in range(n_buckets):
+        start, stop = edges[k], edges[k + 1]
+        next_stop = edges[k + 2] if k + 2 <= n_buckets else n
+
+        average_x = x[stop:next_stop].mean()
+        average_y = y[stop:next_stop].mean()
+
+        # Twice the area of the triangle formed with the previous kept point and the average of the next bucket
+        # 与上一个被保留的点、下一个桶的均值点所围成的三角形面积（的两倍）
+        areas = np.abs(
+            (x[previous] - average_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (average_y - y[previous])
+        )
+
+        previous = start + int(np.argmax(areas))
+        selected[k + 1] = previous
+
+    return selected
+
+
+def category_preserving_indices(codes, max_points=DEFAULT_MAX_POINTS):
+    """
+    降采样一个类别（编码）序列：序列被均分为若干个桶，每个桶中保留每一种出现过的编码的第一个点；
+    桶的个数取决于编码的种类数，使保留的点数不超过 max_points。
+
+    Args:
+        codes: 非负的整数编码序列（例如 map_status 得到的操作类型编码）
+        max_points: 降采样后的最大点数；若不小于序列的长度，则不做降采样
+
+    Returns:
+        np.ndarray: 被保留的点的下标（升序）
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    n = len(codes)
+
+    if max_points >= n:
+        return np.arange(n)
+
+    n_codes = int(codes.max()) + 1
+    n_buckets = max(max_points // n_codes, 1)
+
+    # The first occurrence of each (bucket, code) pair
+    # 每个 (桶, 编码) 组合的第一次出现
+    buckets = np.arange(n) * n_buckets // n
+    _, first_indices = np.unique(buckets * n_codes + codes, return_index=True)
+
+    return np.sort(first_indices)
@@ -0,0 +1,173 @@
+"""
+Class-DeviceStateStore (类-设备状态仓库) 的实现
+
+日志每周重新导出一次，而每一次都要从头分析每台设备的全部历史记录；对于每天都在增长的设备群，刷新的成本随历史长度线性增长。
+
+该模块为每台设备持久化一份部分聚合（即流式模式的 StreamingAggregate，以 JSON 存储）：
+按日期的计数、信号强度的和/个数/最小值/最大值、首尾的信号类别（用于衔接信号切换），以及最新一条记录的创建时间与该时间的记录数。
+当新的日志到来时，只需读取并聚合比该时间更新的记录（导出的日志为倒序排列，读到只含旧记录的分块即可停止），
+再与已保存的状态合并，即可更新使用天数、操作类型次数、信号强度统计与信号切换次数，而成本只取决于新增的记录数。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import pandas as pd
+import numpy as np
+import tempfile
+import json
+import os
+
+from .streaming_analyser import StreamingAggregate, aggregate_log_chunks
+
+
+DEFAULT_STATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'device_states')
+
+
+class DeviceStateStore():
+    """
+    以设备标识（imei，或 device name）为键、以 JSON 文件存储的设备状态（部分聚合）仓库。
+    """
+
+    def __init__(self, state_dir=DEFAULT_STATE_DIR):
+
+        self.state_dir = state_dir
+
+    def load(self, device_id):
+        """Return the persisted aggregate of the device, or None if the device has not been seen before."""
+        path = self._path_of(device_id)
+
+        if not os.path.exists(path):
+            return None
+
+        with open(path, 'r', encoding='utf-8') as f:
+            return StreamingAggregate.from_dict(json.load(f))
+
+    def save(self, device_id, aggregate):
+        os.makedirs(self.state_dir, exist_ok=True)
+
+        # Write to a temporary file first, so that a crash never leaves a half-written state behind
+        # 先写入临时文件再重命名，以免中途失败时留下写了一半的状态
+        file_descriptor, temp_path = tempfile.mkstemp(suffix='.tmp', dir=self.state_dir)
+        with os.fdopen(file_descriptor, 'w', encoding='utf-8') as f:
+            json.dump(aggregate.to_dict(), f, ensure_ascii=False)
+
+        os.replace(temp_path, self._path_of(device_id))
+
+    def _path_of(self, device_id):
+        return os.path.join(self.state_dir, f'{device_id}.json')
+
+
+def get_device_id(df_log):
+    """
+    日志的设备标识：优先使用 imei/IMEI，其次使用 device_name/设备ID（与 index_a_dfda_log 的取值方式一致）。
+    """
+    for column in ['imei', 'IMEI']:
+        if column in df_log.columns and len(df_log[column].dropna()) > 0:
+            return str(int(df_log[column].dropna().iloc[0]))
+
+    for column in ['device_name', '设备ID']:
+        if column in df_log.columns and len(df_log[column].dropna()) > 0:
+            return str(df_log[column].dropna().iloc[0])
+
+    raise ValueError(
+        "当前日志的第一个分块中不存在任一有效的标识列：imei/IMEI/device_name/设备ID，无法找到其对应的设备状态。"
+    )
+
+
+def update_device_state(chunks, state_store, window_len=2):
+    """
+    用一份（新导出的）日志更新其设备的状态：只有比已保存状态中最新的记录更新的记录才会被聚合；
+    由于导出的日志为倒序排列，一旦读到一个只含旧记录的分块，之后的分块便不再读取。
+
+    与已保存状态中最新的记录创建时间相同的记录：状态中记录了此前见过的条数，只有超出的部分（按文件顺序的前几条）才被视为新增的记录。
+
+    Args:
+        chunks: 按文件顺序产出的日志分块（例如 iter_device_log_chunks 的返回值）
+        state_store (DeviceStateStore): 设备状态仓库
+        window_len: 信号切换的比较窗口长度
+
+    Returns:
+        tuple: (设备标识, 更新后的状态, 新增的记录数)
+
+    Raises:
+        ValueError: 当日志的 “设备状态” 记录未按创建时间倒序排列时（与 StreamingDataAnalyser 一致）
+    """
+    chunks = iter(chunks)
+    first_chunk = next(chunks, None)
+
+    if first_chunk is None:
+        raise ValueError("当前日志中没有任何记录。")
+
+    device_id = get_device_id(first_chunk)
+    state = state_store.load(device_id)
+
+    if state is not None and state.window_len != window_len:
+        raise ValueError(
+            f"设备 {device_id} 的已保存状态是以 window_len={state.window_len} 统计的，"
+            f"无法以 window_len={window_len} 增量更新。"
+        )
+
+    if state is None or state.latest_timestamp is None:
+        delta = aggregate_log_chunks(_chain(first_chunk, chunks), window_len=window_len)
+    else:
+        delta = _aggregate_new_records(_chain(first_chunk, chunks), state, window_len)
+
+    if hasattr(chunks, 'close'):
+        chunks.close()
+
+    # The new records precede the analysed ones in the (descending) file order
+    # 按（倒序的）文件顺序，新增的记录位于已分析的记录之前
+    state_updated = delta if state is None else delta.merge(state)
+
+    if not state_updated.is_descending:
+        raise ValueError(
+            f"设备 {device_id} 的日志中 “设备状态” 记录未按创建时间倒序排列，无法增量衔接信号切换的统计；"
+            "请改用内存模式（DataAnalyser）分析该日志。"
+        )
+
+    state_store.save(device_id, state_updated)
+
+    return device_id, state_updated, delta.n_rows
+
+
+def _aggregate_new_records(chunks, state, window_len):
+    """
+    聚合比已保存状态更新的记录：创建时间更晚的记录，以及创建时间与状态中最新的记录相同、但超出此前条数的记录。
+    """
+    latest_timestamp = state.latest_timestamp
+    new_pieces = []
+
+    for df_chunk in chunks:
+        timestamps = pd.to_datetime(df_chunk['创建时间']).to_numpy(dtype='datetime64[ns]')
+        is_valid = ~np.isnat(timestamps)
+        timestamps = timestamps.view('int64')
+
+        is_recent = is_valid & (timestamps >= latest_timestamp)
+        if is_recent.any():
+            new_pieces.append((df_chunk[is_recent], timestamps[is_recent] == latest_timestamp))
+
+        # Records of any operation type may be a few seconds out of order, so stop at the first chunk with no recent record
+        # 任意操作类型的记录之间可能有几秒的乱序，因此读到第一个不含较新记录的分块时才停止
+        if (is_valid & ~is_recent).any() and not is_recent.any():
+            break
+
+    if not new_pieces:
+        return StreamingAggregate(window_len=window_len)
+
+    df_recent = pd.concat([df_piece for df_piece, _ in new_pieces], ignore_index=True)
+    is_at_latest = np.concatenate([is_at_latest for _, is_at_latest in new_pieces])
+
+    # Only the records at the latest time beyond those seen before are new (the first ones, in file order)
+    # 与最新时间相同的记录中，只有超出此前条数的部分（按文件顺序的前几条）是新增的
+    n_new_at_latest = max(int(is_at_latest.sum()) - state.n_latest_rows, 0)
+    is_new = ~is_at_latest | (np.cumsum(is_at_latest) <= n_new_at_latest)
+
+    return StreamingAggregate.from_chunk(df_recent[is_new], window_len=window_len)
+
+
+def _chain(first_chunk, chunks):
+    yield first_chunk
+    yield from chunks
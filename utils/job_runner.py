@@ -0,0 +1,186 @@
+"""
+Class-JobRunner (类-后台任务执行器) 的实现
+
+“多设备处理” 页面原本在 Streamlit 的脚本执行过程中完成整个分析：分析期间用户只能看着阻塞的进度条，
+任何一次控件交互都会触发脚本重跑 (rerun)，大型压缩包的分析甚至会因此被打断。
+
+该类将分析作为后台任务 (Job) 提交到本地的线程池中执行：每个任务有唯一的任务编号 (job id)，
+页面可随时以轮询的方式读取其进度（已完成的文件数、已处理的记录数、吞吐量），任务完成后其结果被保存下来；
+因此页面在任务执行期间可以自由地重跑，而不会打断或重复任务。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import threading
+import time
+import uuid
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_MAX_WORKERS = 2
+
+# Number of finished jobs kept for polling, the oldest ones are forgotten first
+# 保留以供查询的已结束任务的个数，最早结束的任务最先被遗忘
+DEFAULT_MAX_FINISHED_JOBS = 32
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class Job():
+    """
+    一个后台任务：其进度由任务本身通过 report_progress 更新，由页面通过 progress 轮询。
+    """
+
+    def __init__(self, key=None):
+
+        self.job_id = uuid.uuid4().hex
+        self.key = key
+
+        self.status = PENDING
+        self.result = None
+        self.error = None
+
+        self._files_done = 0
+        self._files_total = 0
+        self._rows_processed = 0
+        self._started_at = None
+        self._finished_at = None
+
+        self._lock = threading.Lock()
+
+    @property
+    def is_finished(self):
+        return self.status in (DONE, FAILED)
+
+    # Latest update: 2026-10-18
+    def snapshot(self):
+        """
+        一次性地读取任务的状态、结果与错误；三者总是属于同一时刻，不会读到 “已结束但尚无结果” 这样的中间状态。
+
+        Returns:
+            tuple: (status, result, error)
+        """
+        with self._lock:
+            return self.status, self.result, self.error
+
+    def report_progress(self, files_done, files_total, rows_processed):
+        with self._lock:
+            self._files_done = files_done
+            self._files_total = files_total
+            self._rows_processed = rows_processed
+
+    def progress(self):
+        """
+        Returns:
+            dict: 'status', 'files_done', 'files_total', 'rows_processed', 'elapsed' (秒), 'throughput' (记录数/秒)
+        """
+        with self._lock:
+            if self._started_at is None:
+                elapsed = 0.0
+            else:
+                elapsed = (self._finished_at or time.monotonic()) - self._started_at
+
+            return {
+                'status': self.status,
+                'files_done': self._files_done,
+                'files_total': self._files_total,
+                'rows_processed': self._rows_processed,
+                'elapsed': elapsed,
+                'throughput': self._rows_processed / elapsed if elapsed > 0 else 0.0,
+            }
+
+    # Latest update: 2026-10-18
+    def _run(self, task):
+        with self._lock:
+            self.status = RUNNING
+            self._started_at = time.monotonic()
+
+        result, error = None, None
+        try:
+            result = task(self.report_progress)
+            status = DONE
+        except Exception as task_error:
+            error = task_error
+            status = FAILED
+
+        # Latest update: 2026-10-18
+        # The status, the result and the error are published together (see snapshot)
+        # 状态、结果与错误被同时发布（见 snapshot）
+        with self._lock:
+            self._finished_at = time.monotonic()
+            self.result = result
+            self.error = error
+            self.status = status
+
+
+class JobRunner():
+    """
+    后台任务执行器：以线程池执行任务，并以任务编号保存任务的进度与结果。
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, max_finished_jobs=DEFAULT_MAX_FINISHED_JOBS):
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job-runner')
+        self._max_finished_jobs = max_finished_jobs
+
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, task, key=None):
+        """
+        提交一个任务。若已有一个键相同的任务尚未结束，则直接返回该任务，而不重复提交。
+
+        Args:
+            task: 可调用对象，以进度回调函数 report_progress(files_done, files_total, rows_processed) 为唯一的参数，返回任务的结果
+            key: (可选) 任务的键，用于识别相同的任务（例如相同的压缩包与计算模式）
+
+        Returns:
+            Job: 提交的（或已存在的）任务
+        """
+        with self._lock:
+            if key is not None:
+                for job in self._jobs.values():
+                    if job.key == key and not job.is_finished:
+                        return job
+
+            job = Job(key=key)
+            self._jobs[job.job_id] = job
+            self._forget_finished_jobs()
+
+        self._executor.submit(job._run, task)
+
+        return job
+
+    def get(self, job_id):
+        """Return the job of the id, or None if it is unknown (or has been forgotten)."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _forget_finished_jobs(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+
+        for job_id in finished[:max(len(finished) - self._max_finished_jobs, 0)]:
+            del self._jobs[job_id]
+
+
+_default_job_runner = None
+_default_job_runner_lock = threading.Lock()
+
+
+def get_default_job_runner():
+    """The job runner shared by all sessions of the app process."""
+    global _default_job_runner
+
+    with _default_job_runner_lock:
+        if _default_job_runner is None:
+            _default_job_runner = JobRunner()
+
+    return _default_job_runner
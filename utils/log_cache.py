@@ -0,0 +1,184 @@
+"""
+Class-LogCache (类-日志缓存) 的实现
+
+同一批导出的日志（例如 data/external 下的 211 个日志，或上传的同一个压缩包）往往会被反复分析，
+而每一次分析都要从 xlsx 重新解析，这是整个处理流程中最耗时的一步。
+
+该类将 read_device_log 解析后的日志以 Parquet（列式存储）的格式缓存到磁盘上，
+缓存的键为源文件内容的哈希值 (sha256)：只要日志的内容未变，无论文件名或会话如何变化，都会直接读取列式副本而跳过 Excel 解析。
+缓存的总大小有上限，超出上限时按最近最少使用 (LRU) 的顺序淘汰（以文件的修改时间记录最近一次使用）。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import pandas as pd
+import numpy as np
+import tempfile
+import hashlib
+import os
+
+from .log_reader import OBJECT_COLUMNS, read_device_log
+
+
+# Bump the version whenever read_device_log changes its output, so that stale copies are never hit
+# 每当 read_device_log 的输出发生变化时，须更新该版本号，以免命中过时的缓存
+READER_VERSION = '3'
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'parsed_logs')
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# Chunk size (in bytes) for hashing the content of a log
+_HASH_BUFFER_SIZE = 1024 ** 2
+
+
+class LogCache():
+    """
+    以源文件内容的哈希值为键、Parquet 为格式的日志磁盘缓存。
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key_of(content):
+        return hashlib.sha256(READER_VERSION.encode() + b'\0' + content).hexdigest()
+
+    # Latest update: 2026-10-18
+    @staticmethod
+    def key_of_file(file):
+        """Same key as key_of(file.read()), but hashed chunk by chunk, so that a large log is never read into memory at once."""
+        sha256 = hashlib.sha256(READER_VERSION.encode() + b'\0')
+
+        for chunk in iter(lambda: file.read(_HASH_BUFFER_SIZE), b''):
+            sha256.update(chunk)
+
+        return sha256.hexdigest()
+
+    def get(self, key):
+        """Return the cached log for the key, or None on a cache miss."""
+        path = self._path_of(key)
+
+        try:
+            df_log = pd.read_parquet(path)
+        except (ImportError, OSError, ValueError):
+            return None
+
+        # Record the use of the entry for the LRU eviction
+        # 记录该缓存的最近一次使用，供 LRU 淘汰参考
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        # Missing values of object columns are read back as None; restore them as NaN, as read_excel does
+        # object 列中的空值会被读回为 None，这里还原为与 read_excel 一致的 NaN
+        for column in OBJECT_COLUMNS:
+            if column in df_log.columns:
+                df_log[column] = df_log[column].where(df_log[column].notna(), np.nan)
+
+        return df_log
+
+    def put(self, key, df_log):
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Write to a temporary file first, so that a half-written entry is never read by another session
+        # 先写入临时文件再重命名，以免其他会话读到写了一半的缓存
+        file_descriptor, temp_path = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+        os.close(file_descriptor)
+
+        try:
+            df_log.to_parquet(temp_path, index=False)
+        except (ImportError, TypeError, ValueError):
+            # Logs that cannot be stored as Parquet (e.g. a column of mixed types) are simply not cached
+            # 无法以 Parquet 格式存储的日志（例如某一列的类型混杂）不予缓存
+            os.remove(temp_path)
+            return False
+
+        os.replace(temp_path, self._path_of(key))
+        self._evict()
+
+        return True
+
+    def read_device_log(self, uploaded_file):
+        """
+        读取一个设备日志：命中缓存时直接读取列式副本，否则调用 read_device_log 解析并写入缓存。
+
+        Args:
+            uploaded_file: 日志文件的路径，或类文件对象（如 Streamlit 上传的文件、压缩包中的文件）
+        """
+        if isinstance(uploaded_file, (str, os.PathLike)):
+            with open(uploaded_file, 'rb') as f:
+                key = self.key_of_file(f)
+        else:
+            # The file may have been read before (e.g. for a preview)
+            # 该文件可能已被读取过（例如用于预览）
+            uploaded_file.seek(0)
+            key = self.key_of_file(uploaded_file)
+            uploaded_file.seek(0)
+
+        df_log = self.get(key)
+
+        # Latest update: 2026-10-18
+        # The file itself (rather than a copy of its content) is parsed, keeping its name for the format (.xlsx/.csv)
+        # 直接解析文件本身（而不是其内容的副本），并保留其文件名，以区分日志的格式 (.xlsx/.csv)
+        if df_log is None:
+            df_log = read_device_log(uploaded_file)
+            self.put(key, df_log)
+
+        return df_log
+
+    def size(self):
+        return sum(os.path.getsize(path) for path in self._entries())
+
+    def _path_of(self, key):
+        return os.path.join(self.cache_dir, f'{key}.parquet')
+
+    def _entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        return [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir) if name.endswith('.parquet')
+        ]
+
+    def _evict(self):
+        # Remove the least recently used entries until the cache fits under the size bound
+        # 按最近最少使用的顺序删除缓存，直到缓存的总大小不超过上限
+        entries = []
+        for path in self._entries():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+
+
+_default_log_cache = None
+
+
+def get_default_log_cache():
+    """The cache shared by the pages and scripts of the project (under '.cache/parsed_logs' of the project root)."""
+    global _default_log_cache
+
+    if _default_log_cache is None:
+        _default_log_cache = LogCache()
+
+    return _default_log_cache
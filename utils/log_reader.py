@@ -0,0 +1,318 @@
+"""
+日志读取模块：所有页面（及脚本）读取智能控制器日志 (xlsx/csv/parquet/jsonl) 的统一入口
+
+导出的日志除了数据分析所需的列之外，还包含电量、内容、状态等列；而 pd.read_excel 默认会把每一列都解析为 object，
+'创建时间' 也要在之后的每一个处理步骤中被反复地重新解析。
+
+该模块只读取数据分析所需的列（标识列，'创建时间'，'操作类型'，'信号'），为它们指定明确的数据类型，
+并在读取时一次性地将 '创建时间' 解析为 datetime64；若环境中安装了 python-calamine，则使用更快的 calamine 引擎。
+
+除了 xlsx 之外，IoT 后台还可以直接导出 csv、Parquet 与 JSON lines 格式的日志，它们的解析速度远快于 Excel。
+日志的格式由文件的签名（文件头的若干字节）而不是文件名判断，每种格式各自使用其最快的读取方式 (fast path)；
+无论哪种格式，读取后的列与数据类型都相同：'操作类型' 与设备名称为 category，'信号' 为 float32，'创建时间' 以明确的格式解析。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import pandas as pd
+import numpy as np
+import importlib.util
+import openpyxl
+import os
+
+
+# Identification columns (any of them may be present in a log)
+# 标识列（日志中可能存在其中的任意几列）
+ID_COLUMNS = ['imei', 'IMEI', 'device_name', '设备ID']
+
+# Columns needed by the data analysis pipeline, in addition to the identification columns
+# 除标识列外，数据分析管道所需的列
+ANALYSIS_COLUMNS = ['创建时间', '操作类型', '信号']
+
+READ_COLUMNS = ID_COLUMNS + ANALYSIS_COLUMNS
+
+# Explicit dtypes of the columns read (the '创建时间' column is parsed separately)
+# 各列的数据类型（'创建时间' 单独解析）
+NUMERIC_COLUMNS = ['imei', 'IMEI', '信号']
+OBJECT_COLUMNS = ['device_name', '设备ID', '操作类型']
+
+# Latest update: 2026-10-18
+# Compact dtypes: a handful of operation types, one device name repeated on every row of a log,
+# and signal levels (0 - 31) that float32 holds exactly
+# 紧凑的数据类型：操作类型只有寥寥几种；设备名称在一份日志的每一行中重复出现；信号强度 (0 - 31) 可被 float32 精确表示
+CATEGORY_COLUMNS = ['操作类型', 'device_name', '设备ID']
+FLOAT32_COLUMNS = ['信号']
+
+# Format of the '创建时间' column in the exported logs, e.g. '2025-05-31 05:44:49'
+# 导出日志中 '创建时间' 的格式
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Log formats, told apart by the signature of the file (see sniff_log_format)
+# 日志的格式，由文件的签名区分
+EXCEL = 'excel'
+CSV = 'csv'
+PARQUET = 'parquet'
+JSONL = 'jsonl'
+
+# Number of rows per chunk when a log is read chunk by chunk (see iter_device_log_chunks)
+# 分块读取日志时，每个分块的行数
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Number of leading bytes read to tell the format of a log
+_SIGNATURE_SIZE = 8
+
+# xlsx is a zip package, and the legacy xls an OLE compound document
+_XLSX_SIGNATURE = b'PK\x03\x04'
+_XLS_SIGNATURE = b'\xd0\xcf\x11\xe0'
+
+# The default missing-value strings of read_excel
+_NA_STRINGS = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+}
+
+
+def get_excel_engine():
+    """Prefer the (Rust-based) calamine engine if it is installed, otherwise fall back to openpyxl."""
+    if importlib.util.find_spec('python_calamine') is not None:
+        return 'calamine'
+
+    return 'openpyxl'
+
+
+def sniff_log_format(uploaded_file):
+    """
+    由文件的签名判断日志的格式：xlsx 为 zip 包 (PK\\x03\\x04)，旧版 xls 为 OLE 复合文档，Parquet 以 PAR1 开头，
+    JSON lines 的第一个非空白字符为 '{'；其余的视为 csv。
+
+    Args:
+        uploaded_file: 日志文件的路径，或类文件对象（读取后将回到原来的位置）
+
+    Returns:
+        str: EXCEL, CSV, PARQUET 或 JSONL
+    """
+    head = _read_signature(uploaded_file)
+
+    if head.startswith((_XLSX_SIGNATURE, _XLS_SIGNATURE)):
+        return EXCEL
+
+    if head.startswith(b'PAR1'):
+        return PARQUET
+
+    if head.removeprefix(b'\xef\xbb\xbf').lstrip().startswith(b'{'):
+        return JSONL
+
+    return CSV
+
+
+def _read_signature(uploaded_file):
+    """The leading bytes of the file (a file-like object is moved back to where it was)."""
+    if isinstance(uploaded_file, (str, os.PathLike)):
+        with open(uploaded_file, 'rb') as f:
+            return f.read(_SIGNATURE_SIZE)
+
+    position = uploaded_file.tell()
+    head = uploaded_file.read(_SIGNATURE_SIZE)
+    uploaded_file.seek(position)
+
+    return head
+
+
+# Latest update: 2026-10-18
+def read_device_log(uploaded_file, columns=READ_COLUMNS, engine=None):
+    """
+    读取一个设备日志，并返回数据类型确定的 DataFrame。
+
+    Args:
+        uploaded_file: 日志文件 (xlsx/csv/parquet/jsonl) 的路径，或类文件对象（如 Streamlit 上传的文件、压缩包中的文件）
+        columns: 需要读取的列；日志中不存在的列将被忽略。若为 None，则读取所有列（例如用于预览日志）
+        engine: (可选) read_excel 的引擎；默认见 get_excel_engine
+
+    Returns:
+        pd.DataFrame: '创建时间' 为 datetime64，'imei/IMEI' 为 float64，'信号' 为 float32，'操作类型' 与 'device_name/设备ID' 为 category
+    """
+    usecols = None if columns is None else (lambda column: column in columns)
+    log_format = sniff_log_format(uploaded_file)
+
+    if log_format == CSV:
+        df_log = pd.read_csv(
+            uploaded_file,
+            usecols=usecols,
+            dtype={column: object for column in OBJECT_COLUMNS},
+            encoding='utf-8-sig'
+        )
+
+    elif log_format == PARQUET:
+        # Columnar: only the columns needed are read from the file
+        # 列式存储：只从文件中读取所需的列
+        df_log = pd.read_parquet(uploaded_file, columns=_parquet_columns(uploaded_file, columns))
+
+    elif log_format == JSONL:
+        df_log = pd.read_json(
+            uploaded_file,
+            lines=True,
+            dtype={column: object for column in OBJECT_COLUMNS},
+            convert_dates=False
+        )
+        if columns is not None:
+            df_log = df_log[[column for column in df_log.columns if column in columns]]
+
+    else:
+        df_log = pd.read_excel(
+            uploaded_file,
+            usecols=usecols,
+            dtype={column: object for column in OBJECT_COLUMNS},
+            engine=engine or get_excel_engine()
+        )
+
+    return _normalize_dtypes(df_log)
+
+
+# Latest update: 2026-10-18
+def iter_device_log_chunks(uploaded_file, chunk_size=DEFAULT_CHUNK_SIZE, columns=READ_COLUMNS):
+    """
+    以固定行数的分块 (chunk) 逐块读取一个设备日志，内存占用只取决于分块的大小，而与日志的长度无关。
+    与 read_device_log 一样，日志的格式由文件的签名判断：xlsx 使用 openpyxl 的只读 (read-only) 模式逐行读取，
+    csv 与 jsonl 由 pandas 分块读取，Parquet 则按批 (record batch) 读取；每个分块的列与数据类型与 read_device_log 一致。
+
+    Args:
+        uploaded_file: 日志文件 (xlsx/csv/parquet/jsonl) 的路径，或类文件对象
+        chunk_size: 每个分块的行数
+        columns: 需要读取的列；日志中不存在的列将被忽略
+
+    Yields:
+        pd.DataFrame: 按文件中的顺序依次产出的分块
+    """
+    usecols = None if columns is None else (lambda column: column in columns)
+    log_format = sniff_log_format(uploaded_file)
+
+    if log_format == CSV:
+        with pd.read_csv(
+            uploaded_file,
+            usecols=usecols,
+            dtype={column: object for column in OBJECT_COLUMNS},
+            encoding='utf-8-sig',
+            chunksize=chunk_size
+        ) as reader:
+            for df_chunk in reader:
+                yield _normalize_dtypes(df_chunk)
+
+    elif log_format == PARQUET:
+        import pyarrow.parquet
+
+        parquet_file = pyarrow.parquet.ParquetFile(uploaded_file)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=_parquet_columns(uploaded_file, columns)):
+            yield _normalize_dtypes(batch.to_pandas())
+
+    elif log_format == JSONL:
+        with pd.read_json(
+            uploaded_file,
+            lines=True,
+            dtype={column: object for column in OBJECT_COLUMNS},
+            convert_dates=False,
+            chunksize=chunk_size
+        ) as reader:
+            for df_chunk in reader:
+                if columns is not None:
+                    df_chunk = df_chunk[[column for column in df_chunk.columns if column in columns]]
+                yield _normalize_dtypes(df_chunk)
+
+    elif _read_signature(uploaded_file).startswith(_XLS_SIGNATURE):
+        # openpyxl cannot stream a legacy .xls workbook, which is read at once and then sliced
+        # openpyxl 无法逐行读取旧版的 .xls 工作簿，只能整体读取后再切分
+        df_log = read_device_log(uploaded_file, columns=columns)
+        for start in range(0, len(df_log), chunk_size):
+            yield df_log.iloc[start:start + chunk_size].reset_index(drop=True)
+
+    else:
+        yield from _iter_excel_chunks(uploaded_file, chunk_size, columns)
+
+
+def _iter_excel_chunks(uploaded_file, chunk_size, columns):
+    workbook = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
+
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        selected = [(i, name) for i, name in enumerate(header) if columns is None or name in columns]
+
+        chunk = []
+        for row in rows:
+            chunk.append([_as_cell_value(row[i]) if i < len(row) else None for i, _ in selected])
+
+            if len(chunk) == chunk_size:
+                yield _normalize_dtypes(pd.DataFrame(chunk, columns=[name for _, name in selected]))
+                chunk = []
+
+        if chunk:
+            yield _normalize_dtypes(pd.DataFrame(chunk, columns=[name for _, name in selected]))
+
+    finally:
+        workbook.close()
+
+
+def _parquet_columns(uploaded_file, columns):
+    if columns is None:
+        return None
+
+    import pyarrow.parquet
+
+    if isinstance(uploaded_file, (str, os.PathLike)):
+        names = pyarrow.parquet.read_schema(uploaded_file).names
+    else:
+        position = uploaded_file.tell()
+        names = pyarrow.parquet.read_schema(uploaded_file).names
+        uploaded_file.seek(position)
+
+    return [name for name in names if name in columns]
+
+
+def _as_cell_value(value):
+    # Strings that read_excel treats as missing values by default (e.g. empty cells)
+    # read_excel 默认视为空值的字符串（例如空单元格）
+    if isinstance(value, str) and value in _NA_STRINGS:
+        return None
+
+    return value
+
+
+# Latest update: 2026-10-18
+def _normalize_dtypes(df_log):
+
+    for column in NUMERIC_COLUMNS:
+        if column in df_log.columns:
+            dtype = 'float32' if column in FLOAT32_COLUMNS else 'float64'
+            df_log[column] = pd.to_numeric(df_log[column], errors='coerce').astype(dtype)
+
+    # Empty cells are read as None row by row; keep them as NaN, as read_excel does
+    # 逐行读取时空单元格为 None，这里统一为与 read_excel 一致的 NaN
+    for column in OBJECT_COLUMNS:
+        if column in df_log.columns:
+            df_log[column] = df_log[column].astype(object).where(df_log[column].notna(), np.nan)
+
+            # Latest update: 2026-10-18
+            # An empty column stays as object: a category without categories does not survive the columnar cache
+            # 全为空值的列保持为 object：没有任何类别的 category 无法在列式缓存中原样地往返
+            if column in CATEGORY_COLUMNS and df_log[column].notna().any():
+                df_log[column] = df_log[column].astype('category')
+
+    # Parse the timestamps once here, so that later steps do not have to re-parse the strings;
+    # the explicit format is by far the fastest, other (ISO 8601) layouts are still accepted
+    # 在此处一次性地解析时间戳，后续步骤无须再重复解析字符串；以明确的格式解析最快，其他 (ISO 8601) 格式仍可被接受
+    if '创建时间' in df_log.columns:
+        try:
+            df_log['创建时间'] = pd.to_datetime(df_log['创建时间'], format=TIMESTAMP_FORMAT)
+        except (ValueError, TypeError):
+            df_log['创建时间'] = pd.to_datetime(df_log['创建时间'], format='ISO8601')
+
+        # Timestamps read from Parquet may come in another unit (e.g. microseconds)
+        # 从 Parquet 读取的时间戳可能是其他的单位（例如微秒）
+        df_log['创建时间'] = df_log['创建时间'].astype('datetime64[ns]')
+
+    return df_log
@@ -0,0 +1,369 @@
+"""
+Class-LogStore (类-日志仓库) 的实现
+
+后端代理的说明中设想过 “数据库直连” 的方式：届时索引表与日志文件的匹配问题将不复存在，“查找日志文件” 的逻辑将由 select 语句实现。
+而目前每一次分析都要重新读取（或从缓存中载入）整份 xlsx 日志，再在内存中以布尔掩码筛选出每台设备、每个使用周期的记录；
+设备群数月的历史记录无法在不重新载入日志的前提下被查询。
+
+该类是一个嵌入式的、基于单个 SQLite 文件的日志仓库：每份日志只被摄入 (ingest) 一次，
+其记录存入一张以 (imei, 创建时间) 为前缀的主键组织的表 (WITHOUT ROWID) 中，
+因此按设备、按时间区间截取子日志只是一次主键上的范围查询，而不必载入整份日志：
+
+    logs(imei, 创建时间, 操作类型, occurrence, 信号)，主键为 (imei, 创建时间, 操作类型, occurrence)
+
+其中 '创建时间' 为 int64 (纳秒) 时间戳，'操作类型' 为 operation_types 表中的编码（缺失值为 -1），
+occurrence 为同一台设备在同一时刻、同一操作类型下的第几条记录（按文件中的逆序，即与数据分析管道的排序一致）。
+重叠的导出（例如每周重新导出的同一台设备的日志）中重复的记录因主键冲突而被忽略，内容相同的文件则按其哈希值直接跳过。
+
+注意：与数据分析管道一致，一份日志（文件）对应一台设备，其设备由第一个有效的 imei/IMEI 确定；没有 imei 的日志无法被摄入。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import pandas as pd
+import numpy as np
+import threading
+import sqlite3
+import time
+import os
+
+from .batch_analyser import NS_PER_DAY
+from .build_your_df_features import index_a_dfda_log
+from .device_log import LOG_COLUMNS
+from .log_cache import LogCache
+from .log_reader import read_device_log
+
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'log_store.sqlite3')
+
+# The code of a missing operation type
+# 缺失的操作类型的编码
+MISSING_OPERATION = -1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    imei INTEGER PRIMARY KEY,
+    device_name TEXT
+);
+
+CREATE TABLE IF NOT EXISTS operation_types (
+    code INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS logs (
+    imei INTEGER NOT NULL,
+    "创建时间" INTEGER NOT NULL,
+    "操作类型" INTEGER NOT NULL,
+    occurrence INTEGER NOT NULL,
+    "信号" REAL,
+    PRIMARY KEY (imei, "创建时间", "操作类型", occurrence)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS ingested_files (
+    content_key TEXT PRIMARY KEY,
+    name TEXT,
+    imei INTEGER NOT NULL,
+    n_rows INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+"""
+
+
+class LogStore():
+    """
+    基于单个 SQLite 文件的日志仓库；可在多个线程（例如页面的后台任务）之间共享，所有的读写都经由同一把锁串行执行。
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+
+        self.path = path
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock, self._connection:
+            # WAL lets other processes (e.g. a nightly ingestion) read the store while it is written
+            # WAL 模式下，其他进程（例如每晚的摄入任务）可在写入的同时读取仓库
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._fetch('SELECT COUNT(*) FROM logs')[0][0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def is_ingested(self, content_key):
+        return len(self._fetch('SELECT 1 FROM ingested_files WHERE content_key = ?', (content_key,))) > 0
+
+    def ingest(self, df_log, name=None, content_key=None):
+        """
+        摄入一份（单设备的）日志；已存在的记录（主键相同）被忽略，因此重复或重叠的导出不会产生重复的记录。
+
+        Args:
+            df_log (pd.DataFrame): read_device_log 的输出（或列名相同的原始日志）
+            name: (可选) 日志的来源，例如文件名
+            content_key: (可选) 日志文件内容的哈希值；记录后，内容相同的文件将不再被摄入（见 ingest_file）
+
+        Returns:
+            int: 新增的记录数
+        """
+        missing_columns = [column for column in LOG_COLUMNS if column not in df_log.columns]
+        if missing_columns:
+            raise ValueError(f"日志中缺少数据分析所需的列：{missing_columns}")
+
+        # The same identification as the index table of the pipeline
+        # 与数据分析管道的索引表相同的标识方式
+        dfda_log = index_a_dfda_log(df_log)
+        imei, device_name = dfda_log['imei'].iloc[0], dfda_log['device_name'].iloc[0]
+
+        if imei is None or pd.isna(imei):
+            raise ValueError(f"日志 '{name}' 中不存在有效的 imei/IMEI，无法存入日志仓库。")
+
+        imei = int(imei)
+        device_name = None if device_name is None or pd.isna(device_name) else str(device_name)
+
+        timestamps = pd.to_datetime(df_log['创建时间']).to_numpy(dtype='datetime64[ns]').view(np.int64)
+        operations = pd.Categorical(df_log['操作类型'])
+        signals = pd.to_numeric(df_log['信号'], errors='coerce').to_numpy(dtype=np.float64)
+
+        with self._lock, self._connection:
+            operation_codes = self._encode_operations(operations)
+
+            # Records without a valid timestamp never fall into any usage period
+            # 没有有效创建时间的记录不属于任何使用周期
+            is_valid = ~np.isnat(timestamps.view('datetime64[ns]'))
+            timestamps, operation_codes, signals = timestamps[is_valid], operation_codes[is_valid], signals[is_valid]
+
+            occurrences = _count_occurrences(timestamps, operation_codes)
+
+            self._connection.execute(
+                'INSERT INTO devices (imei, device_name) VALUES (?, ?) '
+                'ON CONFLICT (imei) DO UPDATE SET device_name = COALESCE(excluded.device_name, device_name)',
+                (imei, device_name)
+            )
+
+            total_changes = self._connection.total_changes
+            self._connection.executemany(
+                'INSERT OR IGNORE INTO logs (imei, "创建时间", "操作类型", occurrence, "信号") VALUES (?, ?, ?, ?, ?)',
+                zip(
+                    [imei] * len(timestamps),
+                    timestamps.tolist(),
+                    operation_codes.tolist(),
+                    occurrences.tolist(),
+                    [None if np.isnan(signal) else signal for signal in signals.tolist()],
+                )
+            )
+            n_new_rows = self._connection.total_changes - total_changes
+
+            if content_key is not None:
+                self._connection.execute(
+                    'INSERT OR REPLACE INTO ingested_files (content_key, name, imei, n_rows, ingested_at) VALUES (?, ?, ?, ?, ?)',
+                    (content_key, name, imei, len(timestamps), time.strftime('%Y-%m-%d %H:%M:%S'))
+                )
+
+        return n_new_rows
+
+    def ingest_file(self, uploaded_file):
+        """
+        读取并摄入一个日志文件；内容（哈希值）相同的文件只被摄入一次。
+
+        Args:
+            uploaded_file: 日志文件的路径，或类文件对象（如 Streamlit 上传的文件、压缩包中的文件）
+
+        Returns:
+            int: 新增的记录数（文件已被摄入过时为 0）
+        """
+        if isinstance(uploaded_file, (str, os.PathLike)):
+            name = os.fspath(uploaded_file)
+            with open(uploaded_file, 'rb') as f:
+                content_key = LogCache.key_of_file(f)
+        else:
+            name = getattr(uploaded_file, 'name', None)
+            uploaded_file.seek(0)
+            content_key = LogCache.key_of_file(uploaded_file)
+            uploaded_file.seek(0)
+
+        if self.is_ingested(content_key):
+            return 0
+
+        return self.ingest(read_device_log(uploaded_file), name=name, content_key=content_key)
+
+    def devices(self, imeis=None):
+        """
+        Returns:
+            pd.DataFrame: 仓库中的设备（'imei', 'device_name' 两列），按 imei 排序
+        """
+        rows = self._fetch(
+            'SELECT imei, device_name FROM devices' + _where_imei_in(imeis) + ' ORDER BY imei', _as_params(imeis)
+        )
+
+        return pd.DataFrame(rows, columns=['imei', 'device_name']).astype({'imei': np.int64})
+
+    def read_active_days(self, imeis=None):
+        """
+        每台设备有记录的日期（自 1970-01-01 起的天数），足以定义其使用周期（见 define_usage_periods）。
+
+        Returns:
+            pd.DataFrame: 'imei', 'day' 两列
+        """
+        rows = self._fetch(
+            f'SELECT DISTINCT imei, "创建时间" / {NS_PER_DAY} FROM logs' + _where_imei_in(imeis),
+            _as_params(imeis)
+        )
+
+        return pd.DataFrame(rows, columns=['imei', 'day']).astype(np.int64)
+
+    def query(self, imei, start=None, end=None, descending=False):
+        """
+        截取一台设备在 [start, end) 内的记录：这是 (imei, 创建时间) 主键上的一次范围查询。
+
+        Args:
+            imei: 设备的 imei
+            start, end: (可选) 时间区间的下界（包含）与上界（不包含）；pd.Timestamp 可接受的值，或 int64 纳秒时间戳
+            descending: 是否按倒序返回（与导出的日志一致）；默认按数据分析管道的排序返回，
+                即按创建时间升序，创建时间相同的记录按文件中的逆序
+
+        Returns:
+            pd.DataFrame: LOG_COLUMNS 三列；'操作类型' 为 category，'信号' 为 float32（与 read_device_log 一致）
+        """
+        conditions = ['imei = ?']
+        params = [int(imei)]
+
+        if start is not None:
+            conditions.append('"创建时间" >= ?')
+            params.append(_to_nanoseconds(start))
+        if end is not None:
+            conditions.append('"创建时间" < ?')
+            params.append(_to_nanoseconds(end))
+
+        order = ' DESC' if descending else ''
+        rows = self._fetch(
+            'SELECT "创建时间", "操作类型", "信号" FROM logs WHERE ' + ' AND '.join(conditions) +
+            f' ORDER BY "创建时间"{order}, "操作类型"{order}, occurrence{order}',
+            params
+        )
+
+        timestamps = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        operation_codes = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+        signals = np.fromiter((np.nan if row[2] is None else row[2] for row in rows), dtype=np.float32, count=len(rows))
+
+        return pd.DataFrame({
+            '创建时间': timestamps.view('datetime64[ns]'),
+            '操作类型': pd.Categorical.from_codes(operation_codes, categories=self._operation_names()),
+            '信号': signals,
+        })
+
+    def read_device_log(self, imei, start=None, end=None):
+        """
+        以 read_device_log 的形式（导出日志的倒序及标识列）读出一台设备的日志，可直接交给原有的数据分析管道。
+        同一时刻的不同操作类型之间的顺序无法还原（按操作类型的编码排列），这并不影响任何统计量。
+        """
+        device_name = self._fetch('SELECT device_name FROM devices WHERE imei = ?', (int(imei),))
+
+        df_log = self.query(imei, start=start, end=end, descending=True)
+        df_log.insert(0, 'imei', np.float64(imei))
+
+        if device_name and device_name[0][0] is not None:
+            df_log.insert(1, '设备ID', pd.Categorical([device_name[0][0]] * len(df_log)))
+
+        return df_log
+
+    def _fetch(self, sql, params=()):
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    def _operation_names(self):
+        return [name for (name,) in self._fetch('SELECT name FROM operation_types ORDER BY code')]
+
+    def _encode_operations(self, operations):
+        """
+        将操作类型（pd.Categorical）编码为仓库中的编码；新的操作类型依次分配编码 0, 1, 2, ...
+        调用方须持有锁并处于事务中。
+        """
+        codes_of = dict(self._connection.execute('SELECT name, code FROM operation_types'))
+
+        for name in operations.categories:
+            if str(name) not in codes_of:
+                codes_of[str(name)] = len(codes_of)
+                self._connection.execute(
+                    'INSERT INTO operation_types (code, name) VALUES (?, ?)', (codes_of[str(name)], str(name))
+                )
+
+        lookup = np.array([codes_of[str(name)] for name in operations.categories] + [MISSING_OPERATION], dtype=np.int64)
+
+        # Missing values (code -1) pick the last entry of the lookup
+        # 缺失值（编码为 -1）恰好取到查找表的最后一项
+        return lookup[operations.codes]
+
+
+def _count_occurrences(timestamps, operation_codes):
+    """
+    每条记录是同一时刻、同一操作类型下的第几条记录（从 0 开始）；导出的日志为倒序排列，因此按文件中的逆序计数。
+    """
+    n_records = len(timestamps)
+    if n_records == 0:
+        return np.empty(0, dtype=np.int64)
+
+    # Stable sort of the reversed records, so that ties keep their reversed file order
+    # 对逆序的记录稳定排序，使相同键的记录保持其在文件中的逆序
+    reversed_positions = np.arange(n_records)[::-1]
+    order = reversed_positions[np.lexsort((operation_codes[::-1], timestamps[::-1]))]
+
+    sorted_timestamps, sorted_codes = timestamps[order], operation_codes[order]
+    is_start = np.ones(n_records, dtype=bool)
+    is_start[1:] = (sorted_timestamps[1:] != sorted_timestamps[:-1]) | (sorted_codes[1:] != sorted_codes[:-1])
+
+    group_starts = np.flatnonzero(is_start)
+    group_sizes = np.diff(np.append(group_starts, n_records))
+
+    occurrences = np.empty(n_records, dtype=np.int64)
+    occurrences[order] = np.arange(n_records) - np.repeat(group_starts, group_sizes)
+
+    return occurrences
+
+
+def _to_nanoseconds(value):
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+
+    return pd.Timestamp(value).value
+
+
+def _where_imei_in(imeis):
+    if imeis is None:
+        return ''
+
+    return ' WHERE imei IN (' + ', '.join('?' * len(imeis)) + ')'
+
+
+def _as_params(imeis):
+    return () if imeis is None else [int(imei) for imei in imeis]
+
+
+_default_log_store = None
+
+
+def get_default_log_store():
+    """The store shared by the pages and scripts of the project (at '.cache/log_store.sqlite3' of the project root)."""
+    global _default_log_store
+
+    if _default_log_store is None:
+        _default_log_store = LogStore()
+
+    return _default_log_store
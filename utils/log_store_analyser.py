@@ -0,0 +1,79 @@
+"""
+Class-LogStoreDataAnalyser (类-基于日志仓库的数据分析) 的实现
+
+DataAnalyser 的管道以整份（已载入内存的）日志为输入：identify_id_info 对整份日志排序，
+get_sub_log_based_on_usage_period 再从中截取使用周期的子日志。
+
+LogStoreDataAnalyser 沿用 DataAnalyser 的管道与统计逻辑，只是日志来自日志仓库 (LogStore)：
+identify_id_info 只记录设备的 imei 而不载入任何日志；get_sub_log_based_on_usage_period 则是仓库中 (imei, 创建时间) 主键上的一次范围查询，
+只读出该使用周期内的记录，其顺序与 DataAnalyser 排序后的日志一致，因此之后各步骤的统计结果相同。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import pandas as pd
+
+from .data_analyser import DataAnalyser
+
+
+class LogStoreDataAnalyser(DataAnalyser):
+    """
+    以日志仓库 (LogStore) 为数据来源的 DataAnalyser；用法与 DataAnalyser 相同，只是 identify_id_info 接受日志仓库而非日志。
+    """
+
+    def identify_id_info(
+            self,
+            log_store,
+            use_index: False,
+            index: None,
+            device_name: None,
+            imei: None
+    ):
+        """
+        Args:
+            log_store (LogStore): 日志仓库
+            imei: 设备在仓库中的 imei；为 None 时取统计表中该设备（行）的 imei
+        """
+        self._log_store = log_store
+        self._device_name = device_name
+
+        self._use_index = use_index
+        self._index = index
+
+        if self._device_name is not None:
+            self._mask = self._accumulator.frame['device_name'] == self._device_name
+        else: # imei for identify
+            self._mask = self._accumulator.frame['imei'] == imei
+
+        if self._use_index:
+            self._positions = self._accumulator.positions_of(index=self._index)
+        else:
+            self._positions = self._accumulator.positions_of(mask=self._mask)
+
+        # The store is keyed on imei: look it up in the table when the device is identified otherwise
+        # 仓库以 imei 为键：若设备以其他方式被识别，则从统计表中读取其 imei
+        if imei is None and len(self._positions) > 0:
+            imei = self._accumulator.frame['imei'].iloc[self._positions[0]]
+
+        if imei is None or pd.isna(imei):
+            raise ValueError(f"无法确定设备 '{device_name}' 的 imei，无法从日志仓库中读取其日志。")
+
+        self._imei = int(imei)
+
+        return self
+
+    def get_sub_log_based_on_usage_period(self):
+        """
+        以一次范围查询读出该使用周期 [上线日期的 00:00, 下线日期次日的 00:00) 内的记录。
+        """
+        lower_bound, upper_bound = self._bounds_of_usage_period()
+
+        self._df_device_log = self._log_store.query(self._imei, start=lower_bound, end=upper_bound)
+
+        # A non-null value of signal_strength is only recorded when the operation is '设备状态'
+        self._df_device_log_standby = self._df_device_log[self._df_device_log['操作类型'] == '设备状态']
+
+        return self
@@ -0,0 +1,156 @@
+"""
+Class-ParsedLogStore (类-已解析日志仓库) 的实现
+
+在 “多设备处理” 页面中，解析 (read_excel) 压缩包中的日志是整个处理流程里最耗时的一步；
+而用户每切换一次使用时长的计算模式 (A/B/C)，页面都会重新处理同一个压缩包。
+
+该类以压缩包中的文件名为键，保存每个日志解析后的 DataFrame，使得同一个压缩包中的每个日志在整个会话中只需被解析一次。
+为了避免大型压缩包占满内存，仓库设有内存上限：超出上限时，最久未被使用的日志将被序列化 (pickle) 到临时目录中，
+需要时再从磁盘读回。
+
+# Latest update: 2026-10-18
+日志以紧凑的 DeviceLog（见 utils.device_log）而不是 DataFrame 的形式保存，每份日志所占的内存仅为原来的几分之一；
+读取时再还原为 DataFrame。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import pandas as pd
+import threading
+import tempfile
+import weakref
+import shutil
+import os
+
+from collections import OrderedDict
+
+from .device_log import DeviceLog
+
+
+# Default ceiling for the logs kept in memory (in bytes)
+# 默认的内存上限（字节）
+DEFAULT_MEMORY_LIMIT = 512 * 1024 ** 2
+
+
+class ParsedLogStore():
+    """
+    已解析日志的仓库：以文件名为键，在内存上限内保存日志，超出上限的部分溢出 (spill) 到磁盘。
+    """
+
+    def __init__(self, memory_limit=DEFAULT_MEMORY_LIMIT):
+
+        self._memory_limit = memory_limit
+        self._memory_usage = 0
+
+        # Least recently used first: name -> (device_log, number of bytes)
+        # 按最近使用的先后排列（最久未被使用的在前）
+        self._logs_in_memory = OrderedDict()
+        self._logs_on_disk = {}
+
+        self._spill_dir = None
+        self._finalizer = None
+
+        # Latest update: 2026-10-18
+        # The store may be used by a background analysis job while the page reruns
+        # 页面重跑期间，仓库可能正被后台的分析任务使用
+        self._lock = threading.RLock()
+
+    def __contains__(self, name):
+        with self._lock:
+            return name in self._logs_in_memory or name in self._logs_on_disk
+
+    def __len__(self):
+        with self._lock:
+            return len(self._logs_in_memory) + len(self._logs_on_disk)
+
+    @property
+    def memory_usage(self):
+        return self._memory_usage
+
+    # Latest update: 2026-10-18
+    def get(self, name):
+        """Return the parsed log stored under the name (as a DataFrame), or None if it has not been stored."""
+        with self._lock:
+            if name in self._logs_in_memory:
+                self._logs_in_memory.move_to_end(name)
+                device_log = self._logs_in_memory[name][0]
+
+            elif name in self._logs_on_disk:
+                device_log = pd.read_pickle(self._logs_on_disk[name])
+
+            else:
+                return None
+
+        return device_log.to_frame()
+
+    # Latest update: 2026-10-18
+    def put(self, name, df_log):
+        """Store only the analysed columns of the log, in their compact form (see DeviceLog)."""
+        device_log = DeviceLog.from_frame(df_log)
+        n_bytes = device_log.nbytes
+
+        with self._lock:
+            self._discard(name)
+
+            self._logs_in_memory[name] = (device_log, n_bytes)
+            self._memory_usage += n_bytes
+
+            self._spill_if_needed()
+
+    # Latest update: 2026-10-18
+    def get_or_parse(self, name, parse):
+        """
+        若仓库中已有该日志，则直接返回；否则调用 parse() 解析日志，存入仓库后再返回。
+        无论哪种情况，返回的都是由仓库中的紧凑日志还原的 DataFrame，其列与数据类型总是相同的。
+        """
+        df_log = self.get(name)
+
+        if df_log is None:
+            self.put(name, parse())
+            df_log = self.get(name)
+
+        return df_log
+
+    def clear(self):
+        with self._lock:
+            self._logs_in_memory.clear()
+            self._logs_on_disk.clear()
+            self._memory_usage = 0
+
+            if self._finalizer is not None:
+                self._finalizer()
+                self._spill_dir = None
+                self._finalizer = None
+
+    def _discard(self, name):
+        if name in self._logs_in_memory:
+            self._memory_usage -= self._logs_in_memory.pop(name)[1]
+
+        if name in self._logs_on_disk:
+            os.remove(self._logs_on_disk.pop(name))
+
+    def _spill_if_needed(self):
+        # Spill the least recently used logs until the ones left in memory fit under the ceiling
+        # 将最久未被使用的日志逐个写入磁盘，直到内存中剩余的日志不超过上限
+        while self._memory_usage > self._memory_limit and self._logs_in_memory:
+            name, (device_log, n_bytes) = self._logs_in_memory.popitem(last=False)
+
+            file_descriptor, path = tempfile.mkstemp(suffix='.pkl', dir=self._get_spill_dir())
+            os.close(file_descriptor)
+            pd.to_pickle(device_log, path)
+
+            self._logs_on_disk[name] = path
+            self._memory_usage -= n_bytes
+
+    def _get_spill_dir(self):
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix='parsed_logs_')
+
+            # Remove the spilled files once the store is garbage collected (or the interpreter exits)
+            # 当仓库被回收（或解释器退出）时，删除溢出到磁盘的文件
+            self._finalizer = weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+
+        return self._spill_dir
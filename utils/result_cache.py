@@ -0,0 +1,194 @@
+"""
+Class-ResultCache (类-分析结果缓存) 的实现
+
+“多设备处理” 页面的分析结果原本只保存在各自会话的 st.session_state 中：两位同事上传同一份周报压缩包，
+或同一位用户重新打开标签页，都会从头计算一遍。
+
+该类是一个进程级（所有会话共享）的缓存，以 (压缩包内容的哈希值, 计算模式, 分析器版本) 为键，
+保存统计表（翻译后用于展示的统计表，以及翻译前的逐设备统计结果）。缓存设有内存上限，超出上限时按最近最少使用 (LRU) 的顺序淘汰；
+并且对相同的键只计算一次 (single-flight)：并发的相同请求会等待正在进行的那一次计算，而不是各自重复计算。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import pandas as pd
+import threading
+import hashlib
+
+from collections import OrderedDict
+
+from .stage_timer import StageTimer
+
+
+# Bump the version whenever the analysis pipeline changes its output, so that stale results are never hit
+# 每当数据分析管道的输出发生变化时，须更新该版本号，以免命中过时的结果
+ANALYSER_VERSION = '1'
+
+# Default ceiling for the results kept in memory (in bytes)
+# 默认的内存上限（字节）
+DEFAULT_MEMORY_LIMIT = 256 * 1024 ** 2
+
+
+class _Flight():
+    """A computation in progress, shared by all requests for the same key."""
+
+    def __init__(self):
+
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class ResultCache():
+    """
+    进程级的分析结果缓存：LRU 淘汰，且相同的键只计算一次。
+    缓存的结果被所有会话共享，调用方不应修改它们。
+    """
+
+    def __init__(self, memory_limit=DEFAULT_MEMORY_LIMIT):
+
+        self._memory_limit = memory_limit
+        self._memory_usage = 0
+
+        # Least recently used first: key -> (result, number of bytes)
+        # 按最近使用的先后排列（最久未被使用的在前）
+        self._results = OrderedDict()
+        self._flights = {}
+
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_of(zip_data, pattern_choice):
+        return (hashlib.sha256(zip_data).hexdigest(), pattern_choice, ANALYSER_VERSION)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._results
+
+    def __len__(self):
+        with self._lock:
+            return len(self._results)
+
+    @property
+    def memory_usage(self):
+        return self._memory_usage
+
+    def get(self, key):
+        """Return the cached result for the key, or None on a cache miss."""
+        with self._lock:
+            if key not in self._results:
+                return None
+
+            self._results.move_to_end(key)
+            return self._results[key][0]
+
+    def put(self, key, result):
+        n_bytes = _size_of(result)
+
+        with self._lock:
+            self._discard(key)
+
+            # A result larger than the whole cache is not kept
+            # 比整个缓存还大的结果不予保存
+            if n_bytes > self._memory_limit:
+                return
+
+            self._results[key] = (result, n_bytes)
+            self._memory_usage += n_bytes
+
+            while self._memory_usage > self._memory_limit:
+                _, (_, n_bytes_evicted) = self._results.popitem(last=False)
+                self._memory_usage -= n_bytes_evicted
+
+    def get_or_compute(self, key, compute, on_wait=None):
+        """
+        返回键所对应的结果：命中缓存时直接返回；若相同的键正在被（其他会话）计算，则等待其完成并返回其结果；
+        否则调用 compute() 计算并写入缓存。
+
+        Args:
+            key: 缓存的键（见 key_of）
+            compute: 无参数的可调用对象，返回待缓存的结果
+            on_wait: (可选) 无参数的可调用对象，在等待其他会话的计算之前被调用（例如用于提示用户）
+        """
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key][0]
+
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._flights[key] = _Flight()
+
+        if not is_leader:
+            if on_wait is not None:
+                on_wait()
+
+            flight.done.wait()
+
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = compute()
+            self.put(key, flight.result)
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+        return flight.result
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self._memory_usage = 0
+
+    def _discard(self, key):
+        if key in self._results:
+            _, n_bytes = self._results.pop(key)
+            self._memory_usage -= n_bytes
+
+
+# Latest update: 2026-10-18
+def _size_of(result):
+    """Approximate memory footprint of a result (a DataFrame, or a dict of DataFrames and stage timers)."""
+    if isinstance(result, dict):
+        return sum(_size_of(value) for value in result.values())
+
+    # A stage timer holds one record per device and stage, which can outgrow the statistics themselves
+    # 阶段计时器为每台设备的每个阶段保存一条记录，其大小可能超过统计表本身
+    if isinstance(result, StageTimer):
+        return _size_of(result.to_frame())
+
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(deep=True).sum())
+
+    if isinstance(result, pd.Series):
+        return int(result.memory_usage(deep=True))
+
+    return 0
+
+
+_default_result_cache = None
+_default_result_cache_lock = threading.Lock()
+
+
+def get_default_result_cache():
+    """The cache shared by all sessions of the app process."""
+    global _default_result_cache
+
+    # Sessions run in their own threads; they must all end up with the same cache
+    # 各会话运行于各自的线程中，须确保它们得到的是同一个缓存
+    with _default_result_cache_lock:
+        if _default_result_cache is None:
+            _default_result_cache = ResultCache()
+
+    return _default_result_cache
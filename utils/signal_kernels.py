@@ -0,0 +1,84 @@
+"""
+信号强度相关的向量化计算内核
+
+DataAnalyser（逐设备）与 BatchDataAnalyser（批量）共用这里的实现，以保证两者的统计口径一致。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import numpy as np
+
+
+SIGNAL_SWITCH_COLUMNS = [
+    'times_signal_switch_strong_mid',
+    'times_signal_switch_strong_weak',
+    'times_signal_switch_strong_null',
+    'times_signal_switch_mid_weak',
+    'times_signal_switch_mid_null',
+    'times_signal_switch_weak_null',
+]
+
+# Position in SIGNAL_SWITCH_COLUMNS for each (category, category) pair, -1 if no switch happens
+# 任意两个信号类别（null/weak/mid/strong = 0/1/2/3）之间的切换所对应的统计列位置，-1 表示未切换
+_SWITCH_LOOKUP = np.array([
+    #  null weak mid strong
+    [-1,  5,  4,  2],   # null
+    [ 5, -1,  3,  1],   # weak
+    [ 4,  3, -1,  0],   # mid
+    [ 2,  1,  0, -1],   # strong
+], dtype=np.int8)
+
+
+def categorize_signal_for_switch(signal_values):
+    """
+    将信号强度值一次性地划分为四个类别（编码）：
+    0 < v < 1.5 为 null (0)，1.5 <= v < 11.5 为 weak (1)，11.5 <= v < 21.5 为 mid (2)，其余（含空值）为 strong (3)
+
+    该口径沿用了 get_signal_switch_frequency 最初的逐值分类函数。
+    """
+    signal_values = np.asarray(signal_values, dtype=np.float64)
+
+    categories = np.full(len(signal_values), 3, dtype=np.int8)
+    categories[(signal_values >= 11.5) & (signal_values < 21.5)] = 2
+    categories[(signal_values >= 1.5) & (signal_values < 11.5)] = 1
+    categories[(signal_values > 0) & (signal_values < 1.5)] = 0
+
+    return categories
+
+
+def count_signal_switches(signal_values, window_len=2, segment_ids=None, n_segments=1):
+    """
+    统计信号强度在不同类别之间的切换次数：比较每个信号值与其后第 (window_len - 1) 个信号值的类别，
+    若二者不同，则计入对应的切换类型；全部六种切换类型的计数由一次 bincount 得到。
+
+    Args:
+        signal_values: 按时间顺序排列的信号强度值
+        window_len: 比较窗口的长度，window_len=2 即比较相邻的两个信号值
+        segment_ids: (可选) 每个信号值所属的分段（例如索引表的行），须单调不减；切换只在同一分段内统计
+        n_segments: 分段的个数
+
+    Returns:
+        np.ndarray: 形状为 (n_segments, 6) 的计数矩阵，列的顺序与 SIGNAL_SWITCH_COLUMNS 一致
+    """
+    lag = window_len - 1
+    categories = categorize_signal_for_switch(signal_values)
+
+    if lag < 1 or len(categories) <= lag:
+        return np.zeros((n_segments, len(SIGNAL_SWITCH_COLUMNS)), dtype=np.int64)
+
+    switch_columns = _SWITCH_LOOKUP[categories[:-lag], categories[lag:]]
+    is_switch = switch_columns >= 0
+
+    if segment_ids is None:
+        flat_ids = switch_columns[is_switch].astype(np.int64)
+    else:
+        segment_ids = np.asarray(segment_ids, dtype=np.int64)
+        is_switch &= segment_ids[:-lag] == segment_ids[lag:]
+        flat_ids = segment_ids[:-lag][is_switch] * len(SIGNAL_SWITCH_COLUMNS) + switch_columns[is_switch]
+
+    counts = np.bincount(flat_ids, minlength=n_segments * len(SIGNAL_SWITCH_COLUMNS))
+
+    return counts.reshape(n_segments, len(SIGNAL_SWITCH_COLUMNS))
@@ -0,0 +1,120 @@
+"""
+Class-StatisticsAccumulator (类-统计量累加器) 的实现
+
+DataAnalyser 的每一个 get_* 方法都会把统计结果写入 “基于日志的参数统计表” (df_data_analysis)；
+若每次都通过 .loc 逐个单元格地写入，则每次写入都伴随着标签对齐，甚至可能引起列的数据类型被向上转换。
+
+该类为每一个统计列预先分配一个类型确定的 NumPy 数组（按统计表的行位置索引），
+所有的写入都只发生在这些数组上，直到需要时才一次性地物化 (materialize) 回统计表。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import numpy as np
+
+
+# Latest update: 2026-10-18
+# Statistics columns of the index table (see 'index_a_dfda_log') and the dtypes of their arrays; the counters are int32
+# 统计表（见 index_a_dfda_log）中的统计列，及其对应数组的数据类型；计数列均为 int32
+STATISTICS_DTYPES = {
+    'days_len': np.int32,
+    'months_len': np.int32,
+
+    'times_of_standby': np.int32,
+    'times_of_irrigation_start': np.int32,
+    'times_of_irrigation_close': np.int32,
+    'times_of_uptime': np.int32,
+    'times_of_downtime': np.int32,
+
+    'times_of_strong_signal': np.int32,
+    'times_of_mid_signal': np.int32,
+    'times_of_weak_signal': np.int32,
+    'times_of_null_signal': np.int32,
+    'average_signal': np.float64,
+    'min_signal': np.float64,
+    'max_signal': np.float64,
+
+    'times_signal_switch_strong_mid': np.int32,
+    'times_signal_switch_strong_weak': np.int32,
+    'times_signal_switch_strong_null': np.int32,
+    'times_signal_switch_mid_weak': np.int32,
+    'times_signal_switch_mid_null': np.int32,
+    'times_signal_switch_weak_null': np.int32,
+}
+
+
+def _as_typed_array(values, column, dtype):
+    """
+    统计列的初始值 -> 类型确定的数组。
+    不是由 index_a_dfda_log 构建的统计表中，计数列可能含有空值 (NaN)：空值视为尚未计数 (0)，
+    而无法转换为数值的值则以明确的错误信息拒绝。
+    """
+    if np.issubdtype(dtype, np.integer):
+        values = values.fillna(0)
+
+    try:
+        return values.to_numpy(dtype=dtype, copy=True)
+    except (TypeError, ValueError) as error:
+        raise ValueError(
+            f"统计表的 '{column}' 列无法转换为 {np.dtype(dtype).name}：{error}。"
+            f"请使用 index_a_dfda_log 构建统计表，或确保该列只含有数值。"
+        ) from error
+
+
+class StatisticsAccumulator():
+    """
+    统计量累加器：为统计表中的每一个统计列持有一个预分配的数组，
+    写入按行位置 (positions) 进行，并在 materialize 时一次性地写回统计表。
+    """
+
+    # Latest update: 2026-10-18
+    def __init__(self, df_data_analysis, dtypes=STATISTICS_DTYPES):
+
+        self.frame = df_data_analysis
+
+        # Start from the current values of the table, so that rows never written keep their initial values
+        # 以统计表的当前值作为初始值，未被写入的行将保持其初始值
+        self._arrays = {
+            column: _as_typed_array(df_data_analysis[column], column, dtype)
+            for column, dtype in dtypes.items()
+            if column in df_data_analysis.columns
+        }
+        self._is_dirty = False
+
+    def positions_of(self, index=None, mask=None):
+        """Translate an index label (or a boolean mask) of the table to row positions."""
+        if mask is not None:
+            return np.flatnonzero(np.asarray(mask))
+
+        return np.flatnonzero(self.frame.index == index)
+
+    def tracks(self, column):
+        return column in self._arrays
+
+    def get(self, positions, column):
+        return self._arrays[column][positions]
+
+    def set(self, positions, column, value):
+        self._arrays[column][positions] = value
+        self._is_dirty = True
+
+    def add(self, positions, column, value):
+        self._arrays[column][positions] += value
+        self._is_dirty = True
+
+    def set_column(self, column, values):
+        self._arrays[column][:] = values
+        self._is_dirty = True
+
+    def materialize(self):
+        """Write every statistics column back to the table at once (only if anything has changed)."""
+        if self._is_dirty:
+            for column, values in self._arrays.items():
+                self.frame[column] = values.copy()
+
+            self._is_dirty = False
+
+        return self.frame
@@ -0,0 +1,439 @@
+"""
+Class-StreamingDataAnalyser (类-流式数据分析) 的实现
+
+DataAnalyser 与 BatchDataAnalyser 都假定整份日志已经以 DataFrame 的形式存在于内存中；
+对于持续运行数年的控制器，其日志可能长到不宜一次性载入内存。
+
+流式模式以固定行数的分块 (chunk) 逐块消费日志，每个分块只被归约为一份可合并的 “部分聚合” (StreamingAggregate)：
+按日期统计的操作类型次数、信号强度区间次数、信号强度的和/个数/最小值/最大值，以及信号切换的计数；
+分块之间的信号切换则通过保留每份聚合首尾的信号类别来衔接。由于使用周期只是若干个连续日期的区间，
+按日期聚合后即可在最后一步得到与内存模式（DataAnalyser 的管道）相同的统计表，而峰值内存只取决于分块的大小。
+
+注意：信号切换的衔接依赖于导出日志的倒序排列（“设备状态” 记录按创建时间单调不增），否则将拒绝统计。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import numpy as np
+import pandas as pd
+
+from .batch_analyser import OPERATION_COLUMNS, SIGNAL_STRENGTH_COLUMNS, NS_PER_DAY, _to_day_numbers
+from .signal_kernels import SIGNAL_SWITCH_COLUMNS, _SWITCH_LOOKUP, categorize_signal_for_switch
+from .statistics_accumulator import StatisticsAccumulator
+from .log_reader import ID_COLUMNS
+
+
+class StreamingAggregate():
+    """
+    一段连续日志（按文件中的顺序）的部分聚合；相邻的两段日志的聚合可以合并 (merge) 为一份。
+
+    所有的统计量都按日期（自 1970-01-01 起的天数）记录，信号切换则按 (前一条记录的日期, 后一条记录的日期) 记录，
+    从而可以在之后按任意的使用周期（日期区间）求和。
+    """
+
+    def __init__(self, window_len=2):
+
+        self.window_len = window_len
+        self.n_rows = 0
+
+        # Statistics per day, aligned with 'days'
+        # 按日期统计的量，与 days 一一对应
+        self.days = np.empty(0, dtype=np.int64)
+        self.operation_counts = np.zeros((0, len(OPERATION_COLUMNS)), dtype=np.int64)
+        self.standby_counts = np.zeros(0, dtype=np.int64)
+        self.signal_bucket_counts = np.zeros((0, len(SIGNAL_STRENGTH_COLUMNS)), dtype=np.int64)
+        self.signal_sum = np.zeros(0, dtype=np.float64)
+        self.signal_count = np.zeros(0, dtype=np.int64)
+        self.signal_min = np.zeros(0, dtype=np.float64)
+        self.signal_max = np.zeros(0, dtype=np.float64)
+
+        # Signal switches per (day of the former record, day of the latter record)
+        # 信号切换的计数，按 (前一条记录的日期, 后一条记录的日期) 记录
+        self.switch_days = np.empty((0, 2), dtype=np.int64)
+        self.switch_counts = np.zeros((0, len(SIGNAL_SWITCH_COLUMNS)), dtype=np.int64)
+
+        # The first and the last (window_len - 1) standby records, to connect switches across pieces
+        # 首尾各 (window_len - 1) 条待机记录的日期与信号类别，用于衔接相邻两段日志之间的信号切换
+        self.head_days = np.empty(0, dtype=np.int64)
+        self.head_categories = np.empty(0, dtype=np.int8)
+        self.tail_days = np.empty(0, dtype=np.int64)
+        self.tail_categories = np.empty(0, dtype=np.int8)
+
+        # Creation time of the first and the last standby records, and whether they are in descending order
+        # 首尾两条待机记录的创建时间，以及待机记录是否按创建时间单调不增
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.is_descending = True
+
+        # Creation time of the latest record (of any operation type), and the number of records at that time
+        # 最新一条记录（任意操作类型）的创建时间，以及创建时间与之相同的记录数
+        self.latest_timestamp = None
+        self.n_latest_rows = 0
+
+        # The first non-null value of each identification column
+        # 各标识列的第一个非空值
+        self.id_values = {}
+
+    @classmethod
+    def from_chunk(cls, df_chunk, window_len=2):
+        """Reduce a chunk of the log (in file order) to a partial aggregate."""
+        aggregate = cls(window_len=window_len)
+        aggregate.n_rows = len(df_chunk)
+
+        for column in ID_COLUMNS:
+            if column in df_chunk.columns:
+                values = df_chunk[column].dropna()
+                if len(values) > 0:
+                    aggregate.id_values[column] = values.iloc[0]
+
+        timestamps = pd.to_datetime(df_chunk['创建时间']).to_numpy(dtype='datetime64[ns]')
+        is_valid = ~np.isnat(timestamps)
+
+        timestamps = timestamps[is_valid].view('int64')
+        if len(timestamps) > 0:
+            aggregate.latest_timestamp = int(timestamps.max())
+            aggregate.n_latest_rows = int(np.count_nonzero(timestamps == aggregate.latest_timestamp))
+
+        operations = df_chunk['操作类型'].to_numpy()[is_valid]
+        signals = df_chunk['信号'].to_numpy(dtype=np.float64)[is_valid]
+
+        days, day_ids = np.unique(np.floor_divide(timestamps, NS_PER_DAY), return_inverse=True)
+        n_days = len(days)
+        aggregate.days = days
+
+        # Operation types
+        # 操作类型
+        operation_types = list(OPERATION_COLUMNS.keys())
+        codes = pd.Categorical(operations, categories=operation_types).codes
+        is_known = codes >= 0
+        aggregate.operation_counts = np.bincount(
+            day_ids[is_known] * len(operation_types) + codes[is_known],
+            minlength=n_days * len(operation_types)
+        ).reshape(n_days, len(operation_types))
+
+        # Signal strength of the standby records (same buckets as get_signal_strength_frequency)
+        # 待机记录的信号强度（区间划分与 get_signal_strength_frequency 一致）
+        is_standby = operations == '设备状态'
+        standby_day_ids = day_ids[is_standby]
+        standby_signals = signals[is_standby]
+        aggregate.standby_counts = np.bincount(standby_day_ids, minlength=n_days)
+
+        is_numeric = ~np.isnan(standby_signals)
+        numeric_day_ids = standby_day_ids[is_numeric]
+        numeric_signals = standby_signals[is_numeric]
+
+        buckets = 3 - np.searchsorted(np.array([1.5, 11.5, 21.5]), numeric_signals, side='right')
+        aggregate.signal_bucket_counts = np.bincount(
+            numeric_day_ids * 4 + buckets, minlength=n_days * 4
+        ).reshape(n_days, 4)
+
+        aggregate.signal_sum = np.bincount(numeric_day_ids, weights=numeric_signals, minlength=n_days)
+        aggregate.signal_count = np.bincount(numeric_day_ids, minlength=n_days)
+        aggregate.signal_min = np.full(n_days, np.inf)
+        aggregate.signal_max = np.full(n_days, -np.inf)
+        np.minimum.at(aggregate.signal_min, numeric_day_ids, numeric_signals)
+        np.maximum.at(aggregate.signal_max, numeric_day_ids, numeric_signals)
+
+        # Signal switches within the chunk, and the records kept to connect it with its neighbours
+        # 分块内部的信号切换，以及用于与相邻分块衔接的首尾记录
+        standby_days = days[standby_day_ids]
+        standby_categories = categorize_signal_for_switch(standby_signals)
+        aggregate.switch_days, aggregate.switch_counts = aggregate._count_switches(
+            standby_days, standby_categories, n_former=len(standby_days)
+        )
+
+        lag = aggregate._lag
+        aggregate.head_days, aggregate.head_categories = standby_days[:lag], standby_categories[:lag]
+        aggregate.tail_days = standby_days[max(len(standby_days) - lag, 0):]
+        aggregate.tail_categories = standby_categories[max(len(standby_categories) - lag, 0):]
+
+        standby_timestamps = timestamps[is_standby]
+        if len(standby_timestamps) > 0:
+            aggregate.first_timestamp = int(standby_timestamps[0])
+            aggregate.last_timestamp = int(standby_timestamps[-1])
+            aggregate.is_descending = bool(np.all(np.diff(standby_timestamps) <= 0))
+
+        return aggregate
+
+    @property
+    def _lag(self):
+        return max(self.window_len - 1, 0)
+
+    def merge(self, other):
+        """
+        合并两份部分聚合：self 所对应的日志段须紧接在 other 所对应的日志段之前（按文件中的顺序）。
+        """
+        merged = StreamingAggregate(window_len=self.window_len)
+        merged.n_rows = self.n_rows + other.n_rows
+        merged.id_values = {**other.id_values, **self.id_values}
+
+        # Statistics per day
+        # 按日期统计的量
+        merged.days = np.union1d(self.days, other.days)
+        n_days = len(merged.days)
+        positions_self = np.searchsorted(merged.days, self.days)
+        positions_other = np.searchsorted(merged.days, other.days)
+
+        for name, initial, combine in [
+            ('operation_counts', 0, np.add),
+            ('standby_counts', 0, np.add),
+            ('signal_bucket_counts', 0, np.add),
+            ('signal_sum', 0.0, np.add),
+            ('signal_count', 0, np.add),
+            ('signal_min', np.inf, np.minimum),
+            ('signal_max', -np.inf, np.maximum),
+        ]:
+            values_self, values_other = getattr(self, name), getattr(other, name)
+            values = np.full((n_days,) + values_self.shape[1:], initial, dtype=values_self.dtype)
+            combine.at(values, positions_self, values_self)
+            combine.at(values, positions_other, values_other)
+            setattr(merged, name, values)
+
+        # Signal switches: those within each piece, plus those across the boundary of the two pieces
+        # 信号切换：两段日志各自内部的切换，加上跨越两段日志边界的切换
+        boundary_days = np.concatenate((self.tail_days, other.head_days))
+        boundary_categories = np.concatenate((self.tail_categories, other.head_categories))
+        boundary_switch_days, boundary_switch_counts = self._count_switches(
+            boundary_days, boundary_categories, n_former=len(self.tail_days)
+        )
+
+        merged.switch_days, merged.switch_counts = _sum_by_day_pairs(
+            np.concatenate((self.switch_days, other.switch_days, boundary_switch_days)),
+            np.concatenate((self.switch_counts, other.switch_counts, boundary_switch_counts)),
+        )
+
+        lag = self._lag
+        merged.head_days = np.concatenate((self.head_days, other.head_days))[:lag]
+        merged.head_categories = np.concatenate((self.head_categories, other.head_categories))[:lag]
+        tail_days = np.concatenate((self.tail_days, other.tail_days))
+        tail_categories = np.concatenate((self.tail_categories, other.tail_categories))
+        merged.tail_days = tail_days[max(len(tail_days) - lag, 0):]
+        merged.tail_categories = tail_categories[max(len(tail_categories) - lag, 0):]
+
+        # Creation time of the standby records
+        # 待机记录的创建时间
+        merged.first_timestamp = self.first_timestamp if self.first_timestamp is not None else other.first_timestamp
+        merged.last_timestamp = other.last_timestamp if other.last_timestamp is not None else self.last_timestamp
+        merged.is_descending = self.is_descending and other.is_descending
+        if self.last_timestamp is not None and other.first_timestamp is not None:
+            merged.is_descending &= self.last_timestamp >= other.first_timestamp
+
+        latest_timestamps = [t for t in (self.latest_timestamp, other.latest_timestamp) if t is not None]
+        merged.latest_timestamp = max(latest_timestamps) if latest_timestamps else None
+        merged.n_latest_rows = sum(
+            piece.n_latest_rows for piece in (self, other) if piece.latest_timestamp == merged.latest_timestamp
+        )
+
+        return merged
+
+    def to_dict(self):
+        """Serialize the aggregate to a JSON-compatible dict (see 'from_dict')."""
+        state = {
+            name: getattr(self, name).tolist() for name in _ARRAY_FIELDS
+        }
+        state.update({
+            name: getattr(self, name) for name in _SCALAR_FIELDS
+        })
+        state['id_values'] = {
+            column: value.item() if isinstance(value, np.generic) else value
+            for column, value in self.id_values.items()
+        }
+
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+
+        aggregate = cls(window_len=state['window_len'])
+
+        for name, (dtype, shape_tail) in _ARRAY_FIELDS.items():
+            setattr(aggregate, name, np.array(state[name], dtype=dtype).reshape((-1,) + shape_tail))
+        for name in _SCALAR_FIELDS:
+            setattr(aggregate, name, state[name])
+        aggregate.id_values = dict(state['id_values'])
+
+        return aggregate
+
+    def digest_log(self):
+        """
+        以每个日期一条记录的形式概括该日志：包含标识列与 '创建时间'，
+        可直接用于 index_a_dfda_log 与 define_uptime_and_downtime（二者只依赖于这些列）。
+        """
+        df_digest = pd.DataFrame({
+            '创建时间': pd.to_datetime(self.days[::-1] * NS_PER_DAY)
+        })
+
+        for column, value in self.id_values.items():
+            df_digest[column] = value
+
+        return df_digest
+
+    def _count_switches(self, record_days, categories, n_former):
+        """
+        统计一串（按文件顺序的）待机记录中，每条记录与其后第 lag 条记录之间的信号切换；
+        只统计前一条记录位于前 n_former 条之内的切换，并按 (前一条记录的日期, 后一条记录的日期) 汇总。
+        """
+        lag = self._lag
+        n_pairs = min(n_former, len(categories) - lag)
+
+        if lag < 1 or n_pairs <= 0:
+            return np.empty((0, 2), dtype=np.int64), np.zeros((0, len(SIGNAL_SWITCH_COLUMNS)), dtype=np.int64)
+
+        switch_columns = _SWITCH_LOOKUP[categories[:n_pairs], categories[lag:lag + n_pairs]]
+        is_switch = switch_columns >= 0
+
+        day_pairs = np.column_stack((record_days[:n_pairs], record_days[lag:lag + n_pairs]))[is_switch]
+        counts = np.zeros((len(day_pairs), len(SIGNAL_SWITCH_COLUMNS)), dtype=np.int64)
+        counts[np.arange(len(day_pairs)), switch_columns[is_switch]] = 1
+
+        return _sum_by_day_pairs(day_pairs, counts)
+
+
+# Fields of StreamingAggregate to be serialized: arrays (with their dtypes and trailing shapes), and scalars
+# StreamingAggregate 中需要序列化的字段：数组（及其数据类型与除第一维外的形状），以及标量
+_ARRAY_FIELDS = {
+    'days': (np.int64, ()),
+    'operation_counts': (np.int64, (len(OPERATION_COLUMNS),)),
+    'standby_counts': (np.int64, ()),
+    'signal_bucket_counts': (np.int64, (len(SIGNAL_STRENGTH_COLUMNS),)),
+    'signal_sum': (np.float64, ()),
+    'signal_count': (np.int64, ()),
+    'signal_min': (np.float64, ()),
+    'signal_max': (np.float64, ()),
+    'switch_days': (np.int64, (2,)),
+    'switch_counts': (np.int64, (len(SIGNAL_SWITCH_COLUMNS),)),
+    'head_days': (np.int64, ()),
+    'head_categories': (np.int8, ()),
+    'tail_days': (np.int64, ()),
+    'tail_categories': (np.int8, ()),
+}
+_SCALAR_FIELDS = ['window_len', 'n_rows', 'first_timestamp', 'last_timestamp', 'is_descending', 'latest_timestamp', 'n_latest_rows']
+
+
+def _sum_by_day_pairs(day_pairs, counts):
+
+    if len(day_pairs) == 0:
+        return day_pairs.reshape(0, 2).astype(np.int64), counts.reshape(0, len(SIGNAL_SWITCH_COLUMNS))
+
+    unique_pairs, inverse = np.unique(day_pairs, axis=0, return_inverse=True)
+    summed = np.zeros((len(unique_pairs), counts.shape[1]), dtype=np.int64)
+    np.add.at(summed, inverse.reshape(-1), counts)
+
+    return unique_pairs, summed
+
+
+def aggregate_log_chunks(chunks, window_len=2):
+    """
+    将按文件顺序产出的日志分块逐块归约并合并为一份聚合；任一时刻只有一个分块存在于内存中。
+
+    Args:
+        chunks: 日志分块的可迭代对象（例如 iter_device_log_chunks 的返回值）
+        window_len: 信号切换的比较窗口长度，与 DataAnalyser.get_signal_switch_frequency 一致
+    """
+    aggregate = StreamingAggregate(window_len=window_len)
+
+    for df_chunk in chunks:
+        aggregate = aggregate.merge(StreamingAggregate.from_chunk(df_chunk, window_len=window_len))
+
+    return aggregate
+
+
+class StreamingDataAnalyser():
+    """
+    StreamingDataAnalyser takes the same index table (df_data_analysis) as DataAnalyser,
+    but computes the statistics of every usage period from a StreamingAggregate of the log, instead of the log itself.
+
+    StreamingDataAnalyser 接受与 DataAnalyser 相同的索引表 (df_data_analysis)，
+    但从日志的流式聚合 (StreamingAggregate) 而非日志本身，得到每个使用周期的统计量。
+    """
+
+    def __init__(self, df_data_analysis):
+
+        self._df_data_analysis = df_data_analysis
+
+    def analyse(self, aggregate):
+
+        if not aggregate.is_descending:
+            raise ValueError(
+                "当前日志的 “设备状态” 记录未按创建时间倒序排列，无法以流式模式衔接信号切换的统计；"
+                "请改用内存模式（DataAnalyser）分析该日志。"
+            )
+
+        n_rows = len(self._df_data_analysis)
+        self._accumulator = StatisticsAccumulator(self._df_data_analysis)
+
+        # Usage period for each row of the index table (same rule as get_usage_period)
+        # 计算索引表每一行的使用周期（与 get_usage_period 的规则一致）
+        uptime_days = _to_day_numbers(self._df_data_analysis['uptime'])
+        downtime_days = _to_day_numbers(self._df_data_analysis['downtime'])
+
+        days_diff = downtime_days - uptime_days
+        days_len = np.where(days_diff == 0, 1, np.abs(days_diff))
+
+        results = {
+            'days_len': days_len,
+            'months_len': days_len // 30,
+        }
+
+        # Each usage period is a range of days: sum up the statistics of the days within it
+        # 每个使用周期都是一个日期区间：对区间内各日期的统计量求和
+        starts = np.searchsorted(aggregate.days, uptime_days, side='left')
+        stops = np.searchsorted(aggregate.days, downtime_days, side='right')
+
+        def sum_over_periods(values):
+            cumulative = np.concatenate((np.zeros((1,) + values.shape[1:], dtype=values.dtype), np.cumsum(values, axis=0)))
+            return cumulative[stops] - cumulative[starts]
+
+        operation_counts = sum_over_periods(aggregate.operation_counts)
+        for i, column in enumerate(OPERATION_COLUMNS.values()):
+            results[column] = operation_counts[:, i]
+
+        signal_bucket_counts = sum_over_periods(aggregate.signal_bucket_counts)
+        for i, column in enumerate(SIGNAL_STRENGTH_COLUMNS):
+            results[column] = signal_bucket_counts[:, i]
+
+        # Basic statistics are only updated for rows whose sub-log contains standby records
+        # 仅当子日志中存在 “设备状态” 记录时，才更新平均/最小/最大信号强度
+        num_standby = sum_over_periods(aggregate.standby_counts)
+        num_numeric = sum_over_periods(aggregate.signal_count)
+        signal_sum = sum_over_periods(aggregate.signal_sum)
+
+        average_signal = self._accumulator.get(slice(None), 'average_signal').copy()
+        min_signal = self._accumulator.get(slice(None), 'min_signal').copy()
+        max_signal = self._accumulator.get(slice(None), 'max_signal').copy()
+
+        for row in np.flatnonzero(num_standby > 0):
+            if num_numeric[row] > 0:
+                average_signal[row] = round(signal_sum[row] / num_numeric[row], 2)
+                min_signal[row] = aggregate.signal_min[starts[row]:stops[row]].min()
+                max_signal[row] = aggregate.signal_max[starts[row]:stops[row]].max()
+            else:
+                average_signal[row] = min_signal[row] = max_signal[row] = np.nan
+
+        results['average_signal'] = average_signal
+        results['min_signal'] = min_signal
+        results['max_signal'] = max_signal
+
+        # Signal switches whose both records fall within the usage period
+        # 前后两条记录均位于使用周期内的信号切换
+        switch_counts = np.zeros((n_rows, len(SIGNAL_SWITCH_COLUMNS)), dtype=np.int64)
+        for row in range(n_rows):
+            is_within = (
+                (aggregate.switch_days >= uptime_days[row]) & (aggregate.switch_days <= downtime_days[row])
+            ).all(axis=1)
+            switch_counts[row] = aggregate.switch_counts[is_within].sum(axis=0)
+
+        for i, column in enumerate(SIGNAL_SWITCH_COLUMNS):
+            results[column] = switch_counts[:, i]
+
+        # Write each statistics column once, instead of once per cell
+        # 每个统计列只写入一次，而非逐个单元格地写入
+        for column, values in results.items():
+            self._accumulator.set_column(column, values)
+
+        self._accumulator.materialize()
+
+        return self
@@ -0,0 +1,164 @@
+"""
+合成日志生成器：按真实导出日志的统计特征，生成任意规模（N 台设备 × M 条记录）的智能控制器日志
+
+测试与性能评估需要远大于样例压缩包的日志，而真实的导出日志既不能随仓库分发，规模也有限。
+该模块生成的日志与 read_device_log 的输出具有相同的列与数据类型，并按导出日志的习惯以时间降序排列；
+其统计特征依据 data/external 下 211 个真实日志（约 76 万条记录）校准：
+    - 心跳（'设备状态'）约每小时一条（中位数 3725 秒），其余记录穿插其间；
+    - 操作类型的占比：设备状态 65%，设备上线/下线各 16.5%，开启/关闭灌溉各 1%；
+    - 短暂掉线后通常在数十秒内重新上线（中位数约 15 秒，长尾可达数十分钟）；
+    - 每台设备在其约 137 天的日志中平均出现约 1.9 次超过一天的中断（中位数 2.7 天，长尾可达数月）；
+    - 信号强度（只在 '设备状态' 记录中出现）取值 0 - 31，集中在 20 - 25，且相邻的心跳之间有较强的延续性。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import pandas as pd
+import numpy as np
+
+
+# Empirical distribution of the signal levels (0 - 31) of the standby records
+# 待机记录中信号强度 (0 - 31) 的经验分布
+SIGNAL_LEVEL_WEIGHTS = np.array([
+    0.0018, 0.0003, 0.0008, 0.0010, 0.0012, 0.0015, 0.0016, 0.0020,
+    0.0034, 0.0043, 0.0060, 0.0068, 0.0095, 0.0132, 0.0166, 0.0224,
+    0.0266, 0.0362, 0.0444, 0.0591, 0.0884, 0.1027, 0.1123, 0.1165,
+    0.1047, 0.0801, 0.0531, 0.0367, 0.0232, 0.0123, 0.0037, 0.0076,
+])
+
+# Probability that a heartbeat repeats the signal level of the previous one
+# 心跳沿用上一次信号强度的概率
+SIGNAL_PERSISTENCE = 0.7
+
+HEARTBEAT_SECONDS = 3725
+HEARTBEAT_JITTER_SECONDS = 250
+
+# Per heartbeat: probability of a brief reconnection (设备下线 + 设备上线), and of an irrigation (开启灌溉 + 关闭灌溉)
+# 每次心跳之后：发生一次短暂掉线重连的概率，以及发生一次灌溉的概率
+RECONNECTION_RATE = 0.254
+IRRIGATION_RATE = 0.0154
+
+# Median (in seconds) and log-normal spread of the time to reconnect
+RECONNECTION_MEDIAN_SECONDS = 15
+RECONNECTION_SIGMA = 2.0
+
+# Outages of more than a day: expected number per day of log, median length (in days) and log-normal spread
+# 超过一天的中断：每一天日志的期望次数，中断时长的中位数（天）与对数正态分布的离散程度
+OUTAGE_RATE_PER_DAY = 1.9 / 137
+OUTAGE_MEDIAN_DAYS = 2.7
+OUTAGE_SIGMA = 1.5
+
+# Number of records of a device in the real exports (median)
+# 真实导出日志中单台设备的记录数（中位数）
+DEFAULT_ROWS_PER_DEVICE = 3_600
+
+# Operation types, in the order of their codes below
+OPERATION_TYPES = ['设备状态', '设备下线', '设备上线', '开启灌溉', '关闭灌溉']
+_STANDBY, _OFFLINE, _ONLINE, _IRRIGATION_START, _IRRIGATION_CLOSE = range(len(OPERATION_TYPES))
+
+_EXPORT_TIME = pd.Timestamp('2025-05-07 13:30:00')
+
+_ID_ALPHABET = np.array(list('0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'))
+
+
+def generate_device_log(n_rows, seed=None, end_time=_EXPORT_TIME, heartbeat_seconds=HEARTBEAT_SECONDS):
+    """
+    生成一台设备的日志。
+
+    Args:
+        n_rows: 记录数
+        seed: 随机数种子（或 np.random.Generator）；相同的种子总是生成相同的日志
+        end_time: 日志中最后一条记录的时间（即日志的导出时间）
+        heartbeat_seconds: 心跳的平均间隔（秒）；默认为真实日志的间隔。
+            以真实的间隔，千万条记录将跨越数百年（超出 datetime64[ns] 的范围），此时须相应地压缩间隔
+
+    Returns:
+        pd.DataFrame: 列与数据类型同 read_device_log 的输出（'创建时间'，'imei'，'设备ID'，'信号'，'操作类型'），按时间降序排列
+    """
+    rng = np.random.default_rng(seed)
+
+    # Each slot holds one heartbeat, possibly followed by a reconnection and/or an irrigation;
+    # with a slot per row there are always enough records, the surplus (latest) ones are dropped below
+    # 每个时隙包含一次心跳，其后可能跟随一次掉线重连和/或一次灌溉；
+    # 时隙数与记录数相同，从而总能得到足够的记录，多余的（最晚的）记录将在下文被舍弃
+    n_slots = n_rows
+
+    jitter_seconds = heartbeat_seconds * HEARTBEAT_JITTER_SECONDS / HEARTBEAT_SECONDS
+    intervals = np.maximum(rng.normal(heartbeat_seconds, jitter_seconds, n_slots), 0.1 * heartbeat_seconds)
+
+    # Long outages: the device goes offline right after a heartbeat, and comes back just before the next one
+    # 长时间中断：设备在某次心跳之后随即下线，并在下一次心跳之前重新上线
+    is_outage = rng.random(n_slots) < OUTAGE_RATE_PER_DAY * heartbeat_seconds / 86_400
+    outage_seconds = OUTAGE_MEDIAN_DAYS * 86_400 * rng.lognormal(0.0, OUTAGE_SIGMA, n_slots)
+    intervals = np.where(is_outage, intervals + outage_seconds, intervals)
+
+    heartbeats = np.concatenate(([0.0], np.cumsum(intervals[:-1])))
+
+    is_reconnection = is_outage | (rng.random(n_slots) < RECONNECTION_RATE)
+    offline = heartbeats + rng.uniform(1.0, 0.4 * intervals)
+    reconnect_seconds = np.minimum(
+        RECONNECTION_MEDIAN_SECONDS * rng.lognormal(0.0, RECONNECTION_SIGMA, n_slots), 0.5 * intervals
+    )
+    online = np.where(is_outage, heartbeats + intervals - rng.uniform(1.0, 60.0, n_slots), offline + reconnect_seconds)
+
+    is_irrigation = rng.random(n_slots) < IRRIGATION_RATE
+    irrigation_start = heartbeats + rng.uniform(0.1, 0.3, n_slots) * intervals
+    irrigation_close = irrigation_start + rng.uniform(0.1, 0.3, n_slots) * intervals
+
+    seconds = np.concatenate((
+        heartbeats,
+        offline[is_reconnection], online[is_reconnection],
+        irrigation_start[is_irrigation], irrigation_close[is_irrigation],
+    ))
+    codes = np.concatenate((
+        np.full(n_slots, _STANDBY),
+        np.full(is_reconnection.sum(), _OFFLINE), np.full(is_reconnection.sum(), _ONLINE),
+        np.full(is_irrigation.sum(), _IRRIGATION_START), np.full(is_irrigation.sum(), _IRRIGATION_CLOSE),
+    ))
+
+    # Keep the earliest n_rows records, whole seconds as in the exports
+    # 保留最早的 n_rows 条记录，时间精确到秒（与导出日志一致）
+    order = np.argsort(seconds, kind='stable')[:n_rows]
+    seconds = np.floor(seconds[order]).astype(np.int64)
+    codes = codes[order]
+
+    # Signal levels persist from one heartbeat to the next
+    # 信号强度在相邻的心跳之间延续
+    is_standby = codes == _STANDBY
+    levels = rng.choice(len(SIGNAL_LEVEL_WEIGHTS), size=int(is_standby.sum()), p=SIGNAL_LEVEL_WEIGHTS / SIGNAL_LEVEL_WEIGHTS.sum())
+    keeps = rng.random(len(levels)) < SIGNAL_PERSISTENCE
+    keeps[:1] = False
+    levels = levels[np.maximum.accumulate(np.where(keeps, 0, np.arange(len(levels))))]
+
+    signals = np.full(len(codes), np.nan, dtype=np.float32)
+    signals[is_standby] = levels
+
+    seconds_before_export = (seconds[-1] - seconds) if len(seconds) else seconds
+    timestamps = np.datetime64(end_time, 's') - seconds_before_export.astype('timedelta64[s]')
+
+    df_log = pd.DataFrame({
+        '创建时间': timestamps.astype('datetime64[ns]'),
+        'imei': np.float64(rng.integers(860_000_000_000_000, 870_000_000_000_000)),
+        '设备ID': ''.join(rng.choice(_ID_ALPHABET, 20)),
+        '信号': signals,
+        '操作类型': pd.Categorical.from_codes(codes, categories=OPERATION_TYPES),
+    })
+
+    # The exports list the latest records first
+    # 导出日志中最近的记录排在最前
+    return df_log.iloc[::-1].reset_index(drop=True)
+
+
+def generate_fleet_logs(n_devices, n_rows_per_device=DEFAULT_ROWS_PER_DEVICE, seed=0):
+    """
+    生成 n_devices 台设备的日志，每台设备 n_rows_per_device 条记录；各设备的日志由同一个种子派生，互不相同。
+
+    Returns:
+        list[pd.DataFrame]: 各设备的日志（见 generate_device_log）
+    """
+    seeds = np.random.SeedSequence(seed).spawn(n_devices)
+
+    return [generate_device_log(n_rows_per_device, seed=np.random.default_rng(device_seed)) for device_seed in seeds]
@@ -0,0 +1,161 @@
+"""
+使用周期（连续使用的日期区间）的识别与定义
+
+设备的使用周期由其日志中出现过的日期决定：相邻两个日期相差一天即视为连续使用，否则视为一次中断（离线、更换电池等）。
+这里将所有（多设备的）日志的日期一次性地转换为天数，并以一次向量化的 diff/cumsum 找出每台设备的全部连续使用区间，
+再按计算模式 (pattern) 为索引表的每一行确定其上线日期 (uptime) 与下线日期 (downtime)；
+所有的行都在一次构造中得到，而不是在循环中逐行地 pd.concat。
+
+计算模式：
+    'single_file_multiple_periods': 每一个连续使用区间各占一行（最近的区间在前）
+    'multiple_files_single_period': 最早的上线日期至最晚的下线日期（并新增 “实际使用天数/月数” 两列）
+    'multiple_files_latest_period': 最近一次连续使用区间
+    'multiple_files_max_period': 最长一次连续使用区间（长度相同时取最近的一次）
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import numpy as np
+import pandas as pd
+
+from .batch_analyser import NS_PER_DAY
+
+
+PATTERNS = [
+    'single_file_multiple_periods',
+    'multiple_files_single_period',
+    'multiple_files_latest_period',
+    'multiple_files_max_period',
+]
+
+
+def find_continuous_periods(timestamps, device_keys=None):
+    """
+    找出每台设备的全部连续使用区间。
+
+    Args:
+        timestamps: 日志记录的创建时间（无效的时间将被忽略）
+        device_keys: (可选) 每条记录所属的设备键；默认所有记录属于同一台设备 (0)
+
+    Returns:
+        dict: 'device_key', 'uptime_day', 'downtime_day', 'length' 四个等长的数组（日期均为自 1970-01-01 起的天数）；
+        按设备键排序，同一台设备的区间按时间倒序排列（最近的区间在前）
+    """
+    timestamps = pd.to_datetime(pd.Series(timestamps)).to_numpy(dtype='datetime64[ns]')
+
+    if device_keys is None:
+        device_keys = np.zeros(len(timestamps), dtype=np.int64)
+    else:
+        device_keys = np.asarray(device_keys, dtype=np.int64)
+
+    is_valid = ~np.isnat(timestamps)
+    days = np.floor_divide(timestamps[is_valid].view('int64'), NS_PER_DAY)
+    keys = device_keys[is_valid]
+
+    # Unique (device, day) pairs, with the days of each device in descending order
+    # 去重后的 (设备, 日期) 对，每台设备的日期按倒序排列
+    order = np.lexsort((-days, keys))
+    keys, days = keys[order], days[order]
+
+    is_first = np.ones(len(days), dtype=bool)
+    is_first[1:] = (keys[1:] != keys[:-1]) | (days[1:] != days[:-1])
+    keys, days = keys[is_first], days[is_first]
+
+    # A new period starts at each device's latest day, and wherever the gap to the previous day is not one day
+    # 每台设备最晚的日期，以及与前一个日期相差不为一天的日期，都是一个新区间的开始
+    is_start = np.ones(len(days), dtype=bool)
+    is_start[1:] = (keys[1:] != keys[:-1]) | (days[:-1] - days[1:] != 1)
+
+    starts = np.flatnonzero(is_start)
+    ends = np.append(starts[1:], len(days)) - 1
+
+    return {
+        'device_key': keys[starts],
+        'uptime_day': days[ends],
+        'downtime_day': days[starts],
+        'length': ends - starts + 1,
+    }
+
+
+def define_usage_periods(dfda_log, timestamps, device_keys=None, pattern='single_file_multiple_periods'):
+    """
+    按计算模式，为索引表的每台设备定义上线日期与下线日期。
+
+    Args:
+        dfda_log: 索引表，第 i 行对应设备键为 i 的设备
+        timestamps: 所有（多设备的）日志记录的创建时间
+        device_keys: (可选) 每条记录所属的设备键；默认所有记录属于设备 0
+        pattern: 计算模式，见模块说明
+
+    Returns:
+        tuple: (更新后的索引表, 其每一行所对应的设备键)；
+        除 'single_file_multiple_periods' 外，每台设备仍只占一行
+    """
+    if pattern not in PATTERNS:
+        raise ValueError(f"未知的计算模式：'{pattern}'")
+
+    periods = find_continuous_periods(timestamps, device_keys)
+    n_devices = len(dfda_log)
+
+    period_keys = periods['device_key']
+    is_period_start = np.ones(len(period_keys), dtype=bool)
+    is_period_start[1:] = period_keys[1:] != period_keys[:-1]
+    group_starts = np.flatnonzero(is_period_start)
+
+    if len(period_keys) == 0:
+        selected_keys = uptime_days = downtime_days = np.empty(0, dtype=np.int64)
+
+    elif pattern == 'single_file_multiple_periods':
+        selected_keys = period_keys
+        uptime_days = periods['uptime_day']
+        downtime_days = periods['downtime_day']
+
+    elif pattern == 'multiple_files_single_period':
+        # The earliest uptime and the latest downtime of each device
+        # 每台设备最早的上线日期与最晚的下线日期
+        selected_keys = period_keys[group_starts]
+        uptime_days = np.minimum.reduceat(periods['uptime_day'], group_starts)
+        downtime_days = periods['downtime_day'][group_starts]
+
+    elif pattern == 'multiple_files_latest_period':
+        selected_keys = period_keys[group_starts]
+        uptime_days = periods['uptime_day'][group_starts]
+        downtime_days = periods['downtime_day'][group_starts]
+
+    elif pattern == 'multiple_files_max_period':
+        # The longest period of each device; on a tie, the latest one (i.e. the first one) wins
+        # 每台设备最长的区间；长度相同时取最近的一个（即排在前面的一个）
+        order = np.lexsort((np.arange(len(period_keys)), -periods['length'], period_keys))
+        is_first = np.ones(len(order), dtype=bool)
+        is_first[1:] = period_keys[order][1:] != period_keys[order][:-1]
+        chosen = order[is_first]
+
+        selected_keys = period_keys[chosen]
+        uptime_days = periods['uptime_day'][chosen]
+        downtime_days = periods['downtime_day'][chosen]
+
+    # Devices without any valid record keep a single row, with their uptime and downtime untouched
+    # 没有任何有效记录的设备仍保留一行，其上线与下线日期保持不变
+    missing_keys = np.setdiff1d(np.arange(n_devices), selected_keys)
+    row_keys = np.concatenate((selected_keys, missing_keys))
+    order = np.argsort(row_keys, kind='stable')
+    row_keys = row_keys[order]
+
+    n_selected = len(selected_keys)
+    is_selected = order < n_selected
+
+    dfda_log_updated = dfda_log.iloc[row_keys].reset_index(drop=True)
+
+    for column, days in [('uptime', uptime_days), ('downtime', downtime_days)]:
+        dates = dfda_log_updated[column].to_numpy(dtype=object, copy=True)
+        dates[is_selected] = pd.to_datetime(days[order[is_selected]] * NS_PER_DAY).date
+        dfda_log_updated[column] = dates
+
+    if pattern == 'multiple_files_single_period':
+        dfda_log_updated.insert(6, '实际使用天数', 0)
+        dfda_log_updated.insert(7, '实际使用月数', 0)
+
+    return dfda_log_updated, row_keys
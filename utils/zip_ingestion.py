@@ -0,0 +1,106 @@
+"""
+压缩包（日志）的流式读取
+
+“多设备处理” 页面原本用 zip_ref.open 逐个打开压缩包中以 '.xlsx' 结尾的文件，并在分析结束之前保留所有设备的原始日志：
+压缩包、解压后的文件与解析后的 DataFrame 会同时占用内存，峰值内存随整个压缩包的大小增长。
+
+该模块逐个读取压缩包中的日志成员 (member)：
+    - 读取之前先检查成员解压后的大小（zip 的中央目录中记录的 file_size），超出上限的成员将被拒绝；
+    - 解压后的内容写入 SpooledTemporaryFile：较小的成员保留在内存中，较大的成员则溢写到临时文件，而不是整个读入内存；
+    - 接受 '.xlsx'、'.csv'、'.parquet' 与 '.jsonl' 格式的日志，以及位于（多层）子目录中的日志；目录条目、macOS 的资源文件与 Excel 的锁文件将被忽略。
+
+配合按行数预算分批执行的数据分析管道（见 DataAnalyserBackendAgent.analyse_logs_in_zip），峰值内存只取决于单个最大的日志，而不是整个压缩包。
+"""
+
+# License: MIT
+
+# Latest Update: 2026/10/18
+
+
+import contextlib
+import tempfile
+import shutil
+
+
+LOG_SUFFIXES = ('.xlsx', '.csv', '.parquet', '.jsonl')
+
+# Members larger than this (uncompressed, in bytes) are spooled to a temporary file instead of being kept in memory
+# 解压后大于该值（字节）的成员将溢写到临时文件，而不是保留在内存中
+DEFAULT_SPOOL_SIZE = 32 * 1024 ** 2
+
+# Members larger than this (uncompressed, in bytes) are refused
+# 解压后大于该值（字节）的成员将被拒绝
+DEFAULT_MAX_MEMBER_SIZE = 2 * 1024 ** 3
+
+# Chunk size (in bytes) for copying a member out of the zip package
+_COPY_BUFFER_SIZE = 1024 ** 2
+
+
+class _SpooledLogMember(tempfile.SpooledTemporaryFile):
+    """A spooled copy of a member, named after the member (as zip_ref.open does), since the pipeline reports errors by file name."""
+
+    def __init__(self, name, max_size):
+        super().__init__(max_size=max_size)
+        self._member_name = name
+
+    @property
+    def name(self):
+        return self._member_name
+
+
+def is_log_member(name):
+    """Whether a member of the zip package is a log, wherever it is in the directory tree."""
+    if name.endswith('/'):
+        return False
+
+    parts = name.split('/')
+    base_name = parts[-1]
+
+    # Resource forks of macOS (__MACOSX/..., ._name) and lock files of Excel (~$name) are not logs
+    # macOS 的资源文件（__MACOSX/...，._name）与 Excel 的锁文件（~$name）都不是日志
+    if '__MACOSX' in parts or base_name.startswith(('.', '~$')):
+        return False
+
+    return base_name.lower().endswith(LOG_SUFFIXES)
+
+
+def list_log_members(zip_ref):
+    """
+    Returns:
+        list: 压缩包中所有日志成员的名称（含子目录的路径），按其在压缩包中的顺序排列
+    """
+    return [info.filename for info in zip_ref.infolist() if not info.is_dir() and is_log_member(info.filename)]
+
+
+@contextlib.contextmanager
+def open_log_member(zip_ref, name, spool_size=DEFAULT_SPOOL_SIZE, max_member_size=DEFAULT_MAX_MEMBER_SIZE):
+    """
+    打开压缩包中的一个日志成员，返回其解压后内容的（可随机访问的）副本；离开上下文时副本即被释放（或删除）。
+
+    Args:
+        zip_ref (zipfile.ZipFile): 已打开的压缩包
+        name: 成员的名称
+        spool_size: 解压后大于该值的成员将溢写到临时文件
+        max_member_size: 解压后大于该值的成员将被拒绝
+
+    Yields:
+        类文件对象：其 name 属性为成员的名称
+    """
+    info = zip_ref.getinfo(name)
+
+    # zipfile never inflates a member beyond the size recorded in the central directory, so checking it is enough
+    # zipfile 解压的内容不会超过中央目录中记录的大小，因此只需在解压之前检查该值
+    if info.file_size > max_member_size:
+        error_message = (
+            f"压缩包中的日志 '{name}' 解压后的大小为 {info.file_size / 1024 ** 2:.0f} MB，"
+            f"超出了单个日志的上限 {max_member_size / 1024 ** 2:.0f} MB。"
+            f"请拆分该日志，或放弃对该日志的分析。"
+        )
+        raise ValueError(error_message)
+
+    with _SpooledLogMember(name, max_size=spool_size) as log_member:
+        with zip_ref.open(info) as member:
+            shutil.copyfileobj(member, log_member, _COPY_BUFFER_SIZE)
+
+        log_member.seek(0)
+        yield log_member